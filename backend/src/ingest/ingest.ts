@@ -37,6 +37,8 @@ interface ParsedChunk {
     article_id: string
     article_title: string
     topic: string
+    topics?: string[]
+    term_hits?: Record<string, number>
     source: string
     chunk_id: string
     chunk_type: string
@@ -44,21 +46,31 @@ interface ParsedChunk {
     point_id?: string | null
     page_number: number[]
     coordinates: Array<Record<string, unknown>>
-    chunk_footnotes: string
+    footnote_ids: string[]
+    chunk_footnotes?: string | null
     has_points?: boolean | null
   }
 }
 
+interface FootnoteEntry {
+  id: string
+  number: string | null
+  page: number
+  text: string
+}
+
 interface ParseResponse {
   success: boolean
   chunks: ParsedChunk[]
   total_chunks: number
   structure: Record<string, unknown>[]
+  footnotes: Record<string, FootnoteEntry>
   message: string
 }
 
 interface ParseRequest {
   max_pages?: number | null
+  resolve_footnotes?: boolean
 }
 
 export type ParsedChunkMetadata = ParsedChunk['metadata']
@@ -73,7 +85,9 @@ export async function fetchLandLawChunksFromParser(
   maxPages?: number | null,
 ): Promise<{ documents: Document[]; structure: Record<string, unknown>[] }> {
   const url = `${PARSER_SERVICE_URL}/parse-pdf`
-  const requestBody: ParseRequest = {}
+  // Chunks only carry footnote_ids: have the parser resolve them into
+  // chunk_footnotes, which retrieval puts into the answer context
+  const requestBody: ParseRequest = { resolve_footnotes: true }
 
   if (maxPages !== undefined && maxPages !== null) {
     requestBody.max_pages = maxPages
@@ -118,6 +132,8 @@ export async function fetchLandLawChunksFromParser(
           source: chunk.metadata.source || '133-vbhn-vpqh.pdf',
           title: chunk.metadata.article_title || '',
           coordinates: JSON.stringify(chunk?.metadata?.coordinates || []),
+          // Keyed by Vietnamese phrases: nested keys are not valid Weaviate property names
+          term_hits: JSON.stringify(chunk?.metadata?.term_hits || {}),
         },
         [
           'article_title',
@@ -143,6 +143,7 @@ export function createWeaviateVectorStore(
 
       // Content metadata
       'topic',
+      'topics',
       'source_file',
       'footnotes',
       'chunk_footnotes',
@@ -6,18 +6,39 @@ and return parsed chunks that can be consumed by the backend ingestion system.
 """
 
 import asyncio
+import base64
+import hashlib
+import logging
 import os
-from typing import List, Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import List, Literal, Optional, Dict, Any
 import json
 
 import uvicorn
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Path, Query, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from pydantic import BaseModel, Field
 
-from land_law_parser import (
-    LandLawChunkerFinal,
-    update_article_260_content,
+from citation_index import DEFAULT_MIN_SCORE, CitationIndex, locate_span
+from corpus import ParsedCorpus, load_or_build
+from dedup import DEFAULT_THRESHOLD, mark_near_duplicates
+from doc_pool import DocumentPool, get_default_pool, set_default_pool
+from footnotes import resolve_footnote_ids
+from metrics import RENDER_CACHE, stage_timer
+from page_cache import file_sha256
+from render import (
+    DEFAULT_DPI,
+    DEFAULT_MARGIN,
+    MAX_DPI,
+    MIN_DPI,
+    RenderCache,
+    chunk_page_rects,
+    render_highlight_png,
+    render_key,
+    render_page_png,
 )
+from sqlite_sink import SQLiteSink
 
 
 # Pydantic models for request/response
@@ -27,6 +48,20 @@ class ParseRequest(BaseModel):
     max_pages: Optional[int] = Field(
         None, description="Maximum number of pages to process"
     )
+    resolve_footnotes: bool = Field(
+        False,
+        description="Fill `chunk_footnotes` with the text of the footnotes referenced by each chunk",
+    )
+    near_duplicates: Literal["off", "mark", "drop"] = Field(
+        "off",
+        description="Detect near-duplicate chunks (MinHash/LSH): mark them with `duplicate_of` or drop them",
+    )
+    duplicate_threshold: float = Field(
+        DEFAULT_THRESHOLD,
+        ge=0.0,
+        le=1.0,
+        description="Minimum estimated Jaccard similarity for two chunks to be near-duplicates",
+    )
 
 
 class ChunkMetadata(BaseModel):
@@ -40,14 +75,18 @@ class ChunkMetadata(BaseModel):
     article_id: str
     article_title: str
     topic: str
+    topics: List[str] = Field(default_factory=list)
+    term_hits: Dict[str, int] = Field(default_factory=dict)
     chunk_id: str
     chunk_type: str
     clause_id: Optional[str] = None
     point_id: Optional[str] = None
     page_number: List[int]
     coordinates: List[Dict[str, Any]]
-    chunk_footnotes: str
+    footnote_ids: List[str] = Field(default_factory=list)
+    chunk_footnotes: Optional[str] = None
     has_points: Optional[bool] = None
+    duplicate_of: Optional[str] = None
 
 
 class ParsedChunk(BaseModel):
@@ -59,6 +98,25 @@ class ParsedChunk(BaseModel):
     )
 
 
+class FootnoteEntry(BaseModel):
+    """A single footnote stored once in the response registry."""
+
+    id: str = Field(..., description="Footnote id referenced by `footnote_ids`")
+    number: Optional[str] = Field(None, description="Footnote number in the PDF")
+    page: int = Field(..., description="Page where the footnote is printed")
+    text: str = Field(..., description="Footnote text")
+
+
+class PageClassification(BaseModel):
+    """Body/footnote font-size classification of a single page."""
+
+    page: int = Field(..., description="Page number")
+    threshold: float = Field(..., description="Font size separating body from footnotes")
+    body_font_size: Optional[float] = Field(None, description="Detected body font size")
+    confidence: float = Field(..., description="Classification confidence (0-1)")
+    method: str = Field(..., description="adaptive, single_cluster or fixed")
+
+
 class StructurePosition(BaseModel):
     """Position information for structure items."""
 
@@ -75,15 +133,252 @@ class ParseResponse(BaseModel):
         ...,
         description="Hierarchical document structure (chapters with sections and articles)",
     )
+    footnotes: Dict[str, FootnoteEntry] = Field(
+        default_factory=dict,
+        description="Footnote registry keyed by footnote id",
+    )
+    page_classification: List[PageClassification] = Field(
+        default_factory=list,
+        description="Per-page font-size classification and its confidence",
+    )
     total_chunks: int = Field(..., description="Total number of chunks parsed")
     message: str = Field(..., description="Status message")
 
 
+class ChunkPageResponse(BaseModel):
+    """One page of chunks from the cacheable `GET /parse-pdf`."""
+
+    success: bool = Field(..., description="Whether the request was successful")
+    chunks: List[Dict[str, Any]] = Field(
+        ..., description="Chunks of this page, without the excluded fields"
+    )
+    structure: List[Dict[str, Any]] = Field(
+        default_factory=list, description="Document structure (first page only)"
+    )
+    footnotes: Dict[str, FootnoteEntry] = Field(
+        default_factory=dict, description="Footnote registry (first page only)"
+    )
+    page_classification: List[PageClassification] = Field(
+        default_factory=list,
+        description="Per-page font-size classification (first page only)",
+    )
+    total_chunks: int = Field(..., description="Total number of chunks in the corpus")
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor of the next page, null on the last page"
+    )
+    version: str = Field(..., description="Corpus version (PDF, corrections, parser)")
+
+
+class QuoteClaim(BaseModel):
+    """A quoted span and the article/clause/point it is cited as."""
+
+    quote: str = Field(..., min_length=1, max_length=5000, description="Quoted law text")
+    article_id: Optional[str] = Field(None, description='Cited article, e.g. "Điều 79" or "79"')
+    clause_id: Optional[str] = Field(None, description='Cited clause, e.g. "Khoản 2" or "2"')
+    point_id: Optional[str] = Field(None, description='Cited point, e.g. "điểm a" or "a"')
+
+
+class VerifyRequest(BaseModel):
+    """Request model for citation verification."""
+
+    quotes: List[QuoteClaim] = Field(..., min_length=1, max_length=100)
+    max_matches: int = Field(5, ge=1, le=50, description="Matches returned per quote")
+    min_score: float = Field(
+        DEFAULT_MIN_SCORE,
+        ge=0.0,
+        le=1.0,
+        description="Minimum similarity of approximate matches",
+    )
+    coordinates: bool = Field(
+        True, description="Look up the page rects of each match in the PDF"
+    )
+
+
+class QuoteMatch(BaseModel):
+    """Location of a quote in the corpus."""
+
+    chunk_id: str
+    article_id: Optional[str] = None
+    clause_id: Optional[str] = None
+    point_id: Optional[str] = None
+    start: int = Field(..., description="Start offset in the chunk's page_content")
+    end: int = Field(..., description="End offset (exclusive) in the chunk's page_content")
+    score: float = Field(..., description="1.0 for exact matches, similarity otherwise")
+    page_number: List[int] = Field(default_factory=list)
+    coordinates: List[Dict[str, Any]] = Field(default_factory=list)
+    article_match: Optional[bool] = Field(None, description="Match lies in the cited article")
+    clause_match: Optional[bool] = Field(None, description="Match lies in the cited clause")
+    point_match: Optional[bool] = Field(None, description="Match lies in the cited point")
+
+
+class QuoteVerification(BaseModel):
+    """Verification result of one quote."""
+
+    quote: str
+    status: Literal["exact", "approximate", "not_found"]
+    citation_match: Optional[bool] = Field(
+        None,
+        description="Best match agrees with the cited ids (null when nothing is cited or found)",
+    )
+    matches: List[QuoteMatch] = Field(default_factory=list)
+
+
+class VerifyResponse(BaseModel):
+    """Response model for citation verification."""
+
+    results: List[QuoteVerification]
+    version: str = Field(..., description="Corpus version the quotes were checked against")
+
+
+class ChunkQueryResponse(BaseModel):
+    """Chunks matching the filters of `GET /db/chunks`."""
+
+    success: bool = Field(..., description="Whether the request was successful")
+    chunks: List[ParsedChunk] = Field(..., description="Matching chunks, in document order")
+    total: int = Field(..., description="Total number of matching chunks")
+    limit: int
+    offset: int
+
+
 class HealthResponse(BaseModel):
     """Health check response model."""
 
-    status: str = Field(..., description="Service status")
+    status: str = Field(..., description="starting, healthy or unhealthy")
+    ready: bool = Field(..., description="Whether the shared corpus is loaded")
     message: str = Field(..., description="Health check message")
+    chunks: Optional[int] = Field(None, description="Chunks in the shared corpus")
+
+
+# Parser logs are silent unless PARSER_LOG_LEVEL is set (e.g. INFO, DEBUG)
+PARSER_LOG_LEVEL = os.getenv("PARSER_LOG_LEVEL")
+if PARSER_LOG_LEVEL:
+    parser_logger = logging.getLogger("land_law_parser")
+    parser_logger.setLevel(PARSER_LOG_LEVEL.upper())
+    parser_logger.addHandler(logging.StreamHandler())
+
+# Path to the Land Law PDF file
+PDF_PATH = os.getenv("PDF_PATH", "./data/133-vbhn-vpqh.pdf")
+
+# Directory for the page extraction cache (set to an empty string to disable)
+PAGE_CACHE_DIR = os.getenv("PAGE_CACHE_DIR", "./.cache/pages")
+
+# Prebuilt parsed corpus loaded at startup, rewritten when stale (empty to disable)
+CORPUS_ARTIFACT = os.getenv("CORPUS_ARTIFACT", "./.cache/corpus.json.gz")
+
+# Load/parse the full corpus at startup so requests never parse it themselves
+CORPUS_WARMUP = os.getenv("CORPUS_WARMUP", "1").lower() not in ("0", "false", "no")
+
+# Open PyMuPDF handles per PDF and per process, closed after idling this long
+PDF_POOL_SIZE = int(os.getenv("PDF_POOL_SIZE", "4"))
+PDF_POOL_IDLE_SECONDS = float(os.getenv("PDF_POOL_IDLE_SECONDS", "300"))
+
+# Processes chunking articles in parallel during a parse (1 = serial)
+PARSER_WORKERS = int(os.getenv("PARSER_WORKERS", "1"))
+
+# Threads running parses and renders (default: asyncio's min(32, CPUs + 4))
+PARSER_EXECUTOR_WORKERS = int(os.getenv("PARSER_EXECUTOR_WORKERS", "0")) or None
+
+# Rendered page/highlight PNGs: in-memory LRU + on-disk cache (empty dir to disable disk)
+RENDER_CACHE_DIR = os.getenv("RENDER_CACHE_DIR", "./.cache/renders")
+RENDER_CACHE_MEMORY_MB = int(os.getenv("RENDER_CACHE_MEMORY_MB", "64"))
+RENDER_CACHE_DISK_MB = int(os.getenv("RENDER_CACHE_DISK_MB", "512"))
+
+# Optional SQLite database filled with every full parse and queried by /db/* (empty to disable)
+SQLITE_PATH = os.getenv("SQLITE_PATH", "")
+
+# Service errors go to uvicorn's error logger, which uvicorn configures and
+# prints by default (the "land_law_parser" logger is silent without PARSER_LOG_LEVEL)
+logger = logging.getLogger("uvicorn.error")
+
+render_cache = RenderCache(
+    max_memory_bytes=RENDER_CACHE_MEMORY_MB << 20,
+    cache_dir=RENDER_CACHE_DIR or None,
+    max_disk_bytes=RENDER_CACHE_DISK_MB << 20,
+)
+
+
+class CorpusState:
+    """Warm-up state of the shared corpus, one per process."""
+
+    def __init__(self):
+        self.corpus: Optional[ParsedCorpus] = None
+        self.index: Optional[CitationIndex] = None
+        self.sink: Optional[SQLiteSink] = None
+        self.task: Optional[asyncio.Task] = None
+        self.error: Optional[str] = None
+
+    async def warm_up(self):
+        def _load():
+            corpus = load_or_build(
+                PDF_PATH,
+                CORPUS_ARTIFACT or None,
+                PAGE_CACHE_DIR or None,
+                workers=PARSER_WORKERS,
+                sink=self.sink,
+            )
+            with stage_timer("citation_index"):
+                index = CitationIndex(corpus.chunks)
+            return corpus, index
+
+        loop = asyncio.get_running_loop()
+        try:
+            # Both are published together: ready means the index is built too
+            self.corpus, self.index = await loop.run_in_executor(None, _load)
+        except Exception as e:
+            self.error = str(e)
+            logger.exception("❌ Corpus warm-up failed: %s", e)
+
+    async def get(self) -> Optional[ParsedCorpus]:
+        """The shared corpus, waiting for a warm-up in progress; None if unavailable."""
+        if self.task is None:
+            # Warm-up disabled at startup: load the corpus on first use instead
+            self.task = asyncio.create_task(self.warm_up())
+        if not self.task.done():
+            # Shielded: a cancelled request must not cancel the warm-up
+            await asyncio.shield(self.task)
+        return self.corpus
+
+
+corpus_state = CorpusState()
+
+
+async def evict_idle_documents(pool: DocumentPool):
+    """Close idle PDF handles even when no request comes in to trigger it."""
+    while True:
+        await asyncio.sleep(max(pool.idle_timeout / 2, 1.0))
+        pool.evict_idle()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One bounded pool of PyMuPDF handles shared by every parser in this process
+    pool = DocumentPool(max_handles=PDF_POOL_SIZE, idle_timeout=PDF_POOL_IDLE_SECONDS)
+    set_default_pool(pool)
+    if SQLITE_PATH:
+        corpus_state.sink = SQLiteSink(SQLITE_PATH)
+    if PARSER_EXECUTOR_WORKERS:
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(max_workers=PARSER_EXECUTOR_WORKERS)
+        )
+    if PARSER_WORKERS > 1:
+        from land_law_parser import warm_article_pool
+
+        # Spawn the article workers now rather than on the first parse
+        asyncio.get_running_loop().run_in_executor(
+            None, warm_article_pool, PARSER_WORKERS
+        )
+    if CORPUS_WARMUP:
+        corpus_state.task = asyncio.create_task(corpus_state.warm_up())
+    evictor = asyncio.create_task(evict_idle_documents(pool))
+    yield
+    evictor.cancel()
+    if corpus_state.task is not None and not corpus_state.task.done():
+        corpus_state.task.cancel()
+    if PARSER_WORKERS > 1:
+        from land_law_parser import shutdown_article_pools
+
+        shutdown_article_pools()
+    pool.close()
 
 
 # FastAPI app initialization
@@ -93,17 +388,39 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 
 @app.get("/health", response_model=HealthResponse)
-async def health_check():
-    """Health check endpoint."""
+async def health_check(response: Response):
+    """Health check endpoint: ready (200) only once the corpus warm-up is done."""
+    if corpus_state.error is not None:
+        response.status_code = 503
+        return HealthResponse(
+            status="unhealthy",
+            ready=False,
+            message=f"Corpus warm-up failed: {corpus_state.error}",
+        )
+    if corpus_state.task is not None and corpus_state.corpus is None:
+        response.status_code = 503
+        return HealthResponse(
+            status="starting", ready=False, message="Loading the parsed corpus"
+        )
     return HealthResponse(
-        status="healthy", message="Land Law Parser Service is running"
+        status="healthy",
+        ready=True,
+        message="Land Law Parser Service is running",
+        chunks=len(corpus_state.corpus) if corpus_state.corpus else None,
     )
 
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics: parser stage timings and page/chunk/cache counters."""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 def convert_chunk_to_response_model(chunk: Dict[str, Any]) -> ParsedChunk:
     """Convert internal chunk format to response model."""
     return ParsedChunk(
@@ -113,36 +430,58 @@ def convert_chunk_to_response_model(chunk: Dict[str, Any]) -> ParsedChunk:
 
 async def process_pdf_async(
     max_pages: Optional[int] = None,
+    near_duplicates: str = "off",
+    duplicate_threshold: float = DEFAULT_THRESHOLD,
 ) -> Dict[str, Any]:
     """
     Process the Land Law PDF file asynchronously using the existing parser.
 
     Args:
         max_pages: Optional maximum number of pages to process
+        near_duplicates: "off", "mark" or "drop" near-duplicate chunks
+        duplicate_threshold: Similarity threshold for near-duplicates
 
     Returns:
-        Dictionary with 'chunks' and 'structure' keys
+        Dictionary with 'chunks', 'structure', 'footnotes' and
+        'page_classification' keys
     """
-    # Fixed path to the Land Law PDF file
-    pdf_path = "./data/133-vbhn-vpqh.pdf"
+    # Full-document requests are served from the shared corpus
+    corpus = await corpus_state.get() if max_pages is None else None
 
     def _process_pdf():
         """Synchronous PDF processing function."""
-        parser = LandLawChunkerFinal(pdf_path, max_pages)
-        return parser.process()
+        if corpus is not None:
+            result = corpus.to_result()
+        else:
+            # PyMuPDF is only imported when a parse is actually needed
+            from land_law_parser import LandLawChunkerFinal
+
+            parser = LandLawChunkerFinal(
+                PDF_PATH,
+                max_pages,
+                cache_dir=PAGE_CACHE_DIR or None,
+                workers=PARSER_WORKERS,
+            )
+            result = parser.process()
+        if near_duplicates != "off":
+            result["chunks"] = mark_near_duplicates(
+                result["chunks"],
+                drop=near_duplicates == "drop",
+                threshold=duplicate_threshold,
+            )
+        return result
 
     # Run the synchronous parser in a thread pool to avoid blocking
     loop = asyncio.get_event_loop()
     result = await loop.run_in_executor(None, _process_pdf)
 
-    # Extract chunks and structure from result
-    chunks = result["chunks"]
-    structure = result["structure"]
-
-    # Update Article 260 content
-    updated_chunks = update_article_260_content(chunks)
-
-    return {"chunks": updated_chunks, "structure": structure}
+    # Corrections from data/corrections.json are already applied by the parser
+    return {
+        "chunks": result["chunks"],
+        "structure": result["structure"],
+        "footnotes": result["footnotes"],
+        "page_classification": result["page_classification"],
+    }
 
 
 @app.post("/parse-pdf", response_model=ParseResponse)
@@ -151,27 +490,35 @@ async def parse_pdf(request: ParseRequest):
     Parse the Land Law PDF file.
 
     Args:
-        request: ParseRequest containing optional max_pages
+        request: ParseRequest containing optional max_pages, resolve_footnotes
+            and near-duplicate settings
 
     Returns:
         ParseResponse with parsed chunks and document structure
     """
     try:
-        # Fixed PDF file path
-        pdf_path = "./data/133-vbhn-vpqh.pdf"
-
         # Validate file exists
-        if not os.path.exists(pdf_path):
+        if not os.path.exists(PDF_PATH):
             raise HTTPException(
-                status_code=404, detail=f"Land Law PDF file not found: {pdf_path}"
+                status_code=404, detail=f"Land Law PDF file not found: {PDF_PATH}"
             )
 
         # Process the PDF
-        result = await process_pdf_async(request.max_pages)
+        result = await process_pdf_async(
+            request.max_pages, request.near_duplicates, request.duplicate_threshold
+        )
 
         # Extract chunks and structure
         chunks = result["chunks"]
         structure = result["structure"]
+        footnotes = result["footnotes"]
+
+        # Resolve footnote ids into text only when the client asks for it
+        if request.resolve_footnotes:
+            for chunk in chunks:
+                chunk["metadata"]["chunk_footnotes"] = resolve_footnote_ids(
+                    chunk["metadata"].get("footnote_ids", []), footnotes
+                )
 
         # Convert chunks to response format
         response_chunks = [convert_chunk_to_response_model(chunk) for chunk in chunks]
@@ -180,6 +527,8 @@ async def parse_pdf(request: ParseRequest):
             success=True,
             chunks=response_chunks,
             structure=structure,
+            footnotes=footnotes,
+            page_classification=result["page_classification"],
             total_chunks=len(response_chunks),
             message=f"Successfully parsed {len(response_chunks)} chunks and {len(structure)} chapters from Land Law PDF",
         )
@@ -190,6 +539,322 @@ async def parse_pdf(request: ParseRequest):
         raise HTTPException(status_code=500, detail=f"Error processing PDF: {str(e)}")
 
 
+# Chunk fields (and top-level sections) that GET /parse-pdf can leave out
+EXCLUDABLE_FIELDS = (
+    {"page_content"}
+    | set(ChunkMetadata.model_fields)
+    | {"structure", "footnotes", "page_classification"}
+)
+
+
+def _encode_cursor(version: str, offset: int) -> str:
+    return base64.urlsafe_b64encode(f"{version}:{offset}".encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, version: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_version, offset = base64.urlsafe_b64decode(padded).decode().split(":")
+        offset = int(offset)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if cursor_version != version or offset < 0:
+        raise HTTPException(
+            status_code=409,
+            detail="Cursor belongs to an older corpus version, restart from the first page",
+        )
+    return offset
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of `If-None-Match` against an ETag (RFC 9110)."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in [tag.removeprefix("W/") for tag in candidates]
+
+
+@app.get("/parse-pdf", response_model=ChunkPageResponse)
+async def get_parsed_chunks(
+    limit: Optional[int] = Query(
+        None, ge=1, le=1000, description="Chunks per page (default: all)"
+    ),
+    cursor: Optional[str] = Query(
+        None, description="`next_cursor` of the previous page"
+    ),
+    exclude: Optional[str] = Query(
+        None,
+        description="Comma-separated fields to leave out, e.g. `coordinates,chunk_footnotes`",
+    ),
+    resolve_footnotes: bool = Query(
+        False, description="Fill `chunk_footnotes` with the referenced footnote texts"
+    ),
+    if_none_match: Optional[str] = Header(None),
+):
+    """
+    Cacheable, paginated view of the full parsed corpus.
+
+    The ETag changes only with the PDF, the corrections file, the parser
+    version or the query, so a client sending it back in `If-None-Match`
+    gets an empty `304 Not Modified` while nothing has changed.
+    """
+    excluded = set()
+    if exclude:
+        excluded = {field.strip() for field in exclude.split(",") if field.strip()}
+        unknown = excluded - EXCLUDABLE_FIELDS
+        if unknown:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Unknown fields in exclude: {', '.join(sorted(unknown))}",
+            )
+
+    if not os.path.exists(PDF_PATH):
+        raise HTTPException(
+            status_code=404, detail=f"Land Law PDF file not found: {PDF_PATH}"
+        )
+    corpus = await corpus_state.get()
+    if corpus is None:
+        raise HTTPException(
+            status_code=503, detail=f"Parsed corpus unavailable: {corpus_state.error}"
+        )
+
+    offset = _decode_cursor(cursor, corpus.version) if cursor else 0
+    query = f"{offset}|{limit}|{','.join(sorted(excluded))}|{resolve_footnotes}"
+    etag = '"{}-{}"'.format(
+        corpus.version, hashlib.sha256(query.encode("utf-8")).hexdigest()[:16]
+    )
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    def _build() -> bytes:
+        # Validating and serializing the whole corpus takes long: off the event loop
+        end = len(corpus) if limit is None else min(offset + limit, len(corpus))
+        chunks = []
+        for chunk in corpus.chunks[offset:end]:
+            metadata = ChunkMetadata(**chunk["metadata"]).model_dump()
+            if resolve_footnotes:
+                metadata["chunk_footnotes"] = resolve_footnote_ids(
+                    metadata["footnote_ids"], corpus.footnotes
+                )
+            item = {"page_content": chunk["page_content"], "metadata": metadata}
+            for field in excluded:
+                item.pop(field, None)
+                metadata.pop(field, None)
+            chunks.append(item)
+
+        first_page = offset == 0
+        body = {
+            "success": True,
+            "chunks": chunks,
+            "structure": list(corpus.structure)
+            if first_page and "structure" not in excluded
+            else [],
+            "footnotes": corpus.footnotes
+            if first_page and "footnotes" not in excluded
+            else {},
+            "page_classification": list(corpus.page_classification)
+            if first_page and "page_classification" not in excluded
+            else [],
+            "total_chunks": len(corpus),
+            "next_cursor": _encode_cursor(corpus.version, end) if end < len(corpus) else None,
+            "version": corpus.version,
+        }
+        return json.dumps(body, ensure_ascii=False, separators=(",", ":")).encode(
+            "utf-8"
+        )
+
+    loop = asyncio.get_event_loop()
+    content = await loop.run_in_executor(None, _build)
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+async def _cached_png(
+    key: str, if_none_match: Optional[str], render
+) -> Response:
+    """Serve a PNG from the render cache, rendering it on a miss."""
+    etag = f'"{key}"'
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=3600"}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    # Memory hits are served on the loop; the disk level, rendering and the
+    # disk write (with its eviction scan) run in the executor
+    data = render_cache.get_memory(key)
+    if data is not None:
+        RENDER_CACHE.labels("memory").inc()
+    else:
+
+        def _load():
+            data, source = render_cache.get(key)
+            RENDER_CACHE.labels(source).inc()
+            if data is None:
+                with get_default_pool().checkout(PDF_PATH) as doc, stage_timer(
+                    "page_render"
+                ):
+                    data = render(doc)
+                render_cache.put(key, data)
+            return data
+
+        loop = asyncio.get_event_loop()
+        data = await loop.run_in_executor(None, _load)
+    return Response(content=data, media_type="image/png", headers=headers)
+
+
+@app.get("/pages/{page_num}.png", response_class=Response)
+async def render_page(
+    page_num: int = Path(..., ge=1, description="1-based page number"),
+    dpi: int = Query(DEFAULT_DPI, ge=MIN_DPI, le=MAX_DPI),
+    if_none_match: Optional[str] = Header(None),
+):
+    """Render a page of the Land Law PDF as PNG."""
+    if not os.path.exists(PDF_PATH):
+        raise HTTPException(
+            status_code=404, detail=f"Land Law PDF file not found: {PDF_PATH}"
+        )
+
+    def _render(doc):
+        if page_num > len(doc):
+            raise HTTPException(status_code=404, detail=f"Page {page_num} not found")
+        return render_page_png(doc, page_num, dpi)
+
+    key = render_key(file_sha256(PDF_PATH), "page", page_num, dpi)
+    return await _cached_png(key, if_none_match, _render)
+
+
+@app.get("/chunks/{chunk_id:path}/highlight.png", response_class=Response)
+async def render_chunk_highlight(
+    chunk_id: str,
+    page: Optional[int] = Query(
+        None, ge=1, description="Page to render (default: first page with coordinates)"
+    ),
+    dpi: int = Query(DEFAULT_DPI, ge=MIN_DPI, le=MAX_DPI),
+    margin: float = Query(
+        DEFAULT_MARGIN, ge=0, le=400, description="Context around the chunk (points)"
+    ),
+    if_none_match: Optional[str] = Header(None),
+):
+    """Render the region of a page covered by a chunk, with its rects highlighted."""
+    corpus = await corpus_state.get()
+    if corpus is None:
+        raise HTTPException(
+            status_code=503, detail=f"Parsed corpus unavailable: {corpus_state.error}"
+        )
+    chunk = corpus.get_chunk(chunk_id)
+    if chunk is None:
+        raise HTTPException(status_code=404, detail=f"Chunk not found: {chunk_id}")
+    page_num, rects = chunk_page_rects(chunk, page)
+    if page_num is None or (
+        page is not None and page not in chunk["metadata"].get("page_number", [])
+    ):
+        raise HTTPException(
+            status_code=404, detail=f"Chunk {chunk_id} has no content on page {page}"
+        )
+
+    key = render_key(corpus.version, "highlight", chunk_id, page_num, dpi, margin)
+    return await _cached_png(
+        key,
+        if_none_match,
+        lambda doc: render_highlight_png(doc, page_num, rects, dpi, margin),
+    )
+
+
+@app.post("/verify", response_model=VerifyResponse)
+async def verify_citations(request: VerifyRequest):
+    """
+    Check quoted law text against the parsed corpus.
+
+    Every quote is looked up exactly in the corpus substring index, or
+    approximately when it does not occur verbatim, and its matches are
+    checked against the cited article/clause/point ids. Offsets refer to the
+    chunk's `page_content`; page rects come from the PDF when `coordinates`
+    is set.
+    """
+    corpus = await corpus_state.get()
+    index = corpus_state.index
+    if corpus is None or index is None:
+        raise HTTPException(
+            status_code=503, detail=f"Parsed corpus unavailable: {corpus_state.error}"
+        )
+
+    def _verify():
+        with stage_timer("citation_verify"):
+            results = [
+                {
+                    "quote": claim.quote,
+                    **index.verify(
+                        claim.quote,
+                        claim.article_id,
+                        claim.clause_id,
+                        claim.point_id,
+                        max_matches=request.max_matches,
+                        min_score=request.min_score,
+                    ),
+                }
+                for claim in request.quotes
+            ]
+        matches = [m for result in results for m in result["matches"]]
+        if request.coordinates and matches and os.path.exists(PDF_PATH):
+            with get_default_pool().checkout(PDF_PATH) as doc:
+                for match in matches:
+                    text = corpus.get_chunk(match["chunk_id"])["page_content"]
+                    match["coordinates"] = locate_span(
+                        doc, text[match["start"] : match["end"]], match["page_number"]
+                    )
+        return results
+
+    loop = asyncio.get_event_loop()
+    results = await loop.run_in_executor(None, _verify)
+    return VerifyResponse(results=results, version=corpus.version)
+
+
+def _require_sink() -> SQLiteSink:
+    if corpus_state.sink is None:
+        raise HTTPException(
+            status_code=404, detail="SQLite sink is disabled, set SQLITE_PATH to enable it"
+        )
+    return corpus_state.sink
+
+
+@app.get("/db/chunks", response_model=ChunkQueryResponse)
+async def query_chunks(
+    law_id: Optional[str] = Query(None, description='Law, e.g. "133/VBHN-VPQH"'),
+    chapter_id: Optional[str] = Query(None, description='Chapter id, e.g. "I"'),
+    section_id: Optional[str] = Query(None, description='Section id, e.g. "1"'),
+    article_id: Optional[str] = Query(None, description='Article id, e.g. "79"'),
+    page: Optional[int] = Query(None, ge=1, description="Chunks with text on this page"),
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+):
+    """
+    Indexed chunk lookup in the SQLite sink by law, chapter, section, article
+    and page, without loading the whole corpus.
+    """
+    sink = _require_sink()
+    loop = asyncio.get_event_loop()
+    chunks, total = await loop.run_in_executor(
+        None,
+        lambda: sink.query_chunks(
+            law_id, chapter_id, section_id, article_id, page, limit, offset
+        ),
+    )
+    return ChunkQueryResponse(
+        success=True,
+        chunks=[convert_chunk_to_response_model(chunk) for chunk in chunks],
+        total=total,
+        limit=limit,
+        offset=offset,
+    )
+
+
+@app.get("/db/laws")
+async def list_laws():
+    """Laws stored in the SQLite sink with their chunk/page/footnote/article counts."""
+    sink = _require_sink()
+    loop = asyncio.get_event_loop()
+    return {"laws": await loop.run_in_executor(None, sink.list_documents)}
+
+
 @app.get("/")
 async def root():
     """Root endpoint with service information."""
@@ -199,6 +864,12 @@ async def root():
         "endpoints": {
             "health": "/health",
             "parse_pdf": "/parse-pdf",
+            "metrics": "/metrics",
+            "page_image": "/pages/{n}.png",
+            "chunk_highlight": "/chunks/{chunk_id}/highlight.png",
+            "verify": "/verify",
+            "db_chunks": "/db/chunks",
+            "db_laws": "/db/laws",
             "docs": "/docs",
         },
     }
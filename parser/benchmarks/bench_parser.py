@@ -0,0 +1,213 @@
+"""
+Parser benchmark: runs `LandLawChunkerFinal` stage by stage on a synthetic law
+PDF and reports throughput, peak RSS and per-stage timings as JSON.
+
+Usage:
+    python -m benchmarks.bench_parser --chapters 16 --output bench.json
+    python -m benchmarks.bench_parser --compare bench.json --max-slowdown 1.25
+    python -m benchmarks.bench_parser --pdf ./data/133-vbhn-vpqh.pdf --budget build_chunks=5
+
+Exit code is 1 when a stage is slower than its budget or than the baseline
+times `--max-slowdown`.
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+import fitz  # PyMuPDF
+
+from benchmarks.synthetic_pdf import generate_law_pdf
+from land_law_parser import LandLawChunkerFinal
+
+STAGES = ["extract_pages", "extract_pages_cached", "find_structure_markers", "build_chunks"]
+
+# Stages faster than this are too noisy to flag as regressions
+NOISE_FLOOR_S = 0.005
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_once(pdf_path: str, cache_dir: str, workers: int = 1) -> Dict[str, Any]:
+    """Run every parser stage once and time it."""
+    timings = {}
+    parser = LandLawChunkerFinal(pdf_path, workers=workers)
+    start = time.perf_counter()
+    full_text = parser.extract_pages()
+    timings["extract_pages"] = time.perf_counter() - start
+
+    # Same stage served from a warm page cache (no PDF decoding)
+    cached = LandLawChunkerFinal(pdf_path, cache_dir=cache_dir)
+    cached.extract_pages()
+    start = time.perf_counter()
+    cached.extract_pages()
+    timings["extract_pages_cached"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matches = parser.find_structure_markers(full_text)
+    timings["find_structure_markers"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    chunks = parser.build_chunks(full_text, matches)
+    timings["build_chunks"] = time.perf_counter() - start
+
+    return {
+        "timings": timings,
+        "pages": len(parser.page_offset_map),
+        "chunks": len(chunks),
+        "footnotes": len(parser.footnotes),
+    }
+
+
+def run_benchmark(pdf_path: str, repeat: int, workers: int = 1) -> Dict[str, Any]:
+    runs = []
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for _ in range(repeat):
+            runs.append(run_once(pdf_path, cache_dir, workers))
+
+    stages = {}
+    for stage in STAGES:
+        values = [r["timings"][stage] for r in runs]
+        stages[stage] = {
+            "median_s": round(statistics.median(values), 6),
+            "min_s": round(min(values), 6),
+            "max_s": round(max(values), 6),
+        }
+
+    total = sum(stages[s]["median_s"] for s in STAGES if s != "extract_pages_cached")
+    last = runs[-1]
+    return {
+        "pages": last["pages"],
+        "chunks": last["chunks"],
+        "footnotes": last["footnotes"],
+        "repeat": repeat,
+        "workers": workers,
+        "total_s": round(total, 6),
+        "pages_per_s": round(last["pages"] / total, 2) if total else None,
+        "chunks_per_s": round(last["chunks"] / total, 2) if total else None,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "stages": stages,
+    }
+
+
+def compare(
+    result: Dict[str, Any],
+    baseline: Optional[Dict[str, Any]],
+    max_slowdown: float,
+    budgets: Dict[str, float],
+) -> List[str]:
+    """List of human-readable regressions (empty when within budget)."""
+    failures = []
+    for stage, stats in result["stages"].items():
+        current = stats["median_s"]
+        if stage in budgets and current > budgets[stage]:
+            failures.append(f"{stage}: {current:.4f}s > budget {budgets[stage]:.4f}s")
+        if baseline and stage in baseline.get("stages", {}):
+            reference = baseline["stages"][stage]["median_s"]
+            limit = reference * max_slowdown
+            if current > limit and current - reference > NOISE_FLOOR_S:
+                failures.append(
+                    f"{stage}: {current:.4f}s > {max_slowdown:.2f} x baseline {reference:.4f}s"
+                )
+    return failures
+
+
+def _parse_budgets(values: List[str]) -> Dict[str, float]:
+    budgets = {}
+    for item in values:
+        stage, _, seconds = item.partition("=")
+        if stage not in STAGES or not seconds:
+            raise SystemExit(f"Invalid --budget {item!r}: expected <stage>=<seconds>, stages: {STAGES}")
+        budgets[stage] = float(seconds)
+    return budgets
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Land Law parser benchmark")
+    parser.add_argument("--pdf", help="Benchmark an existing PDF instead of a synthetic one")
+    parser.add_argument("--chapters", type=int, default=16)
+    parser.add_argument("--sections-per-chapter", type=int, default=2)
+    parser.add_argument("--articles-per-section", type=int, default=8)
+    parser.add_argument("--clauses-per-article", type=int, default=5)
+    parser.add_argument("--points-per-clause", type=int, default=4)
+    parser.add_argument("--footnote-every", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--font-file", default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=1, help="Processes for build_chunks")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--compare", help="Baseline JSON report to compare against")
+    parser.add_argument("--max-slowdown", type=float, default=1.25)
+    parser.add_argument(
+        "--budget",
+        action="append",
+        default=[],
+        metavar="STAGE=SECONDS",
+        help="Absolute time budget for a stage (repeatable)",
+    )
+    args = parser.parse_args()
+    budgets = _parse_budgets(args.budget)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.pdf:
+            pdf_path = args.pdf
+            document = {"source": os.path.basename(args.pdf)}
+        else:
+            pdf_path = os.path.join(tmp, "synthetic-law.pdf")
+            config = {
+                "chapters": args.chapters,
+                "sections_per_chapter": args.sections_per_chapter,
+                "articles_per_section": args.articles_per_section,
+                "clauses_per_article": args.clauses_per_article,
+                "points_per_clause": args.points_per_clause,
+                "footnote_every": args.footnote_every,
+                "seed": args.seed,
+            }
+            counts = generate_law_pdf(pdf_path, font_file=args.font_file, **config)
+            document = {"source": "synthetic", "config": config, "counts": counts}
+
+        result = run_benchmark(pdf_path, args.repeat, args.workers)
+
+    report = {
+        "document": document,
+        "environment": {
+            "python": platform.python_version(),
+            "pymupdf": fitz.VersionBind,
+            "machine": platform.machine(),
+        },
+        **result,
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    failures = compare(report, baseline, args.max_slowdown, budgets)
+    report["regressions"] = failures
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    print(output)
+
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
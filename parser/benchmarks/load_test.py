@@ -0,0 +1,366 @@
+"""
+HTTP load test of the parser service against a synthetic law PDF.
+
+Starts `app.py` in-process (uvicorn on a free localhost port, in a background
+thread), waits for the corpus warm-up, then drives a weighted mix of requests
+from N concurrent clients for each concurrency level. Reports p50/p95/p99
+latency, throughput and error rate per level and endpoint, plus the process
+RSS sampled over the whole run, as JSON. Everything runs offline.
+
+Usage:
+    python -m benchmarks.load_test --concurrency 1,4,16 --duration 10
+    python -m benchmarks.load_test --mix parse_pages=1,health=2,lookup=5,highlight=2 \\
+        --executor-workers 8 --pool-size 4 --output load.json
+
+Client and server share one process (and the GIL), so absolute latencies are
+pessimistic; compare runs made on the same machine.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import resource
+import socket
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from benchmarks.synthetic_pdf import generate_law_pdf
+
+# Request kinds available in --mix. "parse" (full document) is served from the
+# warm corpus; "parse_pages" (max_pages set) always runs the parser
+ENDPOINTS = ("parse", "parse_pages", "health", "lookup", "highlight", "page", "verify")
+DEFAULT_MIX = "parse=1,parse_pages=1,health=2,lookup=5,highlight=2"
+
+LOOKUP_LIMIT = 20
+LOOKUP_EXCLUDE = "coordinates,structure,footnotes,page_classification"
+
+
+def current_rss_mb() -> float:
+    """Current resident set size in MiB (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _parse_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        if name not in ENDPOINTS or not weight:
+            raise SystemExit(f"Invalid --mix item {item!r}: expected <endpoint>=<weight>, endpoints: {ENDPOINTS}")
+        mix[name] = float(weight)
+    return mix
+
+
+def _summarize(samples: List[Tuple[float, bool]], elapsed: float) -> Dict[str, Any]:
+    latencies = np.array([latency for latency, _ in samples]) * 1000
+    errors = sum(1 for _, ok in samples if not ok)
+    summary = {
+        "requests": len(samples),
+        "errors": errors,
+        "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+        "throughput_rps": round(len(samples) / elapsed, 2) if elapsed else None,
+    }
+    if samples:
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+        summary.update(
+            p50_ms=round(float(p50), 2),
+            p95_ms=round(float(p95), 2),
+            p99_ms=round(float(p99), 2),
+            max_ms=round(float(latencies.max()), 2),
+        )
+    return summary
+
+
+class ServerThread:
+    """uvicorn running `app:app` in a daemon thread of this process."""
+
+    def __init__(self, port: int):
+        import uvicorn
+
+        # Imported here: app reads its configuration from the environment
+        from app import app
+
+        config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+        self.server = uvicorn.Server(config)
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        while not self.server.started:
+            if not self.thread.is_alive():
+                raise RuntimeError("uvicorn failed to start")
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join(timeout=30)
+
+
+class LoadTest:
+    def __init__(
+        self,
+        base_url: str,
+        mix: Dict[str, float],
+        parse_pages: int,
+        seed: int,
+    ):
+        self.base_url = base_url
+        self.names = list(mix)
+        self.weights = [mix[name] for name in self.names]
+        self.parse_pages = parse_pages
+        self.rng = random.Random(seed)
+        self.chunk_ids: List[str] = []
+        self.quotes: List[Dict[str, str]] = []
+        self.cursors: List[Optional[str]] = [None]
+        self.page_count = 1
+        self.total_chunks = 0
+
+    async def wait_ready(self, client, timeout: float) -> float:
+        """Poll /health until the corpus is loaded; returns the warm-up time."""
+        start = time.perf_counter()
+        while time.perf_counter() - start < timeout:
+            response = await client.get("/health")
+            if response.status_code == 200:
+                return time.perf_counter() - start
+            await asyncio.sleep(0.05)
+        raise RuntimeError(f"Service not ready after {timeout}s")
+
+    async def discover(self, client):
+        """Chunk ids and page count used by lookup/highlight/page requests."""
+        response = await client.get(
+            "/parse-pdf", params={"exclude": "coordinates,footnotes,structure"}
+        )
+        response.raise_for_status()
+        body = response.json()
+        self.chunk_ids = [c["metadata"]["chunk_id"] for c in body["chunks"]]
+        # One quote per chunk (its middle), cited with the chunk's article
+        for chunk in body["chunks"]:
+            text = chunk["page_content"]
+            middle = len(text) // 2
+            self.quotes.append(
+                {
+                    "quote": text[max(middle - 100, 0) : middle + 100],
+                    "article_id": chunk["metadata"]["article_id"],
+                }
+            )
+        self.total_chunks = body["total_chunks"]
+        self.page_count = max(
+            (p["page"] for p in body["page_classification"]), default=1
+        )
+        # Cursors of every page of LOOKUP_LIMIT chunks
+        while True:
+            params = {"limit": LOOKUP_LIMIT, "exclude": LOOKUP_EXCLUDE}
+            if self.cursors[-1]:
+                params["cursor"] = self.cursors[-1]
+            response = await client.get("/parse-pdf", params=params)
+            response.raise_for_status()
+            next_cursor = response.json()["next_cursor"]
+            if not next_cursor:
+                break
+            self.cursors.append(next_cursor)
+
+    def _request(self, name: str) -> Tuple[str, str, Dict[str, Any]]:
+        """(method, url, httpx kwargs) of one request of kind `name`."""
+        if name == "parse":
+            return "POST", "/parse-pdf", {"json": {}}
+        if name == "parse_pages":
+            return "POST", "/parse-pdf", {"json": {"max_pages": self.parse_pages}}
+        if name == "health":
+            return "GET", "/health", {}
+        if name == "lookup":
+            # Random page of the paginated GET, without coordinates
+            params = {"limit": LOOKUP_LIMIT, "exclude": LOOKUP_EXCLUDE}
+            cursor = self.rng.choice(self.cursors)
+            if cursor:
+                params["cursor"] = cursor
+            return "GET", "/parse-pdf", {"params": params}
+        if name == "verify":
+            return "POST", "/verify", {"json": {"quotes": [self.rng.choice(self.quotes)]}}
+        if name == "highlight":
+            chunk_id = self.rng.choice(self.chunk_ids)
+            return "GET", f"/chunks/{chunk_id}/highlight.png", {}
+        page = self.rng.randint(1, self.page_count)
+        return "GET", f"/pages/{page}.png", {}
+
+    async def run_level(self, client, concurrency: int, duration: float) -> Dict[str, Any]:
+        results: Dict[str, List[Tuple[float, bool]]] = {name: [] for name in self.names}
+        deadline = time.perf_counter() + duration
+
+        async def worker():
+            while time.perf_counter() < deadline:
+                name = self.rng.choices(self.names, self.weights)[0]
+                method, url, kwargs = self._request(name)
+                start = time.perf_counter()
+                try:
+                    response = await client.request(method, url, **kwargs)
+                    ok = response.status_code < 400
+                except Exception:
+                    ok = False
+                results[name].append((time.perf_counter() - start, ok))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+        everything = [s for samples in results.values() for s in samples]
+        return {
+            "concurrency": concurrency,
+            "duration_s": round(elapsed, 3),
+            **_summarize(everything, elapsed),
+            "endpoints": {
+                name: _summarize(samples, elapsed)
+                for name, samples in results.items()
+                if samples
+            },
+        }
+
+
+async def _sample_rss(timeline: List[Dict[str, float]], started: float, interval: float):
+    while True:
+        timeline.append(
+            {"t_s": round(time.perf_counter() - started, 2), "rss_mb": round(current_rss_mb(), 1)}
+        )
+        await asyncio.sleep(interval)
+
+
+async def run(args, port: int) -> Dict[str, Any]:
+    import httpx
+
+    started = time.perf_counter()
+    timeline: List[Dict[str, float]] = []
+    sampler = asyncio.create_task(_sample_rss(timeline, started, args.sample_interval))
+
+    test = LoadTest(f"http://127.0.0.1:{port}", _parse_mix(args.mix), args.parse_pages, args.seed)
+    limits = httpx.Limits(max_connections=max(args.concurrency))
+    async with httpx.AsyncClient(
+        base_url=test.base_url, timeout=args.timeout, limits=limits
+    ) as client:
+        warmup = await test.wait_ready(client, args.timeout)
+        await test.discover(client)
+        levels = []
+        for concurrency in args.concurrency:
+            levels.append(await test.run_level(client, concurrency, args.duration))
+
+    sampler.cancel()
+    timeline.append({"t_s": round(time.perf_counter() - started, 2), "rss_mb": round(current_rss_mb(), 1)})
+    return {
+        "warmup_s": round(warmup, 3),
+        "chunks": test.total_chunks,
+        "pages": test.page_count,
+        "levels": levels,
+        "rss_timeline": timeline,
+        "peak_rss_mb": round(max(s["rss_mb"] for s in timeline), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parser service HTTP load test")
+    parser.add_argument("--pdf", help="Load-test an existing PDF instead of a synthetic one")
+    parser.add_argument("--chapters", type=int, default=8)
+    parser.add_argument("--articles-per-section", type=int, default=6)
+    parser.add_argument("--font-file", default=None)
+    parser.add_argument(
+        "--concurrency",
+        type=lambda v: [int(c) for c in v.split(",")],
+        default=[1, 4, 16],
+        help="Comma-separated concurrency levels, run one after the other",
+    )
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per level")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Weighted request mix, endpoints: {', '.join(ENDPOINTS)}")
+    parser.add_argument("--parse-pages", type=int, default=5, help="max_pages of parse_pages requests")
+    parser.add_argument("--executor-workers", type=int, default=0, help="PARSER_EXECUTOR_WORKERS of the service")
+    parser.add_argument("--pool-size", type=int, default=4, help="PDF_POOL_SIZE of the service")
+    parser.add_argument("--parser-workers", type=int, default=1, help="PARSER_WORKERS of the service")
+    parser.add_argument(
+        "--sqlite",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Write parses to a SQLite database in the temp dir (SQLITE_PATH)",
+    )
+    parser.add_argument("--sample-interval", type=float, default=0.5, help="RSS sampling period (s)")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.pdf:
+            pdf_path = os.path.abspath(args.pdf)
+            document = {"source": os.path.basename(args.pdf)}
+        else:
+            pdf_path = os.path.join(tmp, "synthetic-law.pdf")
+            counts = generate_law_pdf(
+                pdf_path,
+                chapters=args.chapters,
+                articles_per_section=args.articles_per_section,
+                font_file=args.font_file,
+            )
+            document = {"source": "synthetic", "counts": counts}
+
+        # The service is configured through its environment, before `app` is imported.
+        # Every setting is explicit so nothing leaks in from the caller's environment,
+        # and every path lives in the temp dir
+        service_env = {
+            "PDF_PATH": pdf_path,
+            "PAGE_CACHE_DIR": os.path.join(tmp, "pages"),
+            "CORPUS_ARTIFACT": os.path.join(tmp, "corpus.json.gz"),
+            "CORPUS_WARMUP": "1",
+            "RENDER_CACHE_DIR": os.path.join(tmp, "renders"),
+            "SQLITE_PATH": os.path.join(tmp, "corpus.db") if args.sqlite else "",
+            "PDF_POOL_SIZE": str(args.pool_size),
+            "PARSER_WORKERS": str(args.parser_workers),
+            "PARSER_EXECUTOR_WORKERS": str(args.executor_workers),
+        }
+        os.environ.update(service_env)
+        port = _free_port()
+        with ServerThread(port):
+            result = asyncio.run(run(args, port))
+
+    report = {
+        "document": document,
+        "config": {
+            "mix": _parse_mix(args.mix),
+            "duration_s": args.duration,
+            "executor_workers": args.executor_workers or None,
+            "parser_workers": args.parser_workers,
+            "pool_size": args.pool_size,
+            "sqlite": args.sqlite,
+        },
+        # Temp paths are gone once the run ends; kept to show what the service used
+        "service_env": {k: v for k, v in service_env.items() if k != "PDF_PATH"},
+        "environment": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+        },
+        **result,
+    }
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
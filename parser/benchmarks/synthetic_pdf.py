@@ -0,0 +1,279 @@
+"""
+Synthetic Vietnamese law PDF generator for parser benchmarks.
+
+Builds a PDF laid out like a consolidated law (VBHN): chapters, sections,
+articles with clauses and points, superscript footnote markers with their
+footnotes at the bottom of the page, and page numbers in the footer.
+
+Usage:
+    python -m benchmarks.synthetic_pdf out.pdf --chapters 16 --articles-per-section 6
+"""
+
+import argparse
+import json
+import random
+from typing import Any, Dict, Optional
+
+import fitz  # PyMuPDF
+
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842  # A4
+MARGIN = 57
+BODY_SIZE = 13
+FOOTNOTE_SIZE = 10
+MARKER_SIZE = 7
+LINE_GAP = 1.35
+
+ROMAN = [
+    "I", "II", "III", "IV", "V", "VI", "VII", "VIII", "IX", "X",
+    "XI", "XII", "XIII", "XIV", "XV", "XVI", "XVII", "XVIII", "XIX", "XX",
+]  # fmt: skip
+POINT_LABELS = "a b c d đ e g h i k l m n o p q r s t u v x y".split()
+
+SENTENCES = [
+    "Nhà nước thu hồi đất vì mục đích quốc phòng, an ninh",
+    "bồi thường, hỗ trợ, tái định cư khi Nhà nước thu hồi đất",
+    "người sử dụng đất được Nhà nước giao đất, cho thuê đất",
+    "theo quy định của Luật này và quy định khác của pháp luật có liên quan",
+    "Ủy ban nhân dân cấp tỉnh quyết định giá đất cụ thể",
+    "tiền sử dụng đất, tiền thuê đất phải nộp theo quy định của pháp luật",
+    "cấp Giấy chứng nhận quyền sử dụng đất, quyền sở hữu tài sản gắn liền với đất",
+    "quy hoạch, kế hoạch sử dụng đất được cơ quan có thẩm quyền phê duyệt",
+    "trường hợp đất được Nhà nước giao không thu tiền sử dụng đất",
+    "hộ gia đình, cá nhân trực tiếp sản xuất nông nghiệp",
+]
+TITLES = [
+    "Thu hồi đất vì mục đích quốc phòng, an ninh",
+    "Bồi thường về đất khi Nhà nước thu hồi đất",
+    "Quyền và nghĩa vụ của người sử dụng đất",
+    "Giá đất và định giá đất",
+    "Đăng ký đất đai, tài sản gắn liền với đất",
+    "Quy định chuyển tiếp",
+]
+FOOTNOTES = [
+    "Điều này được sửa đổi, bổ sung theo quy định tại khoản {n} Điều 1 của Luật số 43/2024/QH15.",
+    "Cụm từ này được thay thế theo quy định tại điểm a khoản {n} Điều 2 của Luật số 31/2024/QH15.",
+    "Khoản này được bãi bỏ theo quy định tại khoản {n} Điều 3 của Luật số 43/2024/QH15.",
+]
+
+
+def _load_font(font_file: Optional[str]) -> fitz.Font:
+    if font_file:
+        return fitz.Font(fontfile=font_file)
+    try:
+        # Noto Sans from the optional `pymupdf-fonts` package covers Vietnamese
+        return fitz.Font("notos")
+    except Exception as e:
+        raise RuntimeError(
+            "No Vietnamese-capable font available: install `pymupdf-fonts` "
+            "or pass --font-file"
+        ) from e
+
+
+class _Writer:
+    """Lays out lines top-down and flushes footnotes at the bottom of each page."""
+
+    def __init__(self, doc: fitz.Document, font: fitz.Font):
+        self.doc = doc
+        self.font = font
+        self.page = None
+        self.y = 0.0
+        self.notes = []  # [(number, wrapped lines)] for the current page
+        self.footnote_count = 0
+        self._advances: Dict[str, float] = {}
+        self._new_page()
+
+    def _text_width(self, text: str, size: float) -> float:
+        # Font.text_length is slow per call: cache glyph advances per character
+        width = 0.0
+        for char in text:
+            advance = self._advances.get(char)
+            if advance is None:
+                advance = self._advances[char] = self.font.glyph_advance(ord(char))
+            width += advance
+        return width * size
+
+    def _notes_height(self, extra_lines: int = 0) -> float:
+        lines = sum(len(wrapped) for _, wrapped in self.notes)
+        return (lines + extra_lines) * FOOTNOTE_SIZE * LINE_GAP + (
+            12 if self.notes or extra_lines else 0
+        )
+
+    def _body_limit(self, extra_note_lines: int = 0) -> float:
+        # Footer: page number + footnotes area
+        return PAGE_HEIGHT - MARGIN - 20 - self._notes_height(extra_note_lines)
+
+    def _wrap(self, text: str, size: float, indent: float = 0):
+        width = PAGE_WIDTH - 2 * MARGIN - indent
+        space = self._text_width(" ", size)
+        lines, current, current_width = [], "", 0.0
+        for word in text.split():
+            word_width = self._text_width(word, size)
+            if current and current_width + space + word_width > width:
+                lines.append(current)
+                current, current_width = word, word_width
+            elif current:
+                current += " " + word
+                current_width += space + word_width
+            else:
+                current, current_width = word, word_width
+        if current:
+            lines.append(current)
+        return lines
+
+    def _new_page(self):
+        if self.page is not None:
+            self._flush_page()
+        self.page = self.doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+        self.y = MARGIN + BODY_SIZE
+
+    def _flush_page(self):
+        writer = fitz.TextWriter(self.page.rect)
+        y = PAGE_HEIGHT - MARGIN - 20 - self._notes_height() + 12 + FOOTNOTE_SIZE
+        for number, wrapped in self.notes:
+            writer.append((MARGIN, y - 3), str(number), font=self.font, fontsize=MARKER_SIZE)
+            for line in wrapped:
+                writer.append((MARGIN + 8, y), line, font=self.font, fontsize=FOOTNOTE_SIZE)
+                y += FOOTNOTE_SIZE * LINE_GAP
+        # Page number (small, digit only: filtered as noise by the parser)
+        page_label = str(self.page.number + 1)
+        x = (PAGE_WIDTH - self._text_width(page_label, FOOTNOTE_SIZE)) / 2
+        writer.append((x, PAGE_HEIGHT - MARGIN + 10), page_label, font=self.font, fontsize=FOOTNOTE_SIZE)
+        writer.write_text(self.page)
+        self.notes = []
+
+    def paragraph(self, text: str, footnote: Optional[str] = None):
+        """Write a wrapped body paragraph, optionally ending with a footnote marker."""
+        lines = self._wrap(text, BODY_SIZE)
+        note_wrapped = self._wrap(footnote, FOOTNOTE_SIZE, indent=8) if footnote else []
+        for k, line in enumerate(lines):
+            is_last = k == len(lines) - 1
+            extra = len(note_wrapped) if (footnote and is_last) else 0
+            if self.y > self._body_limit(extra):
+                self._new_page()
+            writer = fitz.TextWriter(self.page.rect)
+            writer.append((MARGIN, self.y), line, font=self.font, fontsize=BODY_SIZE)
+            if footnote and is_last:
+                self.footnote_count += 1
+                x = MARGIN + self._text_width(line, BODY_SIZE) + 1
+                writer.append(
+                    (x, self.y - 5), str(self.footnote_count), font=self.font, fontsize=MARKER_SIZE
+                )
+                self.notes.append((self.footnote_count, note_wrapped))
+            writer.write_text(self.page)
+            self.y += BODY_SIZE * LINE_GAP
+
+    def close(self):
+        self._flush_page()
+
+
+def generate_law_pdf(
+    path: str,
+    chapters: int = 4,
+    sections_per_chapter: int = 2,
+    articles_per_section: int = 5,
+    clauses_per_article: int = 4,
+    points_per_clause: int = 3,
+    footnote_every: int = 3,
+    seed: int = 0,
+    font_file: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Generate a synthetic consolidated-law PDF.
+
+    Args:
+        path: Output PDF path
+        chapters: Number of chapters ("Chương I", ...)
+        sections_per_chapter: Sections ("Mục 1", ...) per chapter, 0 for none
+        articles_per_section: Articles per section (or per chapter without sections)
+        clauses_per_article: Numbered clauses per article, 0 for single-body articles
+        points_per_clause: Lettered points in the first clause of each article
+        footnote_every: Every n-th article title and clause carries a footnote, 0 for none
+        seed: Random seed for the filler text
+        font_file: TTF/OTF font covering Vietnamese (defaults to Noto Sans)
+
+    Returns:
+        Counts of the generated document elements
+    """
+    if chapters > len(ROMAN):
+        raise ValueError(f"At most {len(ROMAN)} chapters are supported")
+
+    rng = random.Random(seed)
+    doc = fitz.open()
+    writer = _Writer(doc, _load_font(font_file))
+
+    def sentence(n: int) -> str:
+        return ", ".join(rng.choice(SENTENCES) for _ in range(n))
+
+    def note() -> Optional[str]:
+        return rng.choice(FOOTNOTES).format(n=rng.randint(1, 30))
+
+    counts = {"chapters": chapters, "sections": 0, "articles": 0, "clauses": 0, "points": 0}
+    for c in range(chapters):
+        writer.paragraph(f"Chương {ROMAN[c]}")
+        writer.paragraph(rng.choice(TITLES).upper())
+        for s in range(max(sections_per_chapter, 1)):
+            if sections_per_chapter:
+                counts["sections"] += 1
+                writer.paragraph(f"Mục {s + 1}")
+                writer.paragraph(rng.choice(TITLES).upper())
+            for _ in range(articles_per_section):
+                counts["articles"] += 1
+                art = counts["articles"]
+                with_note = footnote_every and art % footnote_every == 0
+                writer.paragraph(
+                    f"Điều {art}. {rng.choice(TITLES)}", footnote=note() if with_note else None
+                )
+                if not clauses_per_article:
+                    writer.paragraph(sentence(4).capitalize() + ".")
+                    continue
+                for k in range(1, clauses_per_article + 1):
+                    counts["clauses"] += 1
+                    clause_note = footnote_every and (art + k) % (footnote_every * 2) == 0
+                    writer.paragraph(
+                        f"{k}. {sentence(rng.randint(1, 3)).capitalize()}"
+                        + (":" if k == 1 and points_per_clause else "."),
+                        footnote=note() if clause_note else None,
+                    )
+                    if k == 1:
+                        for p in range(points_per_clause):
+                            counts["points"] += 1
+                            label = POINT_LABELS[p % len(POINT_LABELS)]
+                            writer.paragraph(f"{label}) {sentence(1)};")
+
+    writer.close()
+    counts["footnotes"] = writer.footnote_count
+    counts["pages"] = len(doc)
+    doc.save(path, garbage=3, deflate=True)
+    doc.close()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("output", help="Output PDF path")
+    parser.add_argument("--chapters", type=int, default=4)
+    parser.add_argument("--sections-per-chapter", type=int, default=2)
+    parser.add_argument("--articles-per-section", type=int, default=5)
+    parser.add_argument("--clauses-per-article", type=int, default=4)
+    parser.add_argument("--points-per-clause", type=int, default=3)
+    parser.add_argument("--footnote-every", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--font-file", default=None)
+    args = parser.parse_args()
+
+    counts = generate_law_pdf(
+        args.output,
+        chapters=args.chapters,
+        sections_per_chapter=args.sections_per_chapter,
+        articles_per_section=args.articles_per_section,
+        clauses_per_article=args.clauses_per_article,
+        points_per_clause=args.points_per_clause,
+        footnote_every=args.footnote_every,
+        seed=args.seed,
+        font_file=args.font_file,
+    )
+    print(json.dumps(counts, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
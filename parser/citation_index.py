@@ -0,0 +1,369 @@
+"""
+Substring index over the parsed corpus for verifying quoted law text.
+
+The chunk texts are normalized (NFC, lower case, whitespace runs collapsed to
+one space) and concatenated, separated by a "\\x00" sentinel that never
+occurs in a quote, so no match can straddle two chunks. A suffix array over
+that text is built once per corpus with numpy prefix doubling; every
+normalized position keeps its offset in the original `page_content`, so
+matches are reported in chunk coordinates.
+
+- Exact lookup: two binary searches over the suffix array, O(m log n) for a
+  quote of m characters.
+- Approximate lookup (when there is no exact match): fixed-length seeds of
+  the quote are looked up exactly, their occurrences vote for an alignment,
+  and the best-voted windows are scored with difflib.
+
+Citations ("Điều 79", "khoản 2", "điểm a") are checked against the
+`article_id` / `clause_id` / `point_id` of the matched chunks; matches in
+the cited article are ranked first.
+"""
+
+import re
+import unicodedata
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+SEPARATOR = "\x00"
+
+# Approximate matching: seed length and number of seeds taken from a quote
+SEED_LENGTH = 16
+MAX_SEEDS = 12
+# Seeds occurring more often than this carry no information (boilerplate)
+MAX_SEED_OCCURRENCES = 64
+# Candidate alignments scored with difflib per quote
+MAX_CANDIDATES = 8
+DEFAULT_MIN_SCORE = 0.8
+
+# Typographic quotes/ellipses a chatbot wraps around quoted text
+_QUOTE_STRIP = " \t\r\n\"'“”‘’«»….,;:"
+
+_REF_RE = re.compile(r"(\d+[a-zđ]?|[a-zđ])\)?$")
+
+
+def normalize_quote(text: str) -> str:
+    """Normalize a quote the same way as the indexed corpus."""
+    return " ".join(unicodedata.normalize("NFC", text).lower().split()).strip(_QUOTE_STRIP)
+
+
+def normalize_ref(ref: Optional[str]) -> Optional[str]:
+    """
+    Bare id of an article/clause/point reference, as in chunk metadata:
+    "Điều 79" -> "79", "Khoản 2" -> "2", "điểm a)" -> "a". None if empty.
+    """
+    if ref is None:
+        return None
+    value = unicodedata.normalize("NFC", str(ref)).strip().lower().rstrip(".")
+    if not value:
+        return None
+    match = _REF_RE.search(value)
+    return match.group(1) if match else value
+
+
+def build_suffix_array(text: str) -> np.ndarray:
+    """Suffix array of `text` (code-point order) by prefix doubling."""
+    n = len(text)
+    if n == 0:
+        return np.zeros(0, dtype=np.int32)
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    _, rank = np.unique(codes, return_inverse=True)
+    rank = rank.astype(np.int64)
+    k = 1
+    while True:
+        # Sort by (rank of the first k chars, rank of the next k chars)
+        second = np.full(n, -1, dtype=np.int64)
+        second[: n - k] = rank[k:]
+        sa = np.lexsort((second, rank))
+        first_sorted, second_sorted = rank[sa], second[sa]
+        boundary = np.empty(n, dtype=bool)
+        boundary[0] = True
+        boundary[1:] = (first_sorted[1:] != first_sorted[:-1]) | (
+            second_sorted[1:] != second_sorted[:-1]
+        )
+        rank = np.empty(n, dtype=np.int64)
+        rank[sa] = np.cumsum(boundary) - 1
+        if rank[sa[-1]] == n - 1 or k >= n:
+            return sa.astype(np.int32)
+        k *= 2
+
+
+class CitationIndex:
+    """Suffix-array index over the chunk texts of a corpus (read-only)."""
+
+    def __init__(self, chunks: Sequence[Dict[str, Any]]):
+        self.chunks = chunks
+        parts: List[str] = []
+        offsets: List[int] = []  # normalized position -> offset in page_content
+        starts: List[int] = []  # normalized start of every chunk
+        self._by_article: Dict[str, List[int]] = {}
+        position = 0
+        for index, chunk in enumerate(chunks):
+            starts.append(position)
+            article = normalize_ref(chunk["metadata"].get("article_id"))
+            self._by_article.setdefault(article, []).append(index)
+            text, mapping = self._normalize_with_offsets(chunk["page_content"])
+            parts.append(text + SEPARATOR)
+            offsets.extend(mapping)
+            offsets.append(-1)
+            position += len(text) + 1
+
+        self.text = "".join(parts)
+        self.offsets = np.array(offsets, dtype=np.int32)
+        self.starts = np.array(starts, dtype=np.int64)
+        self.suffix_array = build_suffix_array(self.text)
+
+    @staticmethod
+    def _normalize_with_offsets(text: str) -> Tuple[str, List[int]]:
+        chars: List[str] = []
+        mapping: List[int] = []
+        pending_space = False
+        for i, char in enumerate(unicodedata.normalize("NFC", text)):
+            if char.isspace():
+                pending_space = bool(chars)
+                continue
+            if pending_space:
+                chars.append(" ")
+                mapping.append(i - 1)
+                pending_space = False
+            lower = char.lower()
+            # Keep one char per position ("İ".lower() is two code points)
+            chars.append(lower if len(lower) == 1 else char)
+            mapping.append(i)
+        return "".join(chars), mapping
+
+    def __len__(self):
+        return len(self.text)
+
+    # --- Exact lookup ---
+
+    def _bounds(self, pattern: str) -> Tuple[int, int]:
+        """[lo, hi) range of the suffix array starting with `pattern`."""
+        text, sa, m = self.text, self.suffix_array, len(pattern)
+        lo, hi = 0, len(sa)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if text[sa[mid] : sa[mid] + m] < pattern:
+                lo = mid + 1
+            else:
+                hi = mid
+        first, hi = lo, len(sa)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if text[sa[mid] : sa[mid] + m] <= pattern:
+                lo = mid + 1
+            else:
+                hi = mid
+        return first, lo
+
+    def find_exact(self, pattern: str, limit: Optional[int] = None) -> List[int]:
+        """Sorted normalized positions of `pattern` (already normalized)."""
+        if not pattern or SEPARATOR in pattern:
+            return []
+        lo, hi = self._bounds(pattern)
+        if limit is not None:
+            hi = min(hi, lo + limit)
+        return sorted(int(p) for p in self.suffix_array[lo:hi])
+
+    def count(self, pattern: str) -> int:
+        lo, hi = self._bounds(pattern)
+        return hi - lo
+
+    # --- Approximate lookup ---
+
+    def _chunk_span(self, chunk_index: int) -> Tuple[int, int]:
+        start = int(self.starts[chunk_index])
+        end = (
+            int(self.starts[chunk_index + 1]) - 1
+            if chunk_index + 1 < len(self.starts)
+            else len(self.text) - 1
+        )
+        return start, end
+
+    def find_approximate(
+        self,
+        pattern: str,
+        min_score: float = DEFAULT_MIN_SCORE,
+        article_id: Optional[str] = None,
+    ) -> List[Tuple[int, int, float]]:
+        """
+        (start, end, score) of the best alignments of `pattern`, normalized
+        positions, best first. Score is difflib's ratio between the quote and
+        the aligned span. Seeds too frequent to vote corpus-wide still vote
+        inside the chunks of `article_id` (normalized), if given.
+        """
+        m = len(pattern)
+        if m < SEED_LENGTH:
+            return []
+        preferred = [self._chunk_span(i) for i in self._by_article.get(article_id, [])]
+
+        # Evenly spaced seeds; each occurrence votes for a quote start position
+        seed_count = min(MAX_SEEDS, m - SEED_LENGTH + 1)
+        step = (m - SEED_LENGTH) / max(seed_count - 1, 1)
+        votes: Counter = Counter()
+        for s in range(seed_count):
+            offset = round(s * step)
+            seed = pattern[offset : offset + SEED_LENGTH]
+            lo, hi = self._bounds(seed)
+            positions = self.suffix_array[lo:hi]
+            if hi - lo > MAX_SEED_OCCURRENCES:
+                if not preferred:
+                    continue
+                inside = np.zeros(len(positions), dtype=bool)
+                for start, end in preferred:
+                    inside |= (positions >= start) & (positions < end)
+                positions = positions[inside]
+            for position in positions:
+                votes[int(position) - offset] += 1
+
+        results = []
+        scored: List[Tuple[int, int]] = []  # (chunk, diagonal) already aligned
+        slack = m // 4 + 8
+        candidates = votes.most_common(MAX_CANDIDATES * 4)
+        # Alignments with far fewer seed hits than the best one are not scored
+        min_votes = (candidates[0][1] + 1) // 2 if candidates else 0
+        for diagonal, count in candidates:
+            if count < min_votes:
+                break
+            chunk_index = int(np.searchsorted(self.starts, max(diagonal, 0), "right")) - 1
+            # Nearby diagonals (insertions/deletions) share one window
+            if any(c == chunk_index and abs(d - diagonal) <= slack for c, d in scored):
+                continue
+            scored.append((chunk_index, diagonal))
+            chunk_start, chunk_end = self._chunk_span(chunk_index)
+            window_start = max(chunk_start, diagonal - slack)
+            window_end = min(chunk_end, diagonal + m + slack)
+            if window_end <= window_start:
+                continue
+
+            window = self.text[window_start:window_end]
+            matcher = SequenceMatcher(None, pattern, window, autojunk=False)
+            blocks = [b for b in matcher.get_matching_blocks() if b.size]
+            if not blocks:
+                continue
+            span_start = blocks[0].b
+            span_end = blocks[-1].b + blocks[-1].size
+            matched = sum(b.size for b in blocks)
+            score = 2 * matched / (m + span_end - span_start)
+            if score >= min_score:
+                results.append((window_start + span_start, window_start + span_end, score))
+            if len(scored) >= MAX_CANDIDATES:
+                break
+
+        # Best alignment first; drop weaker ones overlapping it
+        results.sort(key=lambda r: -r[2])
+        kept: List[Tuple[int, int, float]] = []
+        for start, end, score in results:
+            if all(end <= s or start >= e for s, e, _ in kept):
+                kept.append((start, end, score))
+        return kept
+
+    # --- Verification ---
+
+    def _match(self, start: int, end: int, score: float) -> Dict[str, Any]:
+        """Normalized span -> chunk id and offsets in its `page_content`."""
+        chunk_index = int(np.searchsorted(self.starts, start, "right")) - 1
+        chunk = self.chunks[chunk_index]
+        metadata = chunk["metadata"]
+        return {
+            "chunk_id": metadata["chunk_id"],
+            "article_id": metadata.get("article_id"),
+            "clause_id": metadata.get("clause_id"),
+            "point_id": metadata.get("point_id"),
+            "start": int(self.offsets[start]),
+            "end": int(self.offsets[end - 1]) + 1,
+            "score": round(score, 4),
+            "page_number": metadata.get("page_number", []),
+        }
+
+    def verify(
+        self,
+        quote: str,
+        article_id: Optional[str] = None,
+        clause_id: Optional[str] = None,
+        point_id: Optional[str] = None,
+        max_matches: int = 5,
+        min_score: float = DEFAULT_MIN_SCORE,
+    ) -> Dict[str, Any]:
+        """
+        Locate `quote` in the corpus and check it against the cited ids.
+
+        Returns:
+            {"status": "exact" | "approximate" | "not_found",
+             "citation_match": True/False/None (None: nothing cited or found),
+             "matches": [{chunk_id, start, end, score, page_number, ...,
+                          "article_match", "clause_match", "point_match"}]}
+            Matches in the cited article (then clause, point) come first.
+        """
+        pattern = normalize_quote(quote)
+        cited = {
+            "article_id": normalize_ref(article_id),
+            "clause_id": normalize_ref(clause_id),
+            "point_id": normalize_ref(point_id),
+        }
+
+        # Boilerplate quotes can occur in many chunks: rank a bounded sample
+        positions = self.find_exact(pattern, limit=max(max_matches, 1) * 50)
+        if positions:
+            status = "exact"
+            spans = [(p, p + len(pattern), 1.0) for p in positions]
+        else:
+            spans = self.find_approximate(pattern, min_score, cited["article_id"])
+            status = "approximate" if spans else "not_found"
+
+        matches = []
+        for start, end, score in spans:
+            match = self._match(start, end, score)
+            for field, flag in (
+                ("article_id", "article_match"),
+                ("clause_id", "clause_match"),
+                ("point_id", "point_match"),
+            ):
+                # None: not cited, or the chunk is coarser than the citation
+                if cited[field] is None or match[field] is None:
+                    match[flag] = None
+                else:
+                    match[flag] = normalize_ref(match[field]) == cited[field]
+            matches.append(match)
+
+        def rank(match):
+            flags = (match["article_match"], match["clause_match"], match["point_match"])
+            return tuple(flag is False for flag in flags) + (-match["score"],)
+
+        matches.sort(key=rank)
+        matches = matches[:max_matches]
+
+        citation_match = None
+        if matches and any(value is not None for value in cited.values()):
+            best = matches[0]
+            citation_match = not any(
+                best[flag] is False
+                for flag in ("article_match", "clause_match", "point_match")
+            )
+        return {"status": status, "citation_match": citation_match, "matches": matches}
+
+
+def locate_span(doc, text: str, pages: Iterable[int]) -> List[Dict[str, Any]]:
+    """
+    Page rects of a matched span, searched only on the chunk's pages (same
+    shape as chunk `coordinates`). Chunk texts join context with " | ", which
+    is not in the PDF, so the longest piece of the span is searched.
+    """
+    pieces = [" ".join(piece.split()) for piece in text.split(" | ")]
+    phrase = max(pieces, key=len)[:50] if pieces else ""
+    if not phrase:
+        return []
+    locations = []
+    for page_num in pages:
+        if page_num - 1 >= len(doc):
+            continue
+        for q in doc[page_num - 1].search_for(phrase):
+            locations.append(
+                {
+                    "page": page_num,
+                    "rect": [round(q.x0, 2), round(q.y0, 2), round(q.x1, 2), round(q.y1, 2)],
+                }
+            )
+    return locations
@@ -0,0 +1,239 @@
+"""
+Shared, read-only parsed corpus for the parser service.
+
+The Land Law PDF behind the service is fixed, so the full parse is done once
+per process and reused by every request. At startup the service either loads
+a prebuilt artifact (gzip JSON written by `save()` / `python corpus.py`) whose
+key still matches the PDF and corrections file, or parses the PDF once and
+writes the artifact for the next cold start.
+
+`ParsedCorpus` is shared between concurrent requests and must not be mutated:
+use `copy_chunks()` before changing chunk metadata.
+
+Usage:
+    python corpus.py --pdf ./data/133-vbhn-vpqh.pdf --output ./.cache/corpus.json.gz
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from typing import Any, Dict, List, Optional
+
+from corrections import DEFAULT_CORRECTIONS_PATH, corrections_fingerprint
+from page_cache import file_sha256
+from term_tagger import DEFAULT_TERMS_PATH, terms_fingerprint
+
+# Bump when the parser output (chunk text or metadata) changes: part of every
+# corpus key, so stale artifacts and client ETags are invalidated
+PARSER_VERSION = "6"
+
+# Bump when the artifact layout changes
+CORPUS_ARTIFACT_VERSION = 1
+
+logger = logging.getLogger("land_law_parser")
+
+
+def corpus_key(
+    pdf_path: str,
+    corrections_path: str = DEFAULT_CORRECTIONS_PATH,
+    terms_path: str = DEFAULT_TERMS_PATH,
+) -> str:
+    """
+    Key of a full parse, computed without opening the PDF.
+
+    Same format as `LandLawChunkerFinal.result_cache_key()` for `max_pages=None`.
+    """
+    corrections = corrections_fingerprint(corrections_path)
+    terms = terms_fingerprint(terms_path)
+    return f"{PARSER_VERSION}:{file_sha256(pdf_path)}:{corrections}:{terms}:all"
+
+
+class ParsedCorpus:
+    """Immutable result of a full `LandLawChunkerFinal.process()` run."""
+
+    __slots__ = (
+        "key",
+        "version",
+        "chunks",
+        "structure",
+        "footnotes",
+        "page_classification",
+        "_by_id",
+    )
+
+    def __init__(
+        self,
+        key: str,
+        chunks: List[Dict[str, Any]],
+        structure: List[Dict[str, Any]],
+        footnotes: Dict[str, Dict[str, Any]],
+        page_classification: List[Dict[str, Any]],
+    ):
+        self.key = key
+        # Short, header-safe digest of the key (parser version + PDF + corrections)
+        self.version = hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+        self.chunks = tuple(chunks)
+        self.structure = tuple(structure)
+        self.footnotes = footnotes
+        self.page_classification = tuple(page_classification)
+        self._by_id = {c["metadata"]["chunk_id"]: c for c in self.chunks}
+
+    def __len__(self):
+        return len(self.chunks)
+
+    def get_chunk(self, chunk_id: str) -> Optional[Dict[str, Any]]:
+        """Chunk by `chunk_id` (read-only), or None."""
+        return self._by_id.get(chunk_id)
+
+    def copy_chunks(self) -> List[Dict[str, Any]]:
+        """Chunks with their own metadata dicts, safe to modify per request."""
+        return [
+            {"page_content": c["page_content"], "metadata": dict(c["metadata"])}
+            for c in self.chunks
+        ]
+
+    def to_result(self) -> Dict[str, Any]:
+        """Same shape as `LandLawChunkerFinal.process()`, with copied chunks."""
+        return {
+            "chunks": self.copy_chunks(),
+            "structure": list(self.structure),
+            "footnotes": self.footnotes,
+            "page_classification": list(self.page_classification),
+        }
+
+    def save(self, path: str):
+        """Atomically write the corpus as a gzip JSON artifact."""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        data = {
+            "version": CORPUS_ARTIFACT_VERSION,
+            "key": self.key,
+            "chunks": list(self.chunks),
+            "structure": list(self.structure),
+            "footnotes": self.footnotes,
+            "page_classification": list(self.page_classification),
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.open(raw, "wt", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: str, key: Optional[str] = None) -> Optional["ParsedCorpus"]:
+        """
+        Load an artifact written by `save()`.
+
+        Returns:
+            The corpus, or None when the file is missing, unreadable, of another
+            artifact version or built for a different `key`
+        """
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != CORPUS_ARTIFACT_VERSION:
+            return None
+        if key is not None and data.get("key") != key:
+            return None
+        return cls(
+            data["key"],
+            data["chunks"],
+            data["structure"],
+            data["footnotes"],
+            data["page_classification"],
+        )
+
+
+def build_corpus(
+    pdf_path: str,
+    cache_dir: Optional[str] = None,
+    corrections_path: str = DEFAULT_CORRECTIONS_PATH,
+    workers: int = 1,
+    sink=None,
+) -> ParsedCorpus:
+    """Parse the whole PDF into a `ParsedCorpus`, also writing it to `sink` (a `SQLiteSink`)."""
+    # PyMuPDF is only imported when a parse is actually needed
+    from land_law_parser import LandLawChunkerFinal
+
+    parser = LandLawChunkerFinal(
+        pdf_path,
+        cache_dir=cache_dir,
+        corrections_path=corrections_path,
+        workers=workers,
+        sink=sink,
+    )
+    result = parser.process()
+    return ParsedCorpus(
+        parser.result_cache_key(),
+        result["chunks"],
+        result["structure"],
+        result["footnotes"],
+        result["page_classification"],
+    )
+
+
+def load_or_build(
+    pdf_path: str,
+    artifact_path: Optional[str] = None,
+    cache_dir: Optional[str] = None,
+    corrections_path: str = DEFAULT_CORRECTIONS_PATH,
+    workers: int = 1,
+    sink=None,
+) -> ParsedCorpus:
+    """
+    Load the artifact if it matches the PDF and corrections, otherwise parse
+    the PDF and (re)write the artifact. With a `sink`, a parse is also done
+    when the sink does not hold this corpus yet, to populate it.
+    """
+    if artifact_path:
+        key = corpus_key(pdf_path, corrections_path)
+        corpus = ParsedCorpus.load(artifact_path, key)
+        if corpus is not None and (sink is None or sink.has_document(key)):
+            logger.info("📦 Loaded %d chunks from %s", len(corpus), artifact_path)
+            return corpus
+
+    corpus = build_corpus(pdf_path, cache_dir, corrections_path, workers, sink)
+    if artifact_path:
+        try:
+            corpus.save(artifact_path)
+        except OSError as e:
+            # Read-only filesystem: the corpus is still usable for this process
+            logger.warning("⚠️ Could not write corpus artifact %s: %s", artifact_path, e)
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the prebuilt parsed-corpus artifact")
+    parser.add_argument("--pdf", default="./data/133-vbhn-vpqh.pdf")
+    parser.add_argument("--output", default="./.cache/corpus.json.gz")
+    parser.add_argument("--cache-dir", default=os.getenv("PAGE_CACHE_DIR", "./.cache/pages"))
+    parser.add_argument("--corrections", default=DEFAULT_CORRECTIONS_PATH)
+    parser.add_argument("--workers", type=int, default=int(os.getenv("PARSER_WORKERS", "1")))
+    parser.add_argument(
+        "--sqlite", default=os.getenv("SQLITE_PATH"), help="Also write the corpus to this SQLite database"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"), format="%(message)s")
+    sink = None
+    if args.sqlite:
+        from sqlite_sink import SQLiteSink
+
+        sink = SQLiteSink(args.sqlite)
+    corpus = build_corpus(args.pdf, args.cache_dir or None, args.corrections, args.workers, sink)
+    corpus.save(args.output)
+    print(json.dumps({"output": args.output, "key": corpus.key, "chunks": len(corpus)}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Declarative corrections for parsed Land Law chunks.
+
+Known parsing issues (see docs/issues-note.md) are fixed through a JSON file
+instead of hand-written passes over the chunk list. The file is compiled once
+into a dict index keyed by `chunk_id` / `article_id`, and every chunk is looked
+up in O(1) while it is emitted by the parser.
+
+File format (data/corrections.json):
+
+    {
+      "version": 1,
+      "corrections": [
+        {
+          "op": "replace",              # replace | append | remove
+          "article_id": "260",          # or "chunk_id": "law_..._art_260"
+          "find": "text to replace",    # replace/remove: substring to match,
+                                        # append: optional guard
+          "text": "new text",           # replace/append: str or list of str
+          "pages": [218],               # optional: pages added to page_number
+          "note": "why this exists"
+        }
+      ]
+    }
+
+`remove` without `find` drops the whole chunk. `append` needs a `chunk_id` or a
+`find` guard: keyed by `article_id` alone it would be appended to every chunk
+of a split article.
+
+A loaded set is fingerprinted by the SHA-256 of its file
+(`corrections_fingerprint`), so corpus keys are computed without compiling it.
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+from page_cache import file_sha256
+
+DEFAULT_CORRECTIONS_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "data", "corrections.json"
+)
+
+CORRECTION_OPS = ("replace", "append", "remove")
+
+
+def _join_text(text) -> str:
+    if isinstance(text, list):
+        return " ".join(part.strip() for part in text)
+    return text or ""
+
+
+def corrections_fingerprint(path: Optional[str]) -> str:
+    """Fingerprint of `CorrectionSet.load(path)` without loading the file."""
+    if not path or not os.path.exists(path):
+        return CorrectionSet().fingerprint
+    return file_sha256(path)
+
+
+class CorrectionSet:
+    """Compiled, indexed set of corrections."""
+
+    def __init__(
+        self,
+        corrections: Optional[List[Dict[str, Any]]] = None,
+        fingerprint: Optional[str] = None,
+    ):
+        self.corrections = corrections or []
+        self.by_chunk_id: Dict[str, List[Dict[str, Any]]] = {}
+        self.by_article_id: Dict[str, List[Dict[str, Any]]] = {}
+        self.applied = [False] * len(self.corrections)
+
+        for idx, raw in enumerate(self.corrections):
+            op = raw.get("op")
+            if op not in CORRECTION_OPS:
+                raise ValueError(f"Correction #{idx}: unknown op {op!r}")
+            if op == "replace" and not raw.get("find"):
+                raise ValueError(f"Correction #{idx}: 'replace' requires 'find'")
+            if op == "append" and not raw.get("text"):
+                raise ValueError(f"Correction #{idx}: 'append' requires 'text'")
+            if op == "append" and not raw.get("chunk_id") and not raw.get("find"):
+                raise ValueError(
+                    f"Correction #{idx}: 'append' by 'article_id' requires 'find' "
+                    "(or use 'chunk_id'), otherwise every chunk of the article gets it"
+                )
+
+            compiled = {
+                "index": idx,
+                "op": op,
+                "find": raw.get("find"),
+                "text": _join_text(raw.get("text")),
+                "pages": [int(p) for p in raw.get("pages", [])],
+            }
+            if raw.get("chunk_id"):
+                self.by_chunk_id.setdefault(str(raw["chunk_id"]), []).append(compiled)
+            elif raw.get("article_id"):
+                self.by_article_id.setdefault(str(raw["article_id"]), []).append(
+                    compiled
+                )
+            else:
+                raise ValueError(
+                    f"Correction #{idx}: 'chunk_id' or 'article_id' is required"
+                )
+
+        self.fingerprint = fingerprint or hashlib.sha256(
+            json.dumps(self.corrections, sort_keys=True, ensure_ascii=False).encode(
+                "utf-8"
+            )
+        ).hexdigest()
+
+    @classmethod
+    def load(cls, path: Optional[str]) -> "CorrectionSet":
+        """Load corrections from a JSON file; a missing file means no corrections."""
+        if not path or not os.path.exists(path):
+            return cls()
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data.get("corrections", []), fingerprint=file_sha256(path))
+
+    def __len__(self):
+        return len(self.corrections)
+
+    def apply(self, chunk: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Apply the corrections matching `chunk` in place.
+
+        Returns:
+            The chunk, or None when a `remove` correction drops it
+        """
+        metadata = chunk["metadata"]
+        ops = self.by_chunk_id.get(metadata.get("chunk_id"), []) + self.by_article_id.get(
+            metadata.get("article_id"), []
+        )
+        for correction in ops:
+            content = chunk["page_content"]
+            op = correction["op"]
+            find = correction["find"]
+
+            if op == "remove" and not find:
+                self.applied[correction["index"]] = True
+                return None
+            if find and find not in content:
+                continue
+
+            if op == "replace":
+                chunk["page_content"] = content.replace(find, correction["text"])
+            elif op == "append":
+                chunk["page_content"] = f"{content} {correction['text']}"
+            else:
+                chunk["page_content"] = " ".join(content.replace(find, " ").split())
+
+            pages = metadata.get("page_number", [])
+            for page in correction["pages"]:
+                if page not in pages:
+                    pages.append(page)
+            pages.sort()
+            self.applied[correction["index"]] = True
+        return chunk
+
+    def unapplied(self) -> List[Dict[str, Any]]:
+        """Corrections that did not match any emitted chunk."""
+        return [c for c, done in zip(self.corrections, self.applied) if not done]
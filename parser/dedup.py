@@ -0,0 +1,148 @@
+"""
+Near-duplicate chunk detection with MinHash + LSH.
+
+Consolidated laws repeat a lot of boilerplate (transitional clauses, "theo quy
+định của Luật này" provisions, amended text quoted inside other articles).
+This optional stage runs after `LandLawChunkerFinal.process()` and links each
+near-duplicate chunk to the first chunk of its cluster via
+`metadata["duplicate_of"]`, or drops it, before the chunks are embedded.
+"""
+
+import re
+import zlib
+from typing import Any, Dict, List
+
+import numpy as np
+
+# Số nguyên tố Mersenne 2^31 - 1: a * x + b không tràn uint64 với x < 2^32
+_MERSENNE_PRIME = np.uint64((1 << 31) - 1)
+
+DEFAULT_THRESHOLD = 0.85
+DEFAULT_NUM_PERM = 128
+DEFAULT_BANDS = 16
+DEFAULT_SHINGLE_SIZE = 5
+
+
+def _shingles(text: str, size: int) -> np.ndarray:
+    """Hashed word k-grams of the lower-cased text (crc32, deterministic)."""
+    words = re.findall(r"\w+", text.lower())
+    if len(words) <= size:
+        grams = [" ".join(words)]
+    else:
+        grams = [" ".join(words[i : i + size]) for i in range(len(words) - size + 1)]
+    return np.unique(
+        np.fromiter(
+            (zlib.crc32(g.encode("utf-8")) for g in grams),
+            dtype=np.uint64,
+            count=len(grams),
+        )
+    )
+
+
+def minhash_signatures(
+    texts: List[str],
+    num_perm: int = DEFAULT_NUM_PERM,
+    shingle_size: int = DEFAULT_SHINGLE_SIZE,
+    seed: int = 1,
+) -> np.ndarray:
+    """MinHash signature matrix of shape (len(texts), num_perm)."""
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, int(_MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+    b = rng.integers(0, int(_MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+
+    signatures = np.empty((len(texts), num_perm), dtype=np.uint64)
+    for i, text in enumerate(texts):
+        shingles = _shingles(text, shingle_size)
+        # (num_shingles, num_perm) -> min theo từng hoán vị
+        hashed = (shingles[:, None] * a[None, :] + b[None, :]) % _MERSENNE_PRIME
+        signatures[i] = hashed.min(axis=0)
+    return signatures
+
+
+def find_near_duplicates(
+    texts: List[str],
+    threshold: float = DEFAULT_THRESHOLD,
+    num_perm: int = DEFAULT_NUM_PERM,
+    bands: int = DEFAULT_BANDS,
+    shingle_size: int = DEFAULT_SHINGLE_SIZE,
+) -> Dict[int, int]:
+    """
+    Cluster near-duplicate texts.
+
+    Candidate pairs come from LSH banding of the MinHash signatures and are
+    kept only if their estimated Jaccard similarity reaches `threshold`.
+
+    Returns:
+        { index of duplicate: index of the first text of its cluster }
+    """
+    if num_perm % bands:
+        raise ValueError("num_perm must be divisible by bands")
+    if len(texts) < 2:
+        return {}
+
+    signatures = minhash_signatures(texts, num_perm, shingle_size)
+    rows = num_perm // bands
+
+    parent = list(range(len(texts)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    checked = set()
+    for band in range(bands):
+        buckets: Dict[bytes, List[int]] = {}
+        band_sig = signatures[:, band * rows : (band + 1) * rows]
+        for i in range(len(texts)):
+            buckets.setdefault(band_sig[i].tobytes(), []).append(i)
+
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            first = members[0]
+            for other in members[1:]:
+                pair = (first, other)
+                if pair in checked:
+                    continue
+                checked.add(pair)
+                similarity = np.mean(signatures[first] == signatures[other])
+                if similarity >= threshold:
+                    root_a, root_b = find(first), find(other)
+                    if root_a != root_b:
+                        # Giữ chunk xuất hiện trước làm đại diện của cụm
+                        parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    return {i: find(i) for i in range(len(texts)) if find(i) != i}
+
+
+def mark_near_duplicates(
+    chunks: List[Dict[str, Any]],
+    drop: bool = False,
+    threshold: float = DEFAULT_THRESHOLD,
+) -> List[Dict[str, Any]]:
+    """
+    Link near-duplicate chunks to their cluster representative.
+
+    Args:
+        chunks: Chunks returned by `LandLawChunkerFinal.process()`
+        drop: Remove duplicates instead of only marking them
+        threshold: Minimum estimated Jaccard similarity of two chunks
+
+    Returns:
+        The chunks with `metadata["duplicate_of"]` set (None for originals),
+        without the duplicates when `drop` is True
+    """
+    duplicates = find_near_duplicates(
+        [c["page_content"] for c in chunks], threshold=threshold
+    )
+    for i, chunk in enumerate(chunks):
+        rep = duplicates.get(i)
+        chunk["metadata"]["duplicate_of"] = (
+            chunks[rep]["metadata"]["chunk_id"] if rep is not None else None
+        )
+
+    if drop:
+        return [c for i, c in enumerate(chunks) if i not in duplicates]
+    return chunks
@@ -0,0 +1,194 @@
+"""
+Pool of PyMuPDF document handles.
+
+A `fitz.Document` must not be used by two threads at once, and opening one per
+request (as the parser used to) leaks a file handle and the document's memory
+for every request until garbage collection. The pool hands out handles keyed
+by the PDF's SHA-256 with checkout/return semantics:
+
+    with get_default_pool().checkout(pdf_path) as doc:
+        page = doc[0]
+
+At most `max_handles` documents per PDF are open in the process; further
+checkouts wait for a handle to be returned. Idle handles are closed after
+`idle_timeout` seconds by `evict_idle()` (called on every checkout/return and
+periodically by the service), and `close()` closes everything.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+from page_cache import file_sha256
+
+DEFAULT_MAX_HANDLES = 4
+DEFAULT_IDLE_TIMEOUT = 300.0  # seconds
+
+
+class PoolTimeout(TimeoutError):
+    """No handle was returned to the pool within the checkout timeout."""
+
+
+class _Slot:
+    """Handles of one PDF: idle stack + number of checked-out handles."""
+
+    __slots__ = ("path", "idle", "in_use")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.idle: List[Tuple[Any, float]] = []  # [(document, returned_at)]
+        self.in_use = 0
+
+
+class DocumentPool:
+    """Thread-safe, bounded pool of open PyMuPDF documents keyed by file hash."""
+
+    def __init__(
+        self,
+        max_handles: int = DEFAULT_MAX_HANDLES,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+    ):
+        if max_handles < 1:
+            raise ValueError("max_handles must be at least 1")
+        self.max_handles = max_handles
+        self.idle_timeout = idle_timeout
+        self._slots: Dict[str, _Slot] = {}
+        self._owners: Dict[int, str] = {}  # id(document) -> key
+        self._cond = threading.Condition()
+        self._closed = False
+        self.opened = 0
+        self.evicted = 0
+
+    @staticmethod
+    def _open(path: str):
+        # PyMuPDF is only imported once a document is actually needed
+        import fitz
+
+        return fitz.open(path)
+
+    def acquire(self, pdf_path: str, timeout: Optional[float] = None):
+        """
+        Check out a document for `pdf_path`; must be given back with `release()`.
+
+        Raises:
+            PoolTimeout: all `max_handles` handles stayed checked out for `timeout`
+        """
+        key = file_sha256(pdf_path)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("DocumentPool is closed")
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = self._slots[key] = _Slot(pdf_path)
+            while not slot.idle and slot.in_use >= self.max_handles:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise PoolTimeout(
+                        f"No PDF handle available for {pdf_path} after {timeout}s"
+                    )
+                self._cond.wait(remaining)
+            slot.in_use += 1
+            if slot.idle:
+                # LIFO: the most recently used handle has the warmest page caches
+                doc = slot.idle.pop()[0]
+                self._owners[id(doc)] = key
+                return doc
+
+        # Opening can be slow: do it outside the lock, the slot is already reserved
+        try:
+            doc = self._open(pdf_path)
+        except BaseException:
+            with self._cond:
+                slot.in_use -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self.opened += 1
+            self._owners[id(doc)] = key
+        return doc
+
+    def release(self, doc):
+        """Return a checked-out document to the pool."""
+        with self._cond:
+            key = self._owners.pop(id(doc))
+            slot = self._slots[key]
+            slot.in_use -= 1
+            if self._closed:
+                doc.close()
+            else:
+                slot.idle.append((doc, time.monotonic()))
+            self._cond.notify()
+        self.evict_idle()
+
+    @contextmanager
+    def checkout(self, pdf_path: str, timeout: Optional[float] = None):
+        """Context manager around `acquire()` / `release()`."""
+        doc = self.acquire(pdf_path, timeout)
+        try:
+            yield doc
+        finally:
+            self.release(doc)
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """Close handles idle for longer than `idle_timeout`; returns how many."""
+        now = time.monotonic() if now is None else now
+        expired = []
+        with self._cond:
+            for key, slot in list(self._slots.items()):
+                keep = []
+                for doc, returned_at in slot.idle:
+                    if now - returned_at >= self.idle_timeout:
+                        expired.append(doc)
+                    else:
+                        keep.append((doc, returned_at))
+                slot.idle = keep
+                if not slot.idle and not slot.in_use:
+                    del self._slots[key]
+            self.evicted += len(expired)
+        for doc in expired:
+            doc.close()
+        return len(expired)
+
+    def close(self):
+        """Close idle handles now and checked-out ones when they are returned."""
+        with self._cond:
+            self._closed = True
+            idle = [doc for slot in self._slots.values() for doc, _ in slot.idle]
+            for slot in self._slots.values():
+                slot.idle = []
+            self._cond.notify_all()
+        for doc in idle:
+            doc.close()
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {
+                "documents": len(self._slots),
+                "idle": sum(len(s.idle) for s in self._slots.values()),
+                "in_use": sum(s.in_use for s in self._slots.values()),
+                "opened": self.opened,
+                "evicted": self.evicted,
+            }
+
+
+_default_pool: Optional[DocumentPool] = None
+_default_lock = threading.Lock()
+
+
+def get_default_pool() -> DocumentPool:
+    """Process-wide pool used by the parser unless another one is passed in."""
+    global _default_pool
+    with _default_lock:
+        if _default_pool is None:
+            _default_pool = DocumentPool()
+        return _default_pool
+
+
+def set_default_pool(pool: DocumentPool) -> Optional[DocumentPool]:
+    """Replace the process-wide pool; returns the previous one (not closed)."""
+    global _default_pool
+    with _default_lock:
+        previous, _default_pool = _default_pool, pool
+        return previous
@@ -0,0 +1,163 @@
+"""
+Footnote registry for the Land Law parser.
+
+Footnotes of a consolidated law (VBHN) are numbered sequentially and referenced
+from the body text by small superscript markers. Instead of copying the whole
+footnote block of a page into every chunk that touches the page, each footnote
+is stored once in a registry and chunks only keep the ids of the footnotes
+whose markers fall inside their own text span.
+"""
+
+import re
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+def _normalize_note(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def resolve_footnote_ids(
+    footnote_ids: Iterable[str], footnotes: Dict[str, Dict[str, Any]]
+) -> str:
+    """
+    Resolve footnote ids into the display string stored in `chunk_footnotes`.
+
+    Args:
+        footnote_ids: Ids referenced by a chunk
+        footnotes: Registry dictionary as returned by `FootnoteRegistry.to_dict()`
+
+    Returns:
+        One line per footnote ("[Trang 12] 3. Nội dung...") or "" if none
+    """
+    lines = []
+    for fid in footnote_ids:
+        entry = footnotes.get(fid)
+        if not entry:
+            continue
+        label = f"{entry['number']}. " if entry.get("number") else ""
+        lines.append(f"[Trang {entry['page']}] {label}{entry['text']}")
+    return "\n".join(lines)
+
+
+class FootnoteRegistry:
+    """
+    Stores every footnote once and answers "which footnotes belong to this span".
+
+    - Numbered footnotes are attached to the global offset of their marker in
+      `full_text`, so only the chunk containing the marker references them.
+    - Footnotes without a number, or whose marker was never found in the body,
+      are anchored to their page (same behaviour as the old per-page lookup).
+    """
+
+    def __init__(self):
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        # Sorted marker offsets in full_text and the footnote id at each offset
+        self._marker_offsets: List[int] = []
+        self._marker_ids: List[str] = []
+        # { page_num: [footnote ids anchored to the whole page] }
+        self._page_anchored: Dict[int, List[str]] = {}
+        # Markers whose footnote number has not been registered yet
+        self._pending_markers: List[Tuple[int, str, int]] = []
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _new_id(self, number: Optional[str], page_num: int) -> str:
+        if number is None:
+            base = f"fn_p{page_num}"
+            fid, k = base, 1
+            while fid in self.entries:
+                k += 1
+                fid = f"{base}_{k}"
+            return fid
+
+        fid = f"fn_{number}"
+        if fid in self.entries:
+            # Numbering restarted somewhere in the document: keep ids unique
+            fid = f"fn_{number}_p{page_num}"
+        return fid
+
+    def add_page(
+        self,
+        page_num: int,
+        page_start: int,
+        entries: List[Tuple[Optional[str], str]],
+        markers: List[Tuple[int, str]],
+    ):
+        """
+        Register the footnotes and markers extracted from one page.
+
+        Args:
+            page_num: 1-based page number
+            page_start: Offset of the page's clean text inside full_text
+            entries: [(number or None, text)] footnote entries of the page
+            markers: [(offset inside page clean text, number)] body markers
+        """
+        page_ids: Dict[str, str] = {}
+        for number, text in entries:
+            text = _normalize_note(text)
+            if not text:
+                continue
+            fid = self._new_id(number, page_num)
+            self.entries[fid] = {
+                "id": fid,
+                "number": number,
+                "page": page_num,
+                "text": text,
+            }
+            if number is None:
+                self._page_anchored.setdefault(page_num, []).append(fid)
+            else:
+                page_ids[number] = fid
+
+        for rel_offset, number in markers:
+            fid = page_ids.get(number) or (
+                f"fn_{number}" if f"fn_{number}" in self.entries else None
+            )
+            if fid:
+                self._add_marker(page_start + rel_offset, fid)
+            else:
+                self._pending_markers.append((page_start + rel_offset, number, page_num))
+
+    def _add_marker(self, offset: int, fid: str):
+        idx = bisect_left(self._marker_offsets, offset)
+        self._marker_offsets.insert(idx, offset)
+        self._marker_ids.insert(idx, fid)
+
+    def finalize(self):
+        """
+        Resolve markers that preceded their footnote (note printed on the next
+        page) and anchor footnotes without any marker to their page.
+        """
+        for offset, number, _page in self._pending_markers:
+            if f"fn_{number}" in self.entries:
+                self._add_marker(offset, f"fn_{number}")
+        self._pending_markers = []
+
+        referenced = set(self._marker_ids)
+        for fid, entry in self.entries.items():
+            if entry["number"] is not None and fid not in referenced:
+                anchored = self._page_anchored.setdefault(entry["page"], [])
+                if fid not in anchored:
+                    anchored.append(fid)
+
+    def ids_in_span(self, start_idx: int, end_idx: int, page_numbers: Iterable[int]):
+        """
+        Footnote ids whose marker lies in [start_idx, end_idx), followed by the
+        page-anchored footnotes of `page_numbers`.
+        """
+        lo = bisect_left(self._marker_offsets, start_idx)
+        hi = bisect_left(self._marker_offsets, end_idx)
+        ids = list(dict.fromkeys(self._marker_ids[lo:hi]))
+        for p in page_numbers:
+            for fid in self._page_anchored.get(p, []):
+                if fid not in ids:
+                    ids.append(fid)
+        return ids
+
+    def resolve(self, footnote_ids: Iterable[str]) -> str:
+        return resolve_footnote_ids(footnote_ids, self.entries)
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        return dict(self.entries)
@@ -1,89 +1,225 @@
 import fitz  # PyMuPDF
+import os
 import re
 import json
+import logging
+import atexit
+import multiprocessing
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import ExitStack, contextmanager
+from itertools import repeat
 from typing import List, Dict, Any
 
-
-def update_article_260_content(
-    existing_chunks: List[Dict[str, Any]],
-) -> List[Dict[str, Any]]:
+import numpy as np
+
+from corpus import PARSER_VERSION
+from corrections import DEFAULT_CORRECTIONS_PATH, CorrectionSet
+from doc_pool import get_default_pool
+from footnotes import FootnoteRegistry
+from metrics import (
+    CHUNKS,
+    PAGE_CACHE_HITS,
+    PAGE_CACHE_MISSES,
+    PAGES,
+    observe_stages,
+    recorded_stages,
+    stage_timer,
+    timed,
+)
+from page_cache import PageCache, coordinate_key, file_sha256
+from term_tagger import DEFAULT_TERMS_PATH, DEFAULT_TOPIC, TermTagger
+
+# Logger của parser: im lặng mặc định, bật bằng logging.basicConfig(level=...)
+logger = logging.getLogger("land_law_parser")
+logger.addHandler(logging.NullHandler())
+
+# Số footnote đứng riêng một span (dấu superscript hoặc số thứ tự chú thích)
+FOOTNOTE_NUMBER_PATTERN = re.compile(r"^\s*(\d+)\s*$")
+# Số thứ tự chú thích nằm chung span với nội dung: "3 Điều này được sửa đổi..."
+FOOTNOTE_INLINE_PATTERN = re.compile(r"^\s*(\d{1,3})\s+(\S.*)$", re.S)
+
+# Ngưỡng cỡ chữ cố định (fallback khi trang quá ít chữ để thống kê)
+FONT_SIZE_THRESHOLD = 12
+# Số ký tự tối thiểu trên trang để dùng histogram cỡ chữ
+MIN_CLASSIFY_CHARS = 200
+# Khoảng cách tối thiểu (pt) giữa 2 nhóm cỡ chữ để coi là khác nhau
+FONT_SIZE_GAP = 1.0
+# Trang có độ tin cậy thấp hơn ngưỡng này sẽ được cảnh báo
+LOW_CONFIDENCE = 0.6
+# Ít Điều hơn số này thì cắt tuần tự. Đo trên PDF tổng hợp (benchmarks/):
+# cắt tuần tự ~3ms/Điều, 1 lần gửi lô cho pool đã khởi động tốn <=0.03s
+# (kể cả lần đầu gặp 1 PDF mới) => 2 worker hòa vốn ở ~20 Điều
+PARALLEL_MIN_ARTICLES = 24
+
+# Pattern bắt các tiêu đề cấu trúc (Hierarchy)
+# Regex này tìm dòng bắt đầu bằng Chương, Mục hoặc Điều
+HIERARCHY_PATTERN = re.compile(
+    r"(?m)^(Chương\s+[IVXLCDM]+|Mục\s+\d+|Điều\s+(\d+)\.)\s+(.*)"
+)
+
+
+def classify_font_sizes(sizes, weights, global_body_size=None, note_evidence=False):
     """
-    Update Article 260 content by removing incomplete text and adding complete clauses 12-16.
+    Tính ngưỡng cỡ chữ phân loại nội dung chính / footnote cho 1 trang
+    dựa trên histogram cỡ chữ (trọng số = số ký tự của span).
+
+    Nội dung chính được neo vào nhóm cỡ chữ chiếm ưu thế; chỉ các nhóm NHỎ hơn
+    mới có thể là footnote (tiêu đề cỡ to luôn là nội dung chính). Ngoại lệ:
+    nhóm chiếm ưu thế nhỏ hơn hẳn cỡ chữ nội dung của cả văn bản
+    (`global_body_size`) VÀ trang có dấu hiệu footnote riêng (`note_evidence`,
+    vd. dòng mở đầu bằng số chú thích) thì đó là trang toàn/nhiều footnote.
+    Nhỏ hơn mà không có dấu hiệu: vẫn coi là nội dung chính nhưng độ tin cậy
+    thấp (< LOW_CONFIDENCE) để được cảnh báo.
 
     Args:
-        existing_chunks: List of existing chunks to update
+        sizes: np.ndarray cỡ chữ của từng span
+        weights: np.ndarray số ký tự của từng span
+        global_body_size: Cỡ chữ nội dung của các trang trước (None nếu chưa biết)
+        note_evidence: Trang có dòng đánh số kiểu chú thích (xem has_note_numbering)
 
     Returns:
-        Updated list of chunks with Article 260 content fixed
-    """
-    import re
-
-    # Additional content for clauses 12-16 (normalized format)
-    additional_content_raw = """
-    Khoản 12: Người sử dụng đất được Nhà nước cho thuê đất mà đã lựa chọn hình thức cho thuê đất trả tiền thuê đất hàng năm hoặc cho thuê đất trả tiền thuê đất một lần cho cả thời gian thuê trước ngày Luật này có hiệu lực thì hành thi tiếp tục sử dụng đất theo hình thức thuê đất đã lựa chọn trong thời hạn sử dụng đất còn lại, trừ trường hợp quy định tại Điều 30 của Luật này. 
-    Khoản 13: Người sử dụng đất đã tự nguyện ứng trước kinh phí bồi thường, hỗ trợ, tái định cư theo phương án bồi thường, hỗ trợ, tái định cư đã được cơ quan có thẩm quyền phê duyệt trước ngày Luật này có hiệu lực thi hành thì được hoàn trả bằng hình thức trừ vào tiền sử dụng đất, tiền thuê đất phải nộp theo quy định của pháp luật về đất đai trước ngày Luật này có hiệu lực thi hành. 
-    Khoản 14: Trường hợp tổ chức kinh tế được miễn tiền sử dụng đất, miễn tiền thuê đất trước ngày Luật này có hiệu lực thi hành mà nay chuyển nhượng, góp vốn bằng quyền sử dụng đất thì thực hiện quyền và nghĩa vụ theo quy định của Luật này. 
-    Khoản 15: Cá nhân là người dân tộc thiểu số được Nhà nước giao đất, cho thuê đất theo chính sách hỗ trợ đất đai đối với đồng bào dân tộc thiểu số theo quy định của pháp luật trước ngày Luật này có hiệu lực thi hành mà đủ điều kiện được hưởng chính sách hỗ trợ đất đai đối với đồng bào dân tộc thiểu số theo quy định của Luật này thì được hưởng chính sách hỗ trợ về đất đai quy định của Luật này. 
-    Khoản 16: Doanh nghiệp có vốn đầu tư nước ngoài theo quy định của Luật Kinh doanh bất động sản số 66/2014/QH13 đã được sửa đổi, bổ sung một số điều theo Luật số 61/2020/QH14 đang thực hiện thủ tục nhận chuyển nhượng toàn bộ hoặc một phần dự án bất động sản nhưng đến ngày Luật này có hiệu lực thi hành mà chưa hoàn thành các thủ tục về đất đai đối với dự án hoặc phần dự án nhận chuyển nhượng thì cơ quan nhà nước có thẩm quyền thực hiện thủ tục giao đất, cho thuê đất cho bên nhận chuyển nhượng, cấp Giấy chứng nhận quyền sử dụng đất, quyền sở hữu tài sản gắn liền với đất theo quy định của Luật này. Bên nhận chuyển nhượng toàn bộ hoặc một phần dự án bất động sản được kế thừa quyền và nghĩa vụ về đất đai của bên chuyển nhượng dự án.
+        Dict: threshold, body_font_size, confidence (0-1), method
+        ("adaptive" | "single_cluster" | "fixed"), toàn bộ là float Python
     """
+    total = float(weights.sum())
+    known_body = global_body_size is not None
 
-    # Normalize format: "Khoản 12:" -> "12."
-    normalized_content = (
-        re.sub(r"Khoản (\d+):", r"\1.", additional_content_raw)
-        .replace("\n", "")
-        .strip()
-    )
-    # Clean up extra whitespace
-    normalized_content = re.sub(r"\s+", " ", normalized_content)
-
-    # Configuration
-    TARGET_ARTICLE_ID = "260"
-    TEXT_TO_REMOVE = (
-        "12. Người sử dụng đất được Nhà nước cho thuê đất mà đã lựa chọn hình thức"
-    )
-
-    updated = False
-    for chunk in existing_chunks:
-        # Find Article 260 chunk
-        if chunk.get("metadata", {}).get("article_id") == TARGET_ARTICLE_ID:
-            content = chunk["page_content"]
-
-            # Check if the incomplete text exists
-            if TEXT_TO_REMOVE in content:
-                print(f"✅ Đã tìm thấy Điều 260 và đoạn nội dung cần thay thế.")
-
-                # 1. Remove the incomplete text
-                clean_content = content.replace(TEXT_TO_REMOVE, "").strip()
-
-                # 2. Append the complete content
-                new_full_content = f"{clean_content} {normalized_content}"
-                chunk["page_content"] = new_full_content
-
-                # 3. Update metadata: Add page 218 to page numbers
-                if 218 not in chunk["metadata"]["page_number"]:
-                    chunk["metadata"]["page_number"].append(218)
-                    chunk["metadata"]["page_number"].sort()
-
-                updated = True
-                print(f"🔄 Đã cập nhật nội dung cho Điều 260 (Thêm Khoản 12-16).")
-                break
-
-    if not updated:
-        print(
-            f"⚠️ Không tìm thấy đoạn text cần xóa trong Điều 260 hoặc đã được cập nhật trước đó."
-        )
-
-    return existing_chunks
+    if total < MIN_CLASSIFY_CHARS:
+        # Trang ít chữ: ngưỡng theo cỡ chữ nội dung của văn bản nếu đã biết
+        if known_body:
+            threshold = float(global_body_size) - FONT_SIZE_GAP
+        else:
+            threshold = float(FONT_SIZE_THRESHOLD)
+        ambiguous = float(weights[np.abs(sizes - threshold) < FONT_SIZE_GAP / 2].sum())
+        # Chỉ kém tin cậy khi có chữ nằm sát ngưỡng
+        confidence = (0.9 if known_body else 0.75) * (1 - ambiguous / total) if total else 1.0
+        return {
+            "threshold": threshold,
+            "body_font_size": float(global_body_size) if known_body else None,
+            "confidence": round(confidence, 3),
+            "method": "fixed",
+        }
+
+    # Histogram theo bin 0.5pt
+    bins, inverse = np.unique(np.round(sizes * 2) / 2, return_inverse=True)
+    hist = np.bincount(inverse, weights=weights)
+    dominant_size = float(bins[int(np.argmax(hist))])
+
+    # Nhóm chiếm ưu thế nhỏ hơn hẳn cỡ chữ nội dung của văn bản
+    dominant_is_small = known_body and dominant_size <= global_body_size - FONT_SIZE_GAP
+    larger = bins >= dominant_size + FONT_SIZE_GAP
+    smaller = bins <= dominant_size - FONT_SIZE_GAP
+
+    body_size, note_size = dominant_size, None
+    if dominant_is_small and note_evidence:
+        # Trang toàn/nhiều footnote: cỡ to hơn (nếu có) là nội dung chính
+        note_size = dominant_size
+        if larger.any():
+            body_size = float(bins[larger][np.argmax(hist[larger])])
+        else:
+            body_size = float(global_body_size)
+    elif smaller.any():
+        note_size = float(bins[smaller][np.argmax(hist[smaller])])
+
+    if note_size is None:
+        # Chỉ có 1 nhóm cỡ chữ: không có footnote
+        threshold = dominant_size - FONT_SIZE_GAP
+        if dominant_is_small:
+            # Nhỏ hơn nội dung văn bản nhưng không có dấu hiệu footnote: cảnh báo
+            confidence = LOW_CONFIDENCE / 2
+        else:
+            confidence = 1.0 if known_body else 0.8
+        method = "single_cluster"
+    elif note_size == dominant_size and not larger.any():
+        # Trang chỉ có footnote
+        threshold = (dominant_size + body_size) / 2
+        confidence = 1.0
+        method = "single_cluster"
+    else:
+        threshold = (body_size + note_size) / 2
+        separation = min(1.0, (body_size - note_size) / (2 * FONT_SIZE_GAP))
+        ambiguous = float(weights[np.abs(sizes - threshold) < FONT_SIZE_GAP / 2].sum())
+        confidence = separation * (1 - ambiguous / total)
+        method = "adaptive"
+
+    return {
+        "threshold": float(threshold),
+        "body_font_size": float(body_size),
+        "confidence": round(float(confidence), 3),
+        "method": method,
+    }
+
+
+def _merge_ids(*id_lists):
+    """Nối các danh sách footnote id, bỏ trùng, giữ thứ tự."""
+    return list(dict.fromkeys(fid for ids in id_lists for fid in ids))
+
+
+def has_note_numbering(texts, sizes, line_ranges, block_starts):
+    """
+    Dấu hiệu trang có footnote, độc lập với cỡ chữ của trang: một dòng mở đầu
+    bằng số chú thích, hoặc là span số nhỏ hơn phần còn lại của dòng
+    (superscript "¹ Điều này..."), hoặc là "3 Điều này..." ở đầu 1 block.
+    """
+    for i, (start, end) in enumerate(line_ranges):
+        spans = [k for k in range(start, end) if texts[k].strip()]
+        if not spans:
+            continue
+        first = spans[0]
+        if FOOTNOTE_NUMBER_PATTERN.match(texts[first]):
+            if len(spans) > 1 and sizes[first] <= sizes[spans[1]] - FONT_SIZE_GAP:
+                return True
+        elif i in block_starts and FOOTNOTE_INLINE_PATTERN.match(
+            "".join(texts[start:end])
+        ):
+            return True
+    return False
 
 
 class LandLawChunkerFinal:
-    def __init__(self, pdf_path, max_pages=None):
+    def __init__(
+        self,
+        pdf_path,
+        max_pages=None,
+        cache_dir=None,
+        corrections_path=DEFAULT_CORRECTIONS_PATH,
+        doc_pool=None,
+        workers=1,
+        terms_path=DEFAULT_TERMS_PATH,
+        sink=None,
+    ):
         self.pdf_path = pdf_path
         self.max_pages = max_pages
-        try:
-            self.doc = fitz.open(pdf_path)
-        except Exception as e:
-            raise ValueError(f"Không thể mở file PDF: {e}")
+        # Số process cắt các Điều song song (1 = tuần tự)
+        self.workers = max(1, workers or 1)
+        if not os.path.isfile(pdf_path):
+            raise ValueError(f"Không thể mở file PDF: không tìm thấy {pdf_path}")
+
+        # Handle PDF mượn từ pool chỉ khi thật sự cần đọc trang (cache miss / tìm tọa độ)
+        self.doc_pool = doc_pool or get_default_pool()
+        self._doc = None
+
+        # Cache kết quả tách trang (Bước 1) theo hash PDF + số trang
+        self.page_cache = (
+            PageCache(cache_dir, file_sha256(pdf_path)) if cache_dir else None
+        )
+        # Kết quả tìm tọa độ {coordinate_key(trang, cụm từ): [rect]}: lấy từ page
+        # cache nếu có, để chạy lại chunking không phải mở PDF để search_for
+        self.coordinate_memo = self.page_cache.coordinates() if self.page_cache else {}
+        self.new_coordinates = {}  # các lần tìm mới, chưa lưu vào page cache
+        self._page_count = None
+
+        # Bảng sửa lỗi khai báo (data/corrections.json), đã index theo chunk/article id
+        self.corrections = CorrectionSet.load(corrections_path)
+
+        # Từ điển thuật ngữ (data/legal_terms.json) để gán topic cho từng chunk
+        self.tagger = TermTagger.load(terms_path)
+
+        # SQLiteSink tùy chọn: ghi trang/footnote/cấu trúc/chunk theo lô trong lúc parse
+        self.sink = sink
 
         self.law_id = "133/VBHN-VPQH"
         self.chunks = []
@@ -93,50 +229,224 @@ class LandLawChunkerFinal:
         self.current_chapter = {"id": None, "title": None}
         self.current_section = {"id": None, "title": None}
 
-        # [MỚI] Kho lưu trữ Footnote theo trang: { page_num: "nội dung footnote" }
-        self.page_footnotes_map = {}
+        # Kho lưu trữ Footnote: mỗi chú thích lưu 1 lần, chunk chỉ giữ id
+        self.footnotes = FootnoteRegistry()
 
         # [MỚI] Bản đồ ánh xạ từ Index trong full_text sang Số trang
         # Format: [{"page": 1, "start": 0, "end": 1000}, ...]
         self.page_offset_map = []
 
+        # Ngưỡng cỡ chữ và độ tin cậy phân loại body/footnote của từng trang
+        # Format: [{"page": 1, "threshold": 11.5, "confidence": 1.0, ...}, ...]
+        self.page_classification = []
+
+        # Cỡ chữ nội dung của văn bản, ước lượng từ các trang đã đọc (theo thứ tự)
+        self.body_font_size = None
+        self._body_size_votes = Counter()
+
+    @contextmanager
+    def document(self):
+        """
+        Mượn 1 handle PDF từ pool trong phạm vi `with` và trả lại khi xong.
+        Gọi lồng nhau dùng lại handle đang mượn.
+        """
+        if self._doc is not None:
+            yield self._doc
+            return
+        try:
+            doc = self.doc_pool.acquire(self.pdf_path)
+        except Exception as e:
+            raise ValueError(f"Không thể mở file PDF: {e}")
+        self._doc = doc
+        try:
+            yield doc
+        finally:
+            self._doc = None
+            self.doc_pool.release(doc)
+
+    def result_cache_key(self):
+        """
+        Khóa cache cho kết quả parse: phiên bản parser + hash PDF + bảng sửa lỗi
+        + từ điển thuật ngữ + số trang xử lý. Đổi file corrections hoặc từ điển
+        sẽ làm kết quả cũ hết hiệu lực.
+        """
+        pdf_hash = (
+            self.page_cache.pdf_hash if self.page_cache else file_sha256(self.pdf_path)
+        )
+        return (
+            f"{PARSER_VERSION}:{pdf_hash}:{self.corrections.fingerprint}:"
+            f"{self.tagger.fingerprint}:{self.max_pages or 'all'}"
+        )
+
+    def get_page_count(self):
+        """Số trang của PDF, lấy từ cache nếu có để khỏi mở file."""
+        if self._page_count is not None:
+            return self._page_count
+        if self.page_cache and self.page_cache.page_count:
+            self._page_count = self.page_cache.page_count
+            return self._page_count
+        with self.document() as doc:
+            total_pages = len(doc)
+        if self.page_cache:
+            self.page_cache.page_count = total_pages
+        self._page_count = total_pages
+        return total_pages
+
+    def extract_page(self, page_num):
+        """
+        Bước 1 cho 1 trang (1-based): dùng cache nếu có, nếu không thì đọc PDF
+        bằng get_page_content_and_footnotes và lưu lại vào cache.
+        """
+        if self.page_cache:
+            entry = self.page_cache.get(page_num)
+            if entry is None:
+                PAGE_CACHE_MISSES.inc()
+            else:
+                PAGE_CACHE_HITS.inc()
+                PAGES.labels("cache").inc()
+                return (
+                    entry["text"],
+                    [tuple(e) for e in entry["footnotes"]],
+                    [tuple(m) for m in entry["markers"]],
+                    entry["classification"],
+                )
+
+        with self.document() as doc, stage_timer("page_extraction"):
+            clean, note_entries, markers, classification = (
+                self.get_page_content_and_footnotes(doc[page_num - 1])
+            )
+        PAGES.labels("pdf").inc()
+        if self.page_cache:
+            self.page_cache.put(
+                page_num,
+                {
+                    "text": clean,
+                    "footnotes": note_entries,
+                    "markers": markers,
+                    "classification": classification,
+                },
+            )
+        return clean, note_entries, markers, classification
+
+    def _vote_body_font_size(self, classification):
+        """
+        Cập nhật cỡ chữ nội dung của văn bản = cỡ phổ biến nhất trong các trang
+        đã phân loại tin cậy. Các trang đọc tuần tự nên kết quả xác định, và
+        phân loại đã cache của 1 trang vẫn khớp với lần đọc lại.
+        """
+        size = classification["body_font_size"]
+        if size is None or classification["method"] == "fixed":
+            return
+        if classification["confidence"] < LOW_CONFIDENCE:
+            return
+        self._body_size_votes[size] += 1
+        self.body_font_size = self._body_size_votes.most_common(1)[0][0]
+
     def get_page_content_and_footnotes(self, page):
         """
-        Trả về 2 giá trị:
+        Trả về 4 giá trị:
         1. clean_text: Nội dung chính (cỡ chữ to)
-        2. footnote_text: Nội dung chú thích (cỡ chữ nhỏ)
+        2. footnote_entries: Danh sách chú thích [(số footnote hoặc None, nội dung)]
+        3. markers: Vị trí dấu chú thích trong clean_text [(offset, số footnote)]
+        4. classification: Ngưỡng cỡ chữ của trang và độ tin cậy phân loại
         """
 
         blocks = page.get_text(
             "dict",
             flags=fitz.TEXT_PRESERVE_LIGATURES | fitz.TEXT_PRESERVE_WHITESPACE,
         )["blocks"]
+
+        # 1. Gom toàn bộ span của trang thành mảng phẳng
+        texts = []
+        sizes = []
+        line_ranges = []  # [(span đầu, span cuối)] của từng dòng
+        block_starts = set()  # chỉ số dòng đầu tiên của mỗi block
+        for b in blocks:
+            block_starts.add(len(line_ranges))
+            for l in b.get("lines", ()):
+                start = len(texts)
+                for s in l["spans"]:
+                    texts.append(s["text"])
+                    sizes.append(s["size"])
+                line_ranges.append((start, len(texts)))
+
+        size_arr = np.fromiter(sizes, dtype=np.float64, count=len(sizes))
+        weight_arr = np.fromiter(
+            (len(t.strip()) for t in texts), dtype=np.float64, count=len(texts)
+        )
+
+        # 2. Phân loại vectorized theo histogram cỡ chữ của trang
+        classification = classify_font_sizes(
+            size_arr,
+            weight_arr,
+            self.body_font_size,
+            note_evidence=has_note_numbering(texts, sizes, line_ranges, block_starts),
+        )
+        is_body = (size_arr > classification["threshold"]).tolist()
+
         clean_text = ""
-        footnote_text = ""
+        footnote_entries = []
+        markers = []
+
+        for start, end in line_ranges:
+            line_clean = ""
+            line_note = ""
+            line_number = None
+            has_body = any(is_body[start:end])
+            for k in range(start, end):
+                text_segment = texts[k]
+                if is_body[k]:
+                    line_clean += text_segment
+                    continue
 
-        # Ngưỡng cỡ chữ phân loại
-        FONT_SIZE_THRESHOLD = 12
+                number_match = FOOTNOTE_NUMBER_PATTERN.match(text_segment)
+                if number_match:
+                    number = number_match.group(1)
+                    if has_body:
+                        # Dấu chú thích (superscript) nằm trong dòng nội dung: gắn vào
+                        # ký tự nội dung cuối cùng trước nó, để dấu ở cuối khoản vẫn nằm
+                        # trong [start, end) của chunk (end thường là cuối dòng)
+                        body_len = len(line_clean.rstrip())
+                        markers.append((len(clean_text) + max(body_len - 1, 0), number))
+                    elif not line_note.strip() and line_number is None:
+                        # Số thứ tự ở đầu dòng chú thích
+                        line_number = number
+                    # Lọc rác: Bỏ qua số trang đơn lẻ nếu nó lẫn vào footnote
+                    continue
+                line_note += text_segment
 
-        for b in blocks:
-            if "lines" in b:
-                for l in b["lines"]:
-                    line_clean = ""
-                    line_note = ""
-                    for s in l["spans"]:
-                        text_segment = s["text"]
-                        if s["size"] > FONT_SIZE_THRESHOLD:
-                            line_clean += text_segment
-                        else:
-                            # Lọc rác: Bỏ qua số trang đơn lẻ nếu nó lẫn vào footnote
-                            if not re.match(r"^\s*\d+\s*$", text_segment):
-                                line_note += text_segment
-
-                    if line_clean.strip():
-                        clean_text += line_clean + "\n"
-                    if line_note.strip():
-                        footnote_text += line_note + " "  # Nối footnote thành dòng dài
-
-        return clean_text, footnote_text.strip()
+            if line_clean.strip():
+                clean_text += line_clean + "\n"
+            if not line_note.strip():
+                continue
+
+            if line_number is None:
+                # Số thứ tự có thể nằm chung span với nội dung: "3 Điều này..."
+                inline_match = FOOTNOTE_INLINE_PATTERN.match(line_note)
+                last_number = next(
+                    (n for n, _ in reversed(footnote_entries) if n), None
+                )
+                if inline_match and (
+                    last_number is None
+                    or int(inline_match.group(1)) == int(last_number) + 1
+                ):
+                    line_number = inline_match.group(1)
+                    line_note = inline_match.group(2)
+
+            if line_number is not None:
+                footnote_entries.append([line_number, line_note])
+            elif footnote_entries:
+                # Dòng tiếp theo của chú thích phía trên
+                footnote_entries[-1][1] += " " + line_note
+            else:
+                footnote_entries.append([None, line_note])
+
+        return (
+            clean_text,
+            [tuple(e) for e in footnote_entries],
+            markers,
+            classification,
+        )
 
     def extract_structure_hierarchy(self, matches):
         """
@@ -201,12 +511,13 @@ class LandLawChunkerFinal:
 
     def log_structure_hierarchy(self, matches):
         """
-        In ra cấu trúc cây của văn bản luật dựa trên kết quả Regex.
+        Ghi log cấu trúc cây của văn bản luật dựa trên kết quả Regex (mức DEBUG),
+        kèm dòng thống kê (mức INFO).
         """
-        print(f"\n🔍 Tìm thấy {len(matches)} điểm đánh dấu cấu trúc.")
-        print("=" * 60)
-        print(f"{'LOẠI':<10} | {'CHI TIẾT':<50}")
-        print("=" * 60)
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("🔍 Tìm thấy %d điểm đánh dấu cấu trúc.", len(matches))
+            logger.debug("%-10s | %-50s", "LOẠI", "CHI TIẾT")
 
         count_chuong = 0
         count_muc = 0
@@ -218,21 +529,26 @@ class LandLawChunkerFinal:
 
             if marker.startswith("Chương"):
                 count_chuong += 1
-                print(f"📘 {marker}: {title.upper()}")
+                if debug:
+                    logger.debug("📘 %s: %s", marker, title.upper())
             elif marker.startswith("Mục"):
                 count_muc += 1
-                print(f"  📂 {marker}: {title}")
+                if debug:
+                    logger.debug("  📂 %s: %s", marker, title)
             elif marker.startswith("Điều"):
                 count_dieu += 1
-                display_title = (title[:50] + "...") if len(title) > 50 else title
-                print(f"    📄 {marker} {display_title}")
-
-        print("=" * 60)
-        print(
-            f"📊 THỐNG KÊ: {count_chuong} Chương | {count_muc} Mục | {count_dieu} Điều"
+                if debug:
+                    display_title = (title[:50] + "...") if len(title) > 50 else title
+                    logger.debug("    📄 %s %s", marker, display_title)
+
+        logger.info(
+            "📊 THỐNG KÊ: %d Chương | %d Mục | %d Điều",
+            count_chuong,
+            count_muc,
+            count_dieu,
         )
-        print("=" * 60 + "\n")
 
+    @timed("text_cleaning")
     def clean_text_for_embedding(self, text):
         """
         Làm sạch text triệt để để lưu vào DB (dùng cho semantic search).
@@ -275,6 +591,7 @@ class LandLawChunkerFinal:
 
         return sorted(list(pages))
 
+    @timed("coordinate_search")
     def get_coordinates_by_offset(self, search_text, start_idx, end_idx):
         """
         Chỉ tìm kiếm text trên các trang được xác định bởi offset.
@@ -292,45 +609,38 @@ class LandLawChunkerFinal:
         clean_search_key = re.sub(r"\s+", " ", search_text).strip()
         search_phrase = clean_search_key[:50]  # Lấy 50 chars đầu để search Rect
 
-        # 2. Chỉ search trên các trang đích danh
-        for page_num in target_pages:
-            # Index mảng doc bắt đầu từ 0, page_num bắt đầu từ 1
-            if page_num - 1 >= len(self.doc):
-                continue
+        # 2. Chỉ search trên các trang đích danh; PDF chỉ mở khi chưa có trong memo
+        with ExitStack() as stack:
+            doc = None
+            for page_num in target_pages:
+                # Index mảng doc bắt đầu từ 0, page_num bắt đầu từ 1
+                if page_num - 1 >= self.get_page_count():
+                    continue
 
-            page = self.doc[page_num - 1]
-            quads = page.search_for(search_phrase)
+                key = coordinate_key(page_num, search_phrase)
+                rects = self.coordinate_memo.get(key)
+                if rects is None:
+                    if doc is None:
+                        doc = stack.enter_context(self.document())
+                    rects = [
+                        [round(q.x0, 2), round(q.y0, 2), round(q.x1, 2), round(q.y1, 2)]
+                        for q in doc[page_num - 1].search_for(search_phrase)
+                    ]
+                    self.coordinate_memo[key] = rects
+                    self.new_coordinates[key] = rects
 
-            if quads:
-                for q in quads:
-                    locations.append(
-                        {
-                            "page": page_num,
-                            "rect": [
-                                round(q.x0, 2),
-                                round(q.y0, 2),
-                                round(q.x1, 2),
-                                round(q.y1, 2),
-                            ],
-                        }
-                    )
+                locations.extend({"page": page_num, "rect": rect} for rect in rects)
 
         return target_pages, locations
 
-    # --- Hàm helper để lấy footnote từ danh sách trang ---
-    def _lookup_footnotes(self, page_numbers):
+    # --- Hàm helper để lấy footnote id trong đoạn text ---
+    @timed("footnote_lookup")
+    def _lookup_footnotes(self, start_idx, end_idx, page_numbers):
         """
-        Input: List các số trang [1, 2]
-        Output: String gộp footnote (VD: "[Trang 1]: Note...\n[Trang 2]: Note...")
+        Input: Offset tuyệt đối [start_idx, end_idx) của chunk và các trang chứa chunk
+        Output: List footnote id có dấu chú thích nằm trong đoạn (VD: ["fn_3", "fn_4"])
         """
-        collected_notes = []
-        for p in page_numbers:
-            if p in self.page_footnotes_map:
-                note_content = self.page_footnotes_map[p]
-                if note_content:
-                    collected_notes.append(f"[Trang {p}]: {note_content}")
-
-        return "\n".join(collected_notes) if collected_notes else ""
+        return self.footnotes.ids_in_span(start_idx, end_idx, page_numbers)
 
     def recursive_split(self, article_dict, base_offset):
         """
@@ -371,7 +681,10 @@ class LandLawChunkerFinal:
                 full_text[:100], abs_start, abs_end
             )
 
-            footnotes_str = self._lookup_footnotes(pgs)  # Tra cứu footnote
+            # Tra cứu footnote: tính cả tiêu đề Điều (dấu chú thích hay nằm ở tiêu đề)
+            footnote_ids = self._lookup_footnotes(
+                article_dict.get("start", abs_start), abs_end, pgs
+            )
 
             chunk_id = f"law_{self.law_id}_art_{article_id}"
             return [
@@ -385,7 +698,7 @@ class LandLawChunkerFinal:
                         "point_id": None,
                         "page_number": pgs,
                         "coordinates": coords,
-                        "chunk_footnotes": footnotes_str,
+                        "footnote_ids": footnote_ids,
                     },
                 }
             ]
@@ -400,18 +713,30 @@ class LandLawChunkerFinal:
         else:
             article_preamble = ""
 
+        # Footnote: các đoạn [đầu khoản, đầu khoản sau) phủ kín Điều, cùng quy ước
+        # [start, end) với FootnoteRegistry.ids_in_span nên dấu ở ký tự cuối của
+        # khoản thuộc đúng khoản đó. Dấu ở tiêu đề/lời dẫn Điều (được lặp lại
+        # trong mọi chunk) gắn vào mọi chunk của Điều.
+        article_note_ids = self._lookup_footnotes(
+            article_dict.get("start", base_offset), base_offset + matches[0].start(), []
+        )
+
         # Duyệt qua từng khoản
         for i, match in enumerate(matches):
             clause_id = match.group(2)
             start = match.end()
             # Điểm cuối là điểm đầu của khoản tiếp theo, hoặc hết văn bản
             end = matches[i + 1].start() if i + 1 < len(matches) else len(full_text)
-            clause_content = full_text[start:end].strip()
+            raw_clause = full_text[start:end]
+            clause_content = raw_clause.strip()
 
             # Tính offset tuyệt đối trong file gốc
             # match.end() là vị trí sau "1. ", cần cộng với base_offset của Article
-            abs_start = base_offset + start
+            # (bù phần khoảng trắng đầu đã strip để offset của điểm khớp clause_content)
+            abs_start = base_offset + start + len(raw_clause) - len(raw_clause.lstrip())
             abs_end = base_offset + end
+            # Đoạn tra footnote của khoản: tính cả số thứ tự "2." ở đầu khoản
+            note_start = base_offset + match.start()
 
             # --- LOGIC 2: XỬ LÝ ĐIỂM (ADAPTIVE SUB-SPLITTING) ---
             # Thêm 'đ' vào regex cho tiếng Việt
@@ -436,7 +761,9 @@ class LandLawChunkerFinal:
                 pgs, coords = self.get_coordinates_by_offset(
                     clause_content[:100], abs_start, abs_end
                 )
-                footnotes_str = self._lookup_footnotes(pgs)
+                footnote_ids = _merge_ids(
+                    article_note_ids, self._lookup_footnotes(note_start, abs_end, pgs)
+                )
 
                 chunk_id = f"law_{self.law_id}_art_{article_id}_clause_{clause_id}"
                 results.append(
@@ -451,7 +778,7 @@ class LandLawChunkerFinal:
                             "page_number": pgs,
                             "coordinates": coords,
                             "has_points": has_points,  # Flag đánh dấu
-                            "chunk_footnotes": footnotes_str,
+                            "footnote_ids": footnote_ids,
                         },
                     }
                 )
@@ -462,6 +789,13 @@ class LandLawChunkerFinal:
                 clause_preamble = clause_content[: point_matches[0].start()].strip()
                 clean_clause_preamble = self.clean_text_for_embedding(clause_preamble)
                 clean_art_preamble = self.clean_text_for_embedding(article_preamble)
+                # Dấu ở số khoản/lời dẫn khoản: gắn vào mọi điểm của khoản
+                clause_note_ids = _merge_ids(
+                    article_note_ids,
+                    self._lookup_footnotes(
+                        note_start, abs_start + point_matches[0].start(), []
+                    ),
+                )
 
                 for j, p_match in enumerate(point_matches):
                     point_id = p_match.group(2)
@@ -487,7 +821,12 @@ class LandLawChunkerFinal:
                     pgs, coords = self.get_coordinates_by_offset(
                         point_content[:100], p_abs_start, p_abs_end
                     )
-                    footnotes_str = self._lookup_footnotes(pgs)
+                    footnote_ids = _merge_ids(
+                        clause_note_ids,
+                        self._lookup_footnotes(
+                            abs_start + p_match.start(), p_abs_end, pgs
+                        ),
+                    )
 
                     chunk_id = f"law_{self.law_id}_art_{article_id}_clause_{clause_id}_point_{point_id}"
                     results.append(
@@ -501,7 +840,7 @@ class LandLawChunkerFinal:
                                 "point_id": point_id,
                                 "page_number": pgs,
                                 "coordinates": coords,
-                                "chunk_footnotes": footnotes_str,
+                                "footnote_ids": footnote_ids,
                             },
                         }
                     )
@@ -532,7 +871,9 @@ class LandLawChunkerFinal:
             full_text[:100], abs_start, abs_end
         )
 
-        footnotes_str = self._lookup_footnotes(pgs)
+        footnote_ids = self._lookup_footnotes(
+            article_dict.get("start", abs_start), abs_end, pgs
+        )
 
         chunk_id = f"law_{self.law_id}_art_{article_id}"
 
@@ -546,11 +887,12 @@ class LandLawChunkerFinal:
                     "chunk_type": "full_article",  # Đánh dấu là full bài
                     "page_number": pgs,
                     "coordinates": coords,
-                    "chunk_footnotes": footnotes_str,
+                    "footnote_ids": footnote_ids,
                 },
             }
         ]
 
+    @timed("article_split")
     def _extract_article_info(self, raw_article_text):
         """
         Hàm helper: Tách text thô của một Điều luật thành 3 phần:
@@ -630,30 +972,44 @@ class LandLawChunkerFinal:
 
         return art_id, full_art_title, content_body, body_start_rel_offset
 
-    def process(self):
-        print(f"🚀 Bắt đầu xử lý file: {self.pdf_path}")
-
+    def extract_pages(self):
+        """
+        Bước 1: Đọc từng trang, tách nội dung chính / footnote, xây dựng
+        page_offset_map và footnote registry.
+        Returns: full_text (nội dung chính của toàn bộ các trang đã xử lý)
+        """
         # Determine actual pages to process
-        total_pages = len(self.doc)
+        total_pages = self.get_page_count()
         pages_to_process = (
             min(self.max_pages, total_pages) if self.max_pages else total_pages
         )
 
         if self.max_pages:
-            print(f"📋 Giới hạn xử lý: {pages_to_process}/{total_pages} trang")
+            logger.info("📋 Giới hạn xử lý: %d/%d trang", pages_to_process, total_pages)
 
         full_text = ""
         current_offset = 0
         self.page_offset_map = []  # Reset map
-        print(f"📄 Đang đọc PDF: Tách nội dung chính và Footnote...")
-
-        # 1. Duyệt qua từng trang để tách Content và Footnote ngay từ đầu
-        for i, page in enumerate(self.doc):
-            if i >= pages_to_process:
-                break
+        self.footnotes = FootnoteRegistry()  # Reset footnote registry
+        self.page_classification = []
+        self.body_font_size = None
+        self._body_size_votes = Counter()
+        logger.info("📄 Đang đọc PDF: Tách nội dung chính và Footnote...")
 
+        for i in range(pages_to_process):
             page_num = i + 1
-            clean, note = self.get_page_content_and_footnotes(page)
+            clean, note_entries, markers, classification = self.extract_page(
+                page_num
+            )
+            self.page_classification.append({"page": page_num, **classification})
+            self._vote_body_font_size(classification)
+            if classification["confidence"] < LOW_CONFIDENCE:
+                logger.warning(
+                    "⚠️ Trang %d: phân loại cỡ chữ kém tin cậy (%s, %.2f)",
+                    page_num,
+                    classification["method"],
+                    classification["confidence"],
+                )
 
             start_pos = current_offset
             # Lưu ý: clean string + "\n"
@@ -668,23 +1024,45 @@ class LandLawChunkerFinal:
             full_text += clean + "\n"
             current_offset = end_pos
 
-            # Lưu footnote vào map nếu có
-            if note:
-                self.page_footnotes_map[page_num] = note
-
-        print(f"✓ Đã đọc xong {pages_to_process} trang. Đã lưu index Footnote.")
+            # Lưu footnote và vị trí dấu chú thích vào registry
+            self.footnotes.add_page(page_num, start_pos, note_entries, markers)
 
-        # 2. Pattern bắt các tiêu đề cấu trúc (Hierarchy)
-        # Regex này tìm dòng bắt đầu bằng Chương, Mục hoặc Điều
-        hierarchy_pattern = (
-            r"(?m)^(Chương\s+[IVXLCDM]+|Mục\s+\d+|Điều\s+(\d+)\.)\s+(.*)"
+        self.footnotes.finalize()
+        logger.info(
+            "✓ Đã đọc xong %d trang. Đã lưu %d footnote.",
+            pages_to_process,
+            len(self.footnotes),
         )
+        if self.page_cache:
+            self.page_cache.save()
+            logger.info(
+                "🗃️ Page cache: %d hit | %d miss",
+                self.page_cache.hits,
+                self.page_cache.misses,
+            )
+        return full_text
 
-        matches = list(re.finditer(hierarchy_pattern, full_text))
+    def find_structure_markers(self, full_text):
+        """
+        Bước 2: Tìm các tiêu đề cấu trúc (Chương, Mục, Điều) và dựng cây cấu trúc.
+        Returns: Danh sách kết quả regex theo thứ tự xuất hiện
+        """
+        with stage_timer("hierarchy_regex"):
+            matches = list(HIERARCHY_PATTERN.finditer(full_text))
         self.log_structure_hierarchy(matches)
         # Extract and store main document structure
         self.structure = self.extract_structure_hierarchy(matches)
-        print(f"⏳ Bắt đầu xử lý chi tiết...\n")
+        return matches
+
+    def resolve_article_tasks(self, full_text, matches):
+        """
+        Bước 3: Duyệt các tiêu đề 1 lần, cập nhật Chương/Mục hiện tại và gán sẵn
+        cho từng Điều. Sau bước này các Điều độc lập với nhau.
+        Returns: [{"text", "start", "chapter", "section"}, ...] theo thứ tự văn bản
+        """
+        self.current_chapter = {"id": None, "title": None}
+        self.current_section = {"id": None, "title": None}
+        tasks = []
 
         for i, match in enumerate(matches):
             marker_type = match.group(1)  # Chương I, Mục 1, Điều 1.
@@ -692,9 +1070,13 @@ class LandLawChunkerFinal:
 
             # Progress indicator every 10 items or for articles
             if i % 10 == 0 or marker_type.startswith("Điều"):
-                progress_pct = (i / len(matches)) * 100
-                print(
-                    f"📍 [{i+1}/{len(matches)} - {progress_pct:.1f}%] {marker_type} - {content_title[:60]}..."
+                logger.debug(
+                    "📍 [%d/%d - %.1f%%] %s - %s...",
+                    i + 1,
+                    len(matches),
+                    i / len(matches) * 100,
+                    marker_type,
+                    content_title[:60],
                 )
 
             # --- CẬP NHẬT TRẠNG THÁI (State Machine) ---
@@ -716,80 +1098,307 @@ class LandLawChunkerFinal:
                 end_idx = (
                     matches[i + 1].start() if i + 1 < len(matches) else len(full_text)
                 )
+                tasks.append(
+                    {
+                        # Offset bắt đầu của Điều trong toàn bộ văn bản
+                        "start": match.start(),
+                        "text": full_text[match.start() : end_idx],
+                        "chapter": self.current_chapter,
+                        "section": self.current_section,
+                    }
+                )
+        return tasks
 
-                # Offset bắt đầu của Điều trong toàn bộ văn bản
-                article_global_start = match.start()
+    def chunk_article(self, task):
+        """
+        Bước 4: Cắt 1 Điều thành chunk (kèm trang, tọa độ, footnote).
+        Chỉ đọc page_offset_map / footnotes nên chạy song song được.
+        """
+        article_global_start = task["start"]
+        raw_article_text = task["text"].strip()
+        art_id, full_art_title, content_body, body_rel_offset = (
+            self._extract_article_info(raw_article_text)
+        )
 
-                raw_article_text = full_text[article_global_start:end_idx].strip()
-                art_id, full_art_title, content_body, body_rel_offset = (
-                    self._extract_article_info(raw_article_text)
-                )
+        if not art_id:
+            return []  # Bỏ qua nếu không tìm thấy ID
+
+        # Metadata cho Điều
+        meta = {
+            "law_id": self.law_id,
+            "chapter_id": task["chapter"]["id"],
+            "chapter_title": task["chapter"]["title"],
+            "section_id": task["section"]["id"],
+            "section_title": task["section"]["title"],
+            "article_id": art_id,
+            "article_title": full_art_title,
+            "topic": DEFAULT_TOPIC,  # Gán lại bởi TermTagger trong build_chunks
+            "source": self.pdf_path.split("/")[-1],
+        }
+
+        # Tinh chỉnh offset truyền vào recursive_split
+        # recursive_split xử lý trên content_body, nên base_offset phải cộng thêm phần tiêu đề đã cắt
+        final_body_offset = article_global_start + body_rel_offset
+
+        # Gọi hàm cắt
+        return self.recursive_no_nsplit(
+            {
+                "id": art_id,
+                "title": full_art_title,
+                "content": content_body,
+                "start": article_global_start,
+                "metadata": meta,
+            },
+            base_offset=final_body_offset,  # [FIX] Truyền offset chính xác
+        )
 
-                if not art_id:
-                    continue  # Bỏ qua nếu không tìm thấy ID
-
-                # Metadata cho Điều
-                meta = {
-                    "law_id": self.law_id,
-                    "chapter_id": self.current_chapter["id"],
-                    "chapter_title": self.current_chapter["title"],
-                    "section_id": self.current_section["id"],
-                    "section_title": self.current_section["title"],
-                    "article_id": art_id,
-                    "article_title": full_art_title,
-                    "topic": "legal_document",  # Placeholder
-                    "source": self.pdf_path.split("/")[-1],
-                }
+    def _parallel_workers(self, n_articles):
+        """Số process dùng để cắt `n_articles` Điều (1 = tuần tự)."""
+        if n_articles < PARALLEL_MIN_ARTICLES:
+            return 1
+        return usable_workers(self.workers)
 
-                # Tinh chỉnh offset truyền vào recursive_split
-                # recursive_split xử lý trên content_body, nên base_offset phải cộng thêm phần tiêu đề đã cắt
-                final_body_offset = article_global_start + body_rel_offset
+    def _chunk_articles_parallel(self, tasks, workers):
+        """
+        Cắt các Điều trên pool process dùng chung (get_article_pool). Mỗi worker
+        nhận 1 lô Điều liên tiếp kèm page_offset_map/footnotes của lần parse này
+        (gửi 1 lần mỗi lô) và trả về chunk cùng thời gian từng stage để ghi vào
+        /metrics. Kết quả giữ đúng thứ tự của `tasks`.
+        """
+        executor = get_article_pool(workers)
+        context = (
+            self.pdf_path,
+            self.law_id,
+            self.page_offset_map,
+            self.footnotes,
+            self.coordinate_memo,
+        )
+        size = -(-len(tasks) // workers)
+        batches = [tasks[i : i + size] for i in range(0, len(tasks), size)]
+        try:
+            results = list(executor.map(_chunk_article_batch, repeat(context), batches))
+        except BrokenProcessPool:
+            # Worker chết giữa chừng: bỏ pool hỏng, lần parse sau tạo pool mới
+            discard_article_pool(workers, executor)
+            raise
+        per_article = []
+        for batch_chunks, new_coordinates, observations in results:
+            self.coordinate_memo.update(new_coordinates)
+            self.new_coordinates.update(new_coordinates)
+            observe_stages(observations)
+            per_article.extend(batch_chunks)
+        return per_article
+
+    def build_chunks(self, full_text, matches):
+        """
+        Bước 3-5: Gán Chương/Mục cho từng Điều, cắt từng Điều thành chunk
+        (tuần tự hoặc song song) rồi áp dụng bảng sửa lỗi theo đúng thứ tự.
+        """
+        self.chunks = []
+        logger.info("⏳ Bắt đầu xử lý chi tiết...")
 
-                # Gọi hàm cắt
-                chunks = self.recursive_no_nsplit(
-                    {
-                        "id": art_id,
-                        "title": full_art_title,
-                        "content": content_body,
-                        "metadata": meta,
-                    },
-                    base_offset=final_body_offset,  # [FIX] Truyền offset chính xác
-                )
-                self.chunks.extend(chunks)
-                print(
-                    f"   ✓ Điều {art_id}: {len(chunks)} chunks | Tổng: {len(self.chunks)}"
-                )
+        tasks = self.resolve_article_tasks(full_text, matches)
+        workers = self._parallel_workers(len(tasks))
+        if workers > 1:
+            logger.info("⚙️ Cắt %d Điều trên %d process", len(tasks), workers)
+            per_article = self._chunk_articles_parallel(tasks, workers)
+        else:
+            per_article = map(self.chunk_article, tasks)
 
-            # Checkpoint every 50 items
-            if i > 0 and (i + 1) % 50 == 0:
-                print(
-                    f"\n🎯 Checkpoint: {i+1}/{len(matches)} ({(i+1)/len(matches)*100:.1f}%) - {len(self.chunks)} chunks tổng\n"
+        for chunks in per_article:
+            if not chunks:
+                continue
+            # Áp dụng bảng sửa lỗi ngay khi tạo chunk (tra cứu O(1) theo id)
+            if self.corrections:
+                chunks = [
+                    c for c in map(self.corrections.apply, chunks) if c is not None
+                ]
+            # Gán topic + số lần xuất hiện thuật ngữ (1 lượt quét / chunk)
+            for chunk in chunks:
+                self.tagger.tag(chunk)
+            self.chunks.extend(chunks)
+            if self.sink is not None:
+                self.sink.add_chunks(chunks)
+            CHUNKS.inc(len(chunks))
+            if chunks:
+                logger.debug(
+                    "   ✓ Điều %s: %d chunks | Tổng: %d",
+                    chunks[0]["metadata"]["article_id"],
+                    len(chunks),
+                    len(self.chunks),
                 )
 
-        print(f"\n✅ Hoàn thành! Tổng cộng {len(self.chunks)} chunks được tạo ra.")
-        return {"chunks": self.chunks, "structure": self.structure}
+        for correction in self.corrections.unapplied():
+            logger.warning(
+                "⚠️ Không áp dụng được correction %s cho %s",
+                correction["op"],
+                correction.get("chunk_id") or f"Điều {correction.get('article_id')}",
+            )
+        if self.page_cache and self.new_coordinates:
+            self.page_cache.add_coordinates(self.new_coordinates)
+            self.page_cache.save()
+            logger.info("🗃️ Page cache: lưu %d kết quả tìm tọa độ", len(self.new_coordinates))
+        self.new_coordinates = {}
+        return self.chunks
+
+    @timed("process")
+    def process(self):
+        logger.info("🚀 Bắt đầu xử lý file: %s", self.pdf_path)
+        if self.sink is not None:
+            self.sink.begin_document(
+                self.law_id, os.path.basename(self.pdf_path), self.result_cache_key()
+            )
+
+        try:
+            # 1. Duyệt qua từng trang để tách Content và Footnote ngay từ đầu
+            full_text = self.extract_pages()
+            if self.sink is not None:
+                self.sink.write_pages(self.page_offset_map, self.page_classification)
+                self.sink.write_footnotes(self.footnotes.to_dict())
+
+            # 2. Pattern bắt các tiêu đề cấu trúc (Hierarchy)
+            matches = self.find_structure_markers(full_text)
+            if self.sink is not None:
+                self.sink.write_structure(self.structure)
+
+            # 3. Cắt từng Điều thành chunk
+            self.build_chunks(full_text, matches)
+            if self.sink is not None:
+                self.sink.finish_document()
+        except BaseException:
+            # Không để lại document ghi dở trong SQLite
+            if self.sink is not None:
+                self.sink.abort_document()
+            raise
+
+        logger.info("✅ Hoàn thành! Tổng cộng %d chunks được tạo ra.", len(self.chunks))
+        return {
+            "chunks": self.chunks,
+            "structure": self.structure,
+            "footnotes": self.footnotes.to_dict(),
+            "page_classification": self.page_classification,
+        }
+
+
+# Pool process cắt Điều dùng chung trong process, theo số worker
+# (tạo lần đầu cần, giữ lại cho các lần parse sau)
+_article_pools = {}
+_article_pools_lock = threading.Lock()
+
+
+def usable_workers(workers):
+    """Số worker thực dùng: không vượt số CPU (1 CPU thì song song chỉ tốn thêm)."""
+    return max(1, min(workers or 1, os.cpu_count() or 1))
+
+
+def get_article_pool(workers):
+    """Pool `workers` process dùng chung để cắt Điều song song."""
+    with _article_pools_lock:
+        executor = _article_pools.get(workers)
+        if executor is None:
+            # forkserver/spawn: không fork process đang có thread (server, pool PDF)
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context(
+                "forkserver" if "forkserver" in methods else "spawn"
+            )
+            executor = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+            _article_pools[workers] = executor
+        return executor
+
+
+def warm_article_pool(workers):
+    """
+    Khởi động trước pool (spawn process + import module, ~1s) để lần parse
+    đầu tiên không phải chịu chi phí này. Không làm gì nếu chỉ dùng 1 worker.
+    """
+    workers = usable_workers(workers)
+    if workers > 1:
+        list(get_article_pool(workers).map(_noop, range(workers)))
+
+
+def _noop(_):
+    return None
+
+
+def discard_article_pool(workers, executor):
+    """Bỏ pool `executor` (đã hỏng) để lần gọi sau tạo pool mới."""
+    with _article_pools_lock:
+        if _article_pools.get(workers) is executor:
+            del _article_pools[workers]
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+@atexit.register
+def shutdown_article_pools():
+    """Dừng mọi pool process cắt Điều (gọi khi tắt service / thoát)."""
+    with _article_pools_lock:
+        pools = list(_article_pools.values())
+        _article_pools.clear()
+    for executor in pools:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+# Parser chỉ đọc của worker process, giữ lại giữa các lô của cùng 1 PDF
+_worker_parser = None
+
+
+def _chunk_article_batch(context, tasks):
+    """
+    Cắt 1 lô Điều trong worker; trả về (chunk của từng Điều, tọa độ mới tìm,
+    thời gian stage).
+    """
+    global _worker_parser
+    pdf_path, law_id, page_offset_map, footnotes, coordinate_memo = context
+    if _worker_parser is None or _worker_parser.pdf_path != pdf_path:
+        _worker_parser = LandLawChunkerFinal(
+            pdf_path, corrections_path=None, terms_path=None
+        )
+    _worker_parser.law_id = law_id
+    _worker_parser.page_offset_map = page_offset_map
+    _worker_parser.footnotes = footnotes
+    _worker_parser.coordinate_memo = coordinate_memo
+    _worker_parser.new_coordinates = {}
+    with recorded_stages() as observations:
+        per_article = [_worker_parser.chunk_article(task) for task in tasks]
+    return per_article, _worker_parser.new_coordinates, observations
 
 
 # ==========================================
 # TEST RUNNER (Để bạn chạy thử)
 # ==========================================
 if __name__ == "__main__":
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"), format="%(message)s")
+
     # Thay tên file PDF của bạn vào đây
     PDF_FILE = "./data/133-vbhn-vpqh.pdf"
+    # Cache kết quả đọc PDF để thử các chiến lược chunking khác nhau nhanh hơn
+    PAGE_CACHE_DIR = os.getenv("PAGE_CACHE_DIR", "./.cache/pages")
+    # Số process cắt các Điều song song
+    PARSER_WORKERS = int(os.getenv("PARSER_WORKERS", "1"))
+    # Ghi thêm kết quả vào SQLite (bỏ trống để tắt)
+    SQLITE_PATH = os.getenv("SQLITE_PATH")
 
     try:
-        parser = LandLawChunkerFinal(PDF_FILE)
+        sink = None
+        if SQLITE_PATH:
+            from sqlite_sink import SQLiteSink
+
+            sink = SQLiteSink(SQLITE_PATH)
+        parser = LandLawChunkerFinal(
+            PDF_FILE, cache_dir=PAGE_CACHE_DIR, workers=PARSER_WORKERS, sink=sink
+        )
         result = parser.process()
 
         # Extract chunks and structure
         chunks = result["chunks"]
         structure = result["structure"]
 
-        # Update Article 260 content with complete clauses 12-16
-        updated_chunks = update_article_260_content(chunks)
-
-        # Prepare final data with both chunks and structure
-        final_data = {"chunks": updated_chunks, "structure": structure}
+        # Prepare final data with chunks, structure and the footnote registry
+        final_data = {
+            "chunks": chunks,
+            "structure": structure,
+            "footnotes": result["footnotes"],
+        }
 
         # Xuất kết quả
         OUTPUT_FILE = "./data/land_law_chunks_final.json"
@@ -798,7 +1407,9 @@ if __name__ == "__main__":
 
         print(f"💾 Dữ liệu đã được lưu vào: {OUTPUT_FILE}")
         print(f"📊 Cấu trúc: {len(structure)} mục (Chương/Mục/Điều)")
-        print(f"📦 Chunks: {len(updated_chunks)} chunks")
+        print(f"📦 Chunks: {len(chunks)} chunks")
+        if sink is not None:
+            print(f"🗄️ SQLite: {SQLITE_PATH}")
 
     except Exception as e:
         print(f"❌ Lỗi: {e}")
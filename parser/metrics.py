@@ -0,0 +1,114 @@
+"""
+Prometheus instrumentation for the Land Law parser.
+
+Stage timings are recorded in one histogram labelled by stage, and page/chunk/
+cache counters are exposed next to them. `app.py` serves everything on
+`/metrics`; outside the service the metrics are simply collected in-process.
+
+Parser worker processes have their own registry: they collect their stage
+observations with `recorded_stages()` and the parent replays them with
+`observe_stages()`, so parallel parses keep their timings.
+"""
+
+import functools
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from prometheus_client import Counter, Histogram
+
+STAGES = (
+    "page_extraction",
+    "hierarchy_regex",
+    "article_split",
+    "text_cleaning",
+    "coordinate_search",
+    "footnote_lookup",
+    "process",
+    "page_render",
+    "citation_index",
+    "citation_verify",
+)
+
+STAGE_SECONDS = Histogram(
+    "land_law_parser_stage_seconds",
+    "Time spent in each parser stage",
+    ["stage"],
+    buckets=(
+        0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01,
+        0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 120.0,
+    ),  # fmt: skip
+)
+PAGES = Counter(
+    "land_law_parser_pages_total",
+    "Pages processed by the extraction stage",
+    ["source"],  # pdf | cache
+)
+CHUNKS = Counter("land_law_parser_chunks_total", "Chunks emitted by the parser")
+PAGE_CACHE_HITS = Counter(
+    "land_law_parser_page_cache_hits_total", "Page extraction cache hits"
+)
+PAGE_CACHE_MISSES = Counter(
+    "land_law_parser_page_cache_misses_total", "Page extraction cache misses"
+)
+RENDER_CACHE = Counter(
+    "land_law_parser_render_cache_total",
+    "Rendered page/highlight lookups by cache level",
+    ["result"],  # memory | disk | miss
+)
+
+# Pre-bound children: avoids a labels() lookup on every observation
+_STAGE_TIMERS = {stage: STAGE_SECONDS.labels(stage) for stage in STAGES}
+
+
+# [(stage, seconds)] collected while `recorded_stages()` is active
+_recorded: Optional[List[Tuple[str, float]]] = None
+
+
+@contextmanager
+def stage_timer(stage: str):
+    """Context manager recording the duration of `stage`."""
+    timer = _STAGE_TIMERS[stage]
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        timer.observe(elapsed)
+        if _recorded is not None:
+            _recorded.append((stage, elapsed))
+
+
+@contextmanager
+def recorded_stages():
+    """
+    Collect the stage observations made in this process while active, as a
+    list of (stage, seconds) to hand to `observe_stages` in another process.
+    Not thread-safe: meant for single-threaded worker processes.
+    """
+    global _recorded
+    previous, _recorded = _recorded, []
+    try:
+        yield _recorded
+    finally:
+        _recorded = previous
+
+
+def observe_stages(observations: Iterable[Tuple[str, float]]) -> None:
+    """Record stage observations collected by `recorded_stages` elsewhere."""
+    for stage, seconds in observations:
+        _STAGE_TIMERS[stage].observe(seconds)
+
+
+def timed(stage: str) -> Callable:
+    """Decorator recording every call of the wrapped function under `stage`."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage_timer(stage):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,129 @@
+"""
+On-disk cache for the page extraction stage of the Land Law parser.
+
+Stage 1 of `LandLawChunkerFinal.process()` (PyMuPDF `get_text("dict")` +
+body/footnote classification) only depends on the PDF bytes, not on the
+chunking strategy. Its per-page output is cached here, keyed by the PDF hash
+and the page number, so chunking and normalization experiments can rerun
+without decoding the PDF again.
+
+Coordinate searches (`page.search_for` of a chunk's leading text) are cached
+next to the pages, keyed by page and search phrase: a rerun only opens the
+PDF for phrases that no earlier run has searched.
+
+Layout: one gzip-compressed compact JSON file per PDF and extractor version:
+
+    <cache_dir>/<pdf_sha256>.v<PAGE_CACHE_VERSION>.json.gz
+    {"page_count": 304, "pages": {"1": {...}, "2": {...}},
+     "coordinates": {"12\tĐiều 5. Phạm vi...": [[x0, y0, x1, y1], ...]}}
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Dict, List, Optional
+
+# Bump when the output of `get_page_content_and_footnotes` changes
+PAGE_CACHE_VERSION = 4
+
+# { (path, size, mtime): sha256 } để không phải hash lại file chưa thay đổi
+_hash_memo: Dict[tuple, str] = {}
+
+
+def file_sha256(path: str) -> str:
+    """SHA-256 of a file, memoized on (path, size, mtime)."""
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    if key not in _hash_memo:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        _hash_memo[key] = digest.hexdigest()
+    return _hash_memo[key]
+
+
+def coordinate_key(page_num: int, phrase: str) -> str:
+    """Key of a coordinate search of `phrase` on a 1-based page."""
+    return f"{page_num}\t{phrase}"
+
+
+class PageCache:
+    """
+    Per-PDF page extraction cache.
+
+    Pages are loaded lazily on first access and written back in one atomic
+    `save()` call after extraction, so concurrent runs never see a partial file.
+    """
+
+    def __init__(self, cache_dir: str, pdf_hash: str):
+        self.cache_dir = cache_dir
+        self.pdf_hash = pdf_hash
+        self.path = os.path.join(
+            cache_dir, f"{pdf_hash}.v{PAGE_CACHE_VERSION}.json.gz"
+        )
+        self.hits = 0
+        self.misses = 0
+        self._data: Optional[Dict[str, Any]] = None
+        self._dirty = False
+
+    def _load(self) -> Dict[str, Any]:
+        if self._data is None:
+            try:
+                with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                    self._data = json.load(f)
+            except (OSError, ValueError):
+                # Cache chưa có hoặc bị hỏng: coi như rỗng
+                self._data = {"page_count": None, "pages": {}}
+        return self._data
+
+    @property
+    def page_count(self) -> Optional[int]:
+        return self._load()["page_count"]
+
+    @page_count.setter
+    def page_count(self, value: int):
+        data = self._load()
+        if data["page_count"] != value:
+            data["page_count"] = value
+            self._dirty = True
+
+    def get(self, page_num: int) -> Optional[Dict[str, Any]]:
+        """Cached extraction of a 1-based page, or None on a miss."""
+        entry = self._load()["pages"].get(str(page_num))
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def put(self, page_num: int, entry: Dict[str, Any]):
+        self._load()["pages"][str(page_num)] = entry
+        self._dirty = True
+
+    def coordinates(self) -> Dict[str, List[List[float]]]:
+        """Cached coordinate searches: {coordinate_key(page, phrase): rects}."""
+        return self._load().setdefault("coordinates", {})
+
+    def add_coordinates(self, entries: Dict[str, List[List[float]]]):
+        if entries:
+            self.coordinates().update(entries)
+            self._dirty = True
+
+    def save(self):
+        """Atomically write the cache file if anything changed."""
+        if not self._dirty:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.open(raw, "wt", encoding="utf-8") as f:
+                json.dump(self._data, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._dirty = False
@@ -0,0 +1,260 @@
+"""
+PNG rendering of PDF pages and chunk highlights for citation previews.
+
+`render_page_png` renders a whole page, `render_highlight_png` a crop of the
+page around a chunk's `coordinates` with the matched rects highlighted. The
+overlay is blended into the pixmap with numpy, so the pooled (shared)
+PyMuPDF documents are never modified.
+
+Rendered images are kept in a `RenderCache`: a size-bounded LRU in memory in
+front of a size-bounded directory on disk, both keyed by a digest of the PDF
+version and the render parameters (also used as the HTTP ETag).
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+MIN_DPI = 36
+MAX_DPI = 300
+DEFAULT_DPI = 110
+
+# Vertical context kept above and below the highlighted rects (PDF points)
+DEFAULT_MARGIN = 36.0
+
+HIGHLIGHT_COLOR = np.array([255, 220, 0], dtype=np.float32)  # RGB
+HIGHLIGHT_ALPHA = 0.35
+
+
+def render_key(*parts: Any) -> str:
+    """Cache key / ETag of a render: digest of the PDF version and parameters."""
+    return hashlib.sha256("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()[:32]
+
+
+def _to_png(pixels: np.ndarray) -> bytes:
+    import fitz  # PyMuPDF
+
+    height, width, _ = pixels.shape
+    pix = fitz.Pixmap(fitz.csRGB, width, height, pixels.tobytes(), False)
+    return pix.tobytes("png")
+
+
+def render_page_png(doc, page_num: int, dpi: int = DEFAULT_DPI) -> bytes:
+    """Render a 1-based page as PNG."""
+    pix = doc[page_num - 1].get_pixmap(dpi=dpi, alpha=False)
+    return pix.tobytes("png")
+
+
+def render_highlight_png(
+    doc,
+    page_num: int,
+    rects: List[List[float]],
+    dpi: int = DEFAULT_DPI,
+    margin: float = DEFAULT_MARGIN,
+) -> bytes:
+    """
+    Render the full-width band of a page that contains `rects` (plus `margin`
+    points above and below) with every rect highlighted.
+
+    Args:
+        doc: Open PyMuPDF document (read-only use)
+        page_num: 1-based page number
+        rects: [x0, y0, x1, y1] rects in page coordinates, as in chunk `coordinates`
+        dpi: Output resolution
+        margin: Context kept around the rects, in PDF points
+
+    Returns:
+        PNG bytes; the whole page when `rects` is empty
+    """
+    import fitz  # PyMuPDF
+
+    page = doc[page_num - 1]
+    bounds = page.rect
+    if rects:
+        top = min(r[1] for r in rects) - margin
+        bottom = max(r[3] for r in rects) + margin
+        clip = fitz.Rect(bounds.x0, max(bounds.y0, top), bounds.x1, min(bounds.y1, bottom))
+    else:
+        clip = bounds
+
+    pix = page.get_pixmap(dpi=dpi, clip=clip, alpha=False)
+    pixels = (
+        np.frombuffer(pix.samples, dtype=np.uint8)
+        .reshape(pix.height, pix.width, pix.n)[:, :, :3]
+        .astype(np.float32)
+    )
+
+    scale = dpi / 72
+    for x0, y0, x1, y1 in rects:
+        # Page points -> pixel coordinates of the clipped pixmap
+        left = max(int(x0 * scale) - pix.x, 0)
+        top = max(int(y0 * scale) - pix.y, 0)
+        right = min(int(np.ceil(x1 * scale)) - pix.x, pix.width)
+        bottom = min(int(np.ceil(y1 * scale)) - pix.y, pix.height)
+        if right <= left or bottom <= top:
+            continue
+        region = pixels[top:bottom, left:right]
+        # Multiply blend keeps the text readable under the highlight
+        region[:] = region * (1 - HIGHLIGHT_ALPHA) + region * (
+            HIGHLIGHT_COLOR / 255
+        ) * HIGHLIGHT_ALPHA
+
+    return _to_png(pixels.astype(np.uint8))
+
+
+def chunk_page_rects(
+    chunk: Dict[str, Any], page_num: Optional[int] = None
+) -> Tuple[Optional[int], List[List[float]]]:
+    """
+    Page to render for a chunk and the chunk's rects on it.
+
+    Defaults to the first page that has coordinates, then to the chunk's first
+    page. Returns (None, []) when the chunk has no page at all.
+    """
+    metadata = chunk["metadata"]
+    coordinates = metadata.get("coordinates") or []
+    if page_num is None:
+        if coordinates:
+            page_num = coordinates[0]["page"]
+        elif metadata.get("page_number"):
+            page_num = metadata["page_number"][0]
+        else:
+            return None, []
+    return page_num, [c["rect"] for c in coordinates if c["page"] == page_num]
+
+
+class RenderCache:
+    """
+    Two-level, size-bounded LRU cache of rendered images.
+
+    Memory holds the most recently used entries up to `max_memory_bytes`.
+    The disk level (optional) keeps one file per key up to `max_disk_bytes`,
+    evicting the least recently used files (by mtime, refreshed on hits).
+    """
+
+    def __init__(
+        self,
+        max_memory_bytes: int = 64 << 20,
+        cache_dir: Optional[str] = None,
+        max_disk_bytes: int = 512 << 20,
+    ):
+        self.max_memory_bytes = max_memory_bytes
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.png")
+
+    def _remember(self, key: str, data: bytes):
+        # Caller holds the lock
+        if len(data) > self.max_memory_bytes:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= len(old)
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def get_memory(self, key: str) -> Optional[bytes]:
+        """Image from the memory level only (no disk access: safe on an event loop)."""
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+            return data
+
+    def get(self, key: str) -> Tuple[Optional[bytes], str]:
+        """Cached image and where it came from: "memory", "disk" or "miss"."""
+        data = self.get_memory(key)
+        if data is not None:
+            return data, "memory"
+        if not self.cache_dir:
+            return None, "miss"
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)  # LRU: last access time for disk eviction
+        except OSError:
+            return None, "miss"
+        with self._lock:
+            self._remember(key, data)
+        return data, "disk"
+
+    def put(self, key: str, data: bytes):
+        with self._lock:
+            self._remember(key, data)
+        if self.cache_dir and len(data) <= self.max_disk_bytes:
+            self._write(key, data)
+
+    def _write(self, key: str, data: bytes):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            # Under the lock: the size of the file being replaced is exact
+            with self._lock:
+                try:
+                    replaced = os.stat(path).st_size
+                except FileNotFoundError:
+                    replaced = 0
+                os.replace(tmp_path, path)
+                if self._disk_bytes is None:
+                    self._disk_bytes = self._scan_disk_bytes()
+                else:
+                    self._disk_bytes += len(data) - replaced
+                if self._disk_bytes > self.max_disk_bytes:
+                    self._evict_disk()
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _scan_disk_bytes(self) -> int:
+        return sum(
+            entry.stat().st_size
+            for entry in os.scandir(self.cache_dir)
+            if entry.name.endswith(".png")
+        )
+
+    def _evict_disk(self):
+        # Caller holds the lock
+        entries = sorted(
+            (entry.stat().st_mtime, entry.stat().st_size, entry.path)
+            for entry in os.scandir(self.cache_dir)
+            if entry.name.endswith(".png")
+        )
+        total = sum(size for _, size, _ in entries)
+        # Evict down to 90% so a full cache does not rescan on every write
+        target = self.max_disk_bytes * 0.9
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+        self._disk_bytes = total
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_bytes": self._disk_bytes,
+            }
@@ -0,0 +1,489 @@
+"""
+Optional SQLite sink for parsed Land Law corpora.
+
+`LandLawChunkerFinal` writes into the sink while it parses: page offsets and
+footnotes after page extraction, structure nodes after the hierarchy regex,
+and chunks in batches of `batch_size` as articles are chunked. Every write is
+one transaction of bulk (`executemany`) inserts: chunk and structure node row
+ids are assigned up front under the write lock (`BEGIN IMMEDIATE`), so child
+rows never need a per-row `lastrowid`. A document only becomes visible to
+queries once `finish_document()` marks it complete, and a new parse of a law
+replaces the older documents of the same `law_id`.
+
+Schema (one database can hold several laws):
+
+    documents       one row per parse (law_id, source, corpus key, status)
+    pages           page number -> [start, end) offset in the full text,
+                    plus the font-size classification
+    structure_nodes chapter/section/article tree (parent_id, depth, ordinal)
+    footnotes       footnote registry
+    chunks          chunk text, filter columns and the full metadata JSON
+    chunk_pages     chunk -> page (indexed for page filters)
+    chunk_footnotes chunk -> footnote id
+
+The schema is tied to `PARSER_VERSION`: a database written by another parser
+version is dropped and recreated on open, since its contents are derived and
+the parser output may differ.
+
+Lookups (`query_chunks`) use a fixed set of parameterized statements, one per
+combination of filters, so sqlite3's statement cache keeps them prepared.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from corpus import PARSER_VERSION
+
+# Bump when the table layout changes (independently of the parser output)
+SCHEMA_VERSION = 2
+
+DEFAULT_BATCH_SIZE = 500
+
+logger = logging.getLogger("land_law_parser")
+
+_TABLES = (
+    "chunk_footnotes",
+    "chunk_pages",
+    "chunks",
+    "footnotes",
+    "structure_nodes",
+    "pages",
+    "documents",
+    "schema_info",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS schema_info (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    law_id TEXT NOT NULL,
+    source TEXT NOT NULL,
+    corpus_key TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'writing',
+    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_documents_law ON documents (law_id, status);
+CREATE INDEX IF NOT EXISTS idx_documents_key ON documents (corpus_key, status);
+CREATE TABLE IF NOT EXISTS pages (
+    document_id INTEGER NOT NULL REFERENCES documents (id) ON DELETE CASCADE,
+    page INTEGER NOT NULL,
+    start INTEGER NOT NULL,
+    end INTEGER NOT NULL,
+    threshold REAL,
+    body_font_size REAL,
+    confidence REAL,
+    method TEXT,
+    PRIMARY KEY (document_id, page)
+);
+CREATE TABLE IF NOT EXISTS structure_nodes (
+    id INTEGER PRIMARY KEY,
+    document_id INTEGER NOT NULL REFERENCES documents (id) ON DELETE CASCADE,
+    parent_id INTEGER REFERENCES structure_nodes (id) ON DELETE CASCADE,
+    ordinal INTEGER NOT NULL,
+    depth INTEGER NOT NULL,
+    node_type TEXT NOT NULL,
+    title TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_structure_document ON structure_nodes (document_id, ordinal);
+-- ON DELETE CASCADE of parent_id looks children up by parent when a parse is replaced
+CREATE INDEX IF NOT EXISTS idx_structure_parent ON structure_nodes (parent_id);
+CREATE TABLE IF NOT EXISTS footnotes (
+    document_id INTEGER NOT NULL REFERENCES documents (id) ON DELETE CASCADE,
+    footnote_id TEXT NOT NULL,
+    number TEXT,
+    page INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (document_id, footnote_id)
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    id INTEGER PRIMARY KEY,
+    document_id INTEGER NOT NULL REFERENCES documents (id) ON DELETE CASCADE,
+    ordinal INTEGER NOT NULL,
+    chunk_id TEXT NOT NULL,
+    chunk_type TEXT,
+    chapter_id TEXT,
+    section_id TEXT,
+    article_id TEXT,
+    clause_id TEXT,
+    point_id TEXT,
+    topic TEXT,
+    page_content TEXT NOT NULL,
+    metadata TEXT NOT NULL,
+    UNIQUE (document_id, chunk_id)
+);
+CREATE INDEX IF NOT EXISTS idx_chunks_order ON chunks (document_id, ordinal);
+CREATE INDEX IF NOT EXISTS idx_chunks_chapter ON chunks (document_id, chapter_id, ordinal);
+CREATE INDEX IF NOT EXISTS idx_chunks_section ON chunks (document_id, section_id, ordinal);
+CREATE INDEX IF NOT EXISTS idx_chunks_article ON chunks (document_id, article_id, ordinal);
+CREATE INDEX IF NOT EXISTS idx_chunks_topic ON chunks (document_id, topic);
+CREATE TABLE IF NOT EXISTS chunk_pages (
+    chunk_row INTEGER NOT NULL REFERENCES chunks (id) ON DELETE CASCADE,
+    document_id INTEGER NOT NULL,
+    page INTEGER NOT NULL,
+    PRIMARY KEY (chunk_row, page)
+);
+CREATE INDEX IF NOT EXISTS idx_chunk_pages_page ON chunk_pages (document_id, page, chunk_row);
+CREATE TABLE IF NOT EXISTS chunk_footnotes (
+    chunk_row INTEGER NOT NULL REFERENCES chunks (id) ON DELETE CASCADE,
+    footnote_id TEXT NOT NULL,
+    PRIMARY KEY (chunk_row, footnote_id)
+);
+"""
+
+# Filters of `query_chunks`, in the order they appear in the WHERE clause
+CHUNK_FILTERS = ("law_id", "chapter_id", "section_id", "article_id", "page")
+
+_FILTER_SQL = {
+    "law_id": "d.law_id = :law_id",
+    "chapter_id": "c.chapter_id = :chapter_id",
+    "section_id": "c.section_id = :section_id",
+    "article_id": "c.article_id = :article_id",
+    "page": "p.page = :page",
+}
+
+
+def _from_where(filters: Tuple[str, ...]) -> str:
+    tables = "chunks c JOIN documents d ON d.id = c.document_id"
+    if "page" in filters:
+        # Seek (document_id, page) in chunk_pages, then chunks by rowid
+        tables += " JOIN chunk_pages p ON p.chunk_row = c.id AND p.document_id = d.id"
+    where = ["d.status = 'complete'"] + [_FILTER_SQL[name] for name in filters]
+    return f"FROM {tables} WHERE {' AND '.join(where)}"
+
+
+def _chunk_query(filters: Tuple[str, ...]) -> str:
+    return (
+        f"SELECT c.page_content, c.metadata {_from_where(filters)} "
+        "ORDER BY c.document_id, c.ordinal LIMIT :limit OFFSET :offset"
+    )
+
+
+def _count_query(filters: Tuple[str, ...]) -> str:
+    return f"SELECT COUNT(*) {_from_where(filters)}"
+
+
+# Every filter combination, built once: the same SQL text per combination
+# keeps each statement in sqlite3's prepared-statement cache
+_PREPARED = {}
+for _mask in range(1 << len(CHUNK_FILTERS)):
+    _names = tuple(n for i, n in enumerate(CHUNK_FILTERS) if _mask >> i & 1)
+    _PREPARED[_names] = (_chunk_query(_names), _count_query(_names))
+
+
+class SQLiteSink:
+    """
+    SQLite store of parsed corpora: written by the parser, queried by the API.
+
+    Connections are per thread (sqlite3 objects cannot be shared across
+    threads); the database runs in WAL mode so queries are not blocked by a
+    parse writing a new document.
+    """
+
+    def __init__(self, path: str, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self._local = threading.local()
+        self._document_id: Optional[int] = None
+        self._pending: List[Dict[str, Any]] = []
+        self._ordinal = 0
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._ensure_schema()
+
+    # --- Connection / schema ---
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, cached_statements=256)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute("PRAGMA foreign_keys = ON")
+            self._local.conn = conn
+        return conn
+
+    def _ensure_schema(self):
+        conn = self._connection()
+        with conn:
+            try:
+                stored = dict(conn.execute("SELECT key, value FROM schema_info"))
+            except sqlite3.OperationalError:
+                stored = {}
+            expected = {"schema_version": str(SCHEMA_VERSION), "parser_version": PARSER_VERSION}
+            if stored and stored != expected:
+                logger.warning(
+                    "♻️ SQLite schema %s is outdated (expected %s), recreating %s",
+                    stored,
+                    expected,
+                    self.path,
+                )
+                for table in _TABLES:
+                    conn.execute(f"DROP TABLE IF EXISTS {table}")
+            conn.executescript(_SCHEMA)
+            conn.executemany(
+                "INSERT OR REPLACE INTO schema_info (key, value) VALUES (?, ?)",
+                expected.items(),
+            )
+
+    @contextmanager
+    def _write_transaction(self):
+        """Transaction holding the write lock from its start (ids read in it stay free)."""
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+
+    @staticmethod
+    def _next_id(conn: sqlite3.Connection, table: str) -> int:
+        return conn.execute(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}").fetchone()[0]
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # --- Writing (one document at a time, from the parsing thread) ---
+
+    def begin_document(self, law_id: str, source: str, corpus_key: str) -> int:
+        """Start writing a parse; previous incomplete rows of this key are removed."""
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "DELETE FROM documents WHERE corpus_key = ? AND status != 'complete'",
+                (corpus_key,),
+            )
+            cursor = conn.execute(
+                "INSERT INTO documents (law_id, source, corpus_key) VALUES (?, ?, ?)",
+                (law_id, source, corpus_key),
+            )
+        self._document_id = cursor.lastrowid
+        self._pending = []
+        self._ordinal = 0
+        return self._document_id
+
+    def write_pages(
+        self,
+        page_offsets: Iterable[Dict[str, Any]],
+        page_classification: Iterable[Dict[str, Any]] = (),
+    ):
+        """Page offsets ({"page", "start", "end"}) and their classification."""
+        classification = {c["page"]: c for c in page_classification}
+        rows = []
+        for entry in page_offsets:
+            info = classification.get(entry["page"], {})
+            rows.append(
+                (
+                    self._document_id,
+                    entry["page"],
+                    entry["start"],
+                    entry["end"],
+                    info.get("threshold"),
+                    info.get("body_font_size"),
+                    info.get("confidence"),
+                    info.get("method"),
+                )
+            )
+        with self._connection() as conn:
+            conn.executemany(
+                "INSERT INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+
+    def write_footnotes(self, footnotes: Dict[str, Dict[str, Any]]):
+        rows = [
+            (self._document_id, fid, entry.get("number"), entry["page"], entry["text"])
+            for fid, entry in footnotes.items()
+        ]
+        with self._connection() as conn:
+            conn.executemany("INSERT INTO footnotes VALUES (?, ?, ?, ?, ?)", rows)
+
+    def write_structure(self, structure: List[Dict[str, Any]]):
+        """Structure tree as nodes with parent ids, in document order."""
+        with self._write_transaction() as conn:
+            first_id = self._next_id(conn, "structure_nodes")
+            rows = []
+            # Depth-first, parents before their children: id = first_id + ordinal
+            stack = [(node, None, 0) for node in reversed(structure)]
+            while stack:
+                node, parent_id, depth = stack.pop()
+                node_id = first_id + len(rows)
+                rows.append(
+                    (
+                        node_id,
+                        self._document_id,
+                        parent_id,
+                        len(rows),
+                        depth,
+                        node["type"],
+                        node["title"],
+                    )
+                )
+                for child in reversed(node.get("children", [])):
+                    stack.append((child, node_id, depth + 1))
+            conn.executemany(
+                "INSERT INTO structure_nodes "
+                "(id, document_id, parent_id, ordinal, depth, node_type, title) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def add_chunks(self, chunks: Iterable[Dict[str, Any]]):
+        """Buffer chunks, writing them once `batch_size` are pending."""
+        self._pending.extend(chunks)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        document_id = self._document_id
+        with self._write_transaction() as conn:
+            first_id = self._next_id(conn, "chunks")
+            chunk_rows, page_rows, footnote_rows = [], [], []
+            for i, chunk in enumerate(self._pending):
+                metadata = chunk["metadata"]
+                row = first_id + i
+                chunk_rows.append(
+                    (
+                        row,
+                        document_id,
+                        self._ordinal + i,
+                        metadata["chunk_id"],
+                        metadata.get("chunk_type"),
+                        metadata.get("chapter_id"),
+                        metadata.get("section_id"),
+                        metadata.get("article_id"),
+                        metadata.get("clause_id"),
+                        metadata.get("point_id"),
+                        metadata.get("topic"),
+                        chunk["page_content"],
+                        json.dumps(metadata, ensure_ascii=False, separators=(",", ":")),
+                    )
+                )
+                page_rows.extend(
+                    (row, document_id, page) for page in metadata.get("page_number", [])
+                )
+                footnote_rows.extend(
+                    (row, fid) for fid in metadata.get("footnote_ids", [])
+                )
+            conn.executemany(
+                "INSERT INTO chunks (id, document_id, ordinal, chunk_id, chunk_type, "
+                "chapter_id, section_id, article_id, clause_id, point_id, topic, "
+                "page_content, metadata) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                chunk_rows,
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO chunk_pages VALUES (?, ?, ?)", page_rows
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO chunk_footnotes VALUES (?, ?)", footnote_rows
+            )
+        self._ordinal += len(chunk_rows)
+        self._pending = []
+
+    def finish_document(self):
+        """Flush pending chunks, publish the document and drop older parses of the law."""
+        self.flush()
+        conn = self._connection()
+        with conn:
+            law_id = conn.execute(
+                "SELECT law_id FROM documents WHERE id = ?", (self._document_id,)
+            ).fetchone()[0]
+            conn.execute(
+                "DELETE FROM documents WHERE law_id = ? AND id != ?",
+                (law_id, self._document_id),
+            )
+            conn.execute(
+                "UPDATE documents SET status = 'complete' WHERE id = ?",
+                (self._document_id,),
+            )
+            # Fresh statistics so the planner seeks the filter indexes
+            conn.execute("ANALYZE")
+        self._document_id = None
+
+    def abort_document(self):
+        """Discard a parse that failed half-way."""
+        self._pending = []
+        if self._document_id is None:
+            return
+        with self._connection() as conn:
+            conn.execute("DELETE FROM documents WHERE id = ?", (self._document_id,))
+        self._document_id = None
+
+    # --- Queries ---
+
+    def has_document(self, corpus_key: str) -> bool:
+        """Whether a complete parse with this corpus key is stored."""
+        row = self._connection().execute(
+            "SELECT 1 FROM documents WHERE corpus_key = ? AND status = 'complete'",
+            (corpus_key,),
+        ).fetchone()
+        return row is not None
+
+    def query_chunks(
+        self,
+        law_id: Optional[str] = None,
+        chapter_id: Optional[str] = None,
+        section_id: Optional[str] = None,
+        article_id: Optional[str] = None,
+        page: Optional[int] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Chunks matching every given filter, in document order.
+
+        Returns:
+            (chunks in the `process()` format, total number of matches)
+        """
+        params = {
+            "law_id": law_id,
+            "chapter_id": chapter_id,
+            "section_id": section_id,
+            "article_id": article_id,
+            "page": page,
+        }
+        filters = tuple(name for name in CHUNK_FILTERS if params[name] is not None)
+        select, count = _PREPARED[filters]
+        bound = {name: params[name] for name in filters}
+        conn = self._connection()
+        total = conn.execute(count, bound).fetchone()[0]
+        rows = conn.execute(select, {**bound, "limit": limit, "offset": offset})
+        chunks = [
+            {"page_content": page_content, "metadata": json.loads(metadata)}
+            for page_content, metadata in rows
+        ]
+        return chunks, total
+
+    def list_documents(self) -> List[Dict[str, Any]]:
+        """Complete documents with their chunk, page, footnote and article counts."""
+        rows = self._connection().execute(
+            """
+            SELECT d.id, d.law_id, d.source, d.corpus_key, d.created_at,
+                (SELECT COUNT(*) FROM chunks WHERE document_id = d.id),
+                (SELECT COUNT(*) FROM pages WHERE document_id = d.id),
+                (SELECT COUNT(*) FROM footnotes WHERE document_id = d.id),
+                (SELECT COUNT(DISTINCT article_id) FROM chunks WHERE document_id = d.id)
+            FROM documents d WHERE d.status = 'complete' ORDER BY d.law_id
+            """
+        )
+        keys = (
+            "document_id",
+            "law_id",
+            "source",
+            "corpus_key",
+            "created_at",
+            "chunks",
+            "pages",
+            "footnotes",
+            "articles",
+        )
+        return [dict(zip(keys, row)) for row in rows]
@@ -0,0 +1,205 @@
+"""
+Topic tagging of chunks with a Vietnamese land-law term dictionary.
+
+The dictionary (data/legal_terms.json) groups terms by topic:
+
+    {
+      "version": 1,
+      "topics": {
+        "land_recovery": {"label": "Thu hồi đất", "terms": ["thu hồi đất", ...]},
+        ...
+      }
+    }
+
+Every term is compiled into one Aho-Corasick automaton twice: as written
+(lower-cased, with diacritics) and folded to ASCII ("thu hoi dat"), so text
+typed without diacritics is recognized too. Tagging a chunk is a single
+linear pass over its lower-cased text; matches must start and end on word
+boundaries, and overlapping matches are resolved leftmost-longest so a term
+nested in a longer one ("thu hồi" in "thu hồi đất") is not counted twice.
+Only topics scoring at least `MIN_TOPIC_SHARE` of the best topic are kept,
+at most `MAX_TOPICS` of them. The result goes into the chunk metadata:
+
+    "topic": "land_recovery",                  # best-scoring topic or "general"
+    "topics": ["land_recovery", "compensation"],
+    "term_hits": {"thu hồi đất": 3, "bồi thường": 1}
+"""
+
+import hashlib
+import json
+import os
+import unicodedata
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from page_cache import file_sha256
+
+DEFAULT_TERMS_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "data", "legal_terms.json"
+)
+
+# Topic of chunks that match no term
+DEFAULT_TOPIC = "general"
+
+# Topics kept per chunk, and minimum score relative to the best topic: generic
+# terms ("khiếu nại", "giấy chứng nhận") occur in most chunks and must not
+# turn every chunk into a multi-topic one
+MAX_TOPICS = 3
+MIN_TOPIC_SHARE = 0.5
+
+
+def normalize_text(text: str) -> str:
+    """NFC + lower case: the form both terms and chunk text are matched in."""
+    return unicodedata.normalize("NFC", text).lower()
+
+
+def fold_diacritics(text: str) -> str:
+    """Strip Vietnamese diacritics: "thu hồi đất" -> "thu hoi dat"."""
+    decomposed = unicodedata.normalize("NFD", text.replace("đ", "d").replace("Đ", "D"))
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+class AhoCorasick:
+    """Minimal Aho-Corasick automaton over str patterns."""
+
+    def __init__(self, patterns: List[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Per state: [(pattern length, pattern index)] of patterns ending here
+        self._out: List[List[Tuple[int, int]]] = [[]]
+
+        for index, pattern in enumerate(patterns):
+            state = 0
+            for char in pattern:
+                nxt = self._goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][char] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append((len(pattern), index))
+
+        # BFS: failure link = longest proper suffix that is also a trie prefix
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """Yield (start, end, pattern index) for every occurrence in `text`."""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, index in out[state]:
+                yield i + 1 - length, i + 1, index
+
+
+def terms_fingerprint(path: Optional[str]) -> str:
+    """Fingerprint of `TermTagger.load(path)` without compiling the automaton."""
+    if not path or not os.path.exists(path):
+        return TermTagger().fingerprint
+    return file_sha256(path)
+
+
+class TermTagger:
+    """Compiled term dictionary tagging chunks with topics and term hit counts."""
+
+    def __init__(
+        self,
+        topics: Optional[Dict[str, Dict[str, Any]]] = None,
+        fingerprint: Optional[str] = None,
+    ):
+        self.topics = topics or {}
+        self.terms: List[str] = []  # canonical (diacritic) forms
+        self.term_topics: List[List[str]] = []
+
+        patterns: List[str] = []
+        pattern_terms: List[int] = []  # pattern index -> term index
+        term_index: Dict[str, int] = {}
+        for topic, spec in self.topics.items():
+            for raw in spec.get("terms", []):
+                term = " ".join(normalize_text(raw).split())
+                if term not in term_index:
+                    term_index[term] = len(self.terms)
+                    self.terms.append(term)
+                    self.term_topics.append([])
+                    for form in dict.fromkeys((term, fold_diacritics(term))):
+                        patterns.append(form)
+                        pattern_terms.append(term_index[term])
+                if topic not in self.term_topics[term_index[term]]:
+                    self.term_topics[term_index[term]].append(topic)
+
+        self._pattern_terms = pattern_terms
+        self._term_index = term_index
+        self._automaton = AhoCorasick(patterns)
+        self.fingerprint = fingerprint or hashlib.sha256(
+            json.dumps(self.topics, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+
+    @classmethod
+    def load(cls, path: Optional[str]) -> "TermTagger":
+        """Load a term dictionary; a missing file means no terms (every chunk is "general")."""
+        if not path or not os.path.exists(path):
+            return cls()
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data.get("topics", {}), fingerprint=file_sha256(path))
+
+    def __len__(self):
+        return len(self.terms)
+
+    def term_hits(self, text: str) -> Dict[str, int]:
+        """{ canonical term: occurrences } in one pass over `text`."""
+        text = normalize_text(text)
+        matches = []
+        for start, end, index in self._automaton.iter_matches(text):
+            # Whole words only: "giá đất" must not match inside "giá đấtx"
+            if start > 0 and text[start - 1].isalnum():
+                continue
+            if end < len(text) and text[end].isalnum():
+                continue
+            matches.append((start, -end, self._pattern_terms[index]))
+
+        # Leftmost-longest: a match overlapping a kept one is dropped
+        hits: Dict[str, int] = {}
+        covered = 0
+        for start, neg_end, term_index in sorted(matches):
+            if start < covered:
+                continue
+            covered = -neg_end
+            term = self.terms[term_index]
+            hits[term] = hits.get(term, 0) + 1
+        return hits
+
+    def tag(self, chunk: Dict[str, Any]) -> Dict[str, Any]:
+        """Set `topic`, `topics` and `term_hits` in the chunk metadata (in place)."""
+        hits = self.term_hits(chunk["page_content"])
+        scores: Dict[str, int] = {}
+        for term, count in hits.items():
+            for topic in self.term_topics[self._term_index[term]]:
+                scores[topic] = scores.get(topic, 0) + count
+
+        # Dictionary order breaks ties between equally scored topics
+        order = {topic: i for i, topic in enumerate(self.topics)}
+        topics = sorted(scores, key=lambda t: (-scores[t], order[t]))
+        if topics:
+            floor = scores[topics[0]] * MIN_TOPIC_SHARE
+            topics = [t for t in topics[:MAX_TOPICS] if scores[t] >= floor]
+
+        metadata = chunk["metadata"]
+        metadata["topic"] = topics[0] if topics else DEFAULT_TOPIC
+        metadata["topics"] = topics
+        metadata["term_hits"] = hits
+        return chunk
@@ -0,0 +1,6 @@
+"""
+Parser unit tests (stdlib unittest, also collected by pytest).
+
+Run from parser/:
+    python -m unittest discover -s tests -t .
+"""
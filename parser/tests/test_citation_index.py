@@ -0,0 +1,132 @@
+import random
+import unittest
+
+from citation_index import CitationIndex, build_suffix_array, normalize_ref
+
+
+def _naive_suffix_array(text):
+    return sorted(range(len(text)), key=lambda i: text[i:])
+
+
+def _chunk(chunk_id, article_id, text, clause_id=None):
+    return {
+        "page_content": text,
+        "metadata": {
+            "chunk_id": chunk_id,
+            "article_id": article_id,
+            "clause_id": clause_id,
+            "point_id": None,
+            "page_number": [int(article_id)],
+        },
+    }
+
+
+CHUNKS = [
+    _chunk(
+        "art_79_k1",
+        "79",
+        "1. Nhà nước thu hồi đất   trong trường hợp thật cần thiết để thực hiện "
+        "dự án phát triển kinh tế - xã hội vì lợi ích quốc gia, công cộng.",
+        clause_id="1",
+    ),
+    _chunk(
+        "art_80",
+        "80",
+        "Điều 80. Căn cứ, điều kiện thu hồi đất. Việc thu hồi đất phải căn cứ "
+        "quy hoạch, kế hoạch sử dụng đất đã được phê duyệt.",
+    ),
+    _chunk(
+        "art_91",
+        "91",
+        "Điều 91. Nguyên tắc bồi thường, hỗ trợ, tái định cư khi Nhà nước thu hồi "
+        "đất phải bảo đảm người có đất thu hồi có chỗ ở.",
+    ),
+]
+
+
+class SuffixArrayTest(unittest.TestCase):
+    def test_matches_naive_sort(self):
+        texts = [
+            "",
+            "a",
+            "aaaaaaa",
+            "abababab",
+            "banana",
+            "mississippi",
+            "đất đai\x00đất\x00",
+            "thu hồi đất thu hồi đất",
+        ]
+        rng = random.Random(7)
+        texts += ["".join(rng.choice("aab\x00đ") for _ in range(rng.randint(1, 40))) for _ in range(50)]
+        for text in texts:
+            with self.subTest(text=text):
+                self.assertEqual(build_suffix_array(text).tolist(), _naive_suffix_array(text))
+
+
+class CitationIndexTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.index = CitationIndex(CHUNKS)
+
+    def test_exact_quote_with_matching_citation(self):
+        result = self.index.verify(
+            "“Nhà nước thu hồi đất trong trường hợp thật cần thiết”",
+            article_id="Điều 79",
+            clause_id="khoản 1",
+        )
+
+        self.assertEqual(result["status"], "exact")
+        self.assertIs(result["citation_match"], True)
+        match = result["matches"][0]
+        self.assertEqual(match["chunk_id"], "art_79_k1")
+        # Offsets are in the original page_content (double spaces included)
+        quoted = CHUNKS[0]["page_content"][match["start"] : match["end"]]
+        self.assertEqual(" ".join(quoted.split()), "Nhà nước thu hồi đất trong trường hợp thật cần thiết")
+
+    def test_quote_with_typo_is_approximate(self):
+        result = self.index.verify(
+            "Việc thu hồi đất phải căn cứ quy hoạch, kế hoạch sủ dụng đất đã được phê duyêt",
+            article_id="80",
+        )
+
+        self.assertEqual(result["status"], "approximate")
+        self.assertIs(result["citation_match"], True)
+        self.assertEqual(result["matches"][0]["chunk_id"], "art_80")
+        self.assertLess(result["matches"][0]["score"], 1.0)
+
+    def test_quote_cited_to_the_wrong_article(self):
+        result = self.index.verify(
+            "Việc thu hồi đất phải căn cứ quy hoạch, kế hoạch sử dụng đất", article_id="Điều 91"
+        )
+
+        self.assertEqual(result["status"], "exact")
+        self.assertIs(result["citation_match"], False)
+        self.assertIs(result["matches"][0]["article_match"], False)
+
+    def test_quote_not_in_corpus(self):
+        result = self.index.verify(
+            "Người nước ngoài được sở hữu nhà ở tại Việt Nam theo quy định", article_id="79"
+        )
+
+        self.assertEqual(result["status"], "not_found")
+        self.assertIsNone(result["citation_match"])
+        self.assertEqual(result["matches"], [])
+
+    def test_no_citation_means_no_citation_match(self):
+        result = self.index.verify("bảo đảm người có đất thu hồi có chỗ ở")
+
+        self.assertEqual(result["status"], "exact")
+        self.assertIsNone(result["citation_match"])
+
+    def test_matches_never_straddle_chunks(self):
+        self.assertEqual(self.index.find_exact("công cộng. điều 80"), [])
+
+    def test_normalize_ref(self):
+        self.assertEqual(normalize_ref("Điều 79."), "79")
+        self.assertEqual(normalize_ref("Khoản 2"), "2")
+        self.assertEqual(normalize_ref("điểm a)"), "a")
+        self.assertIsNone(normalize_ref("  "))
+
+
+if __name__ == "__main__":
+    unittest.main()
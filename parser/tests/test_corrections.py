@@ -0,0 +1,68 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from corrections import CorrectionSet, corrections_fingerprint
+
+
+def _chunk(chunk_id, article_id, text):
+    return {
+        "page_content": text,
+        "metadata": {"chunk_id": chunk_id, "article_id": article_id, "page_number": [1]},
+    }
+
+
+class CorrectionSetTest(unittest.TestCase):
+    def test_append_by_article_requires_a_guard(self):
+        with self.assertRaises(ValueError):
+            CorrectionSet([{"op": "append", "article_id": "5", "text": "bổ sung"}])
+
+    def test_guarded_append_only_touches_the_matching_clause(self):
+        corrections = CorrectionSet(
+            [{"op": "append", "article_id": "5", "find": "2. Khoản hai", "text": "bổ sung"}]
+        )
+        first = corrections.apply(_chunk("c1", "5", "1. Khoản một"))
+        second = corrections.apply(_chunk("c2", "5", "2. Khoản hai"))
+
+        self.assertEqual(first["page_content"], "1. Khoản một")
+        self.assertEqual(second["page_content"], "2. Khoản hai bổ sung")
+        self.assertEqual(corrections.unapplied(), [])
+
+    def test_append_by_chunk_id(self):
+        corrections = CorrectionSet([{"op": "append", "chunk_id": "c1", "text": "bổ sung"}])
+
+        chunk = corrections.apply(_chunk("c1", "5", "1. Khoản một"))
+        self.assertEqual(chunk["page_content"], "1. Khoản một bổ sung")
+
+
+class FingerprintTest(unittest.TestCase):
+    def test_corpus_key_matches_the_loaded_sets_without_compiling_them(self):
+        from corpus import corpus_key
+        from term_tagger import DEFAULT_TERMS_PATH, TermTagger, terms_fingerprint
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "corrections.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"corrections": [{"op": "remove", "chunk_id": "c1"}]}, f)
+
+            self.assertEqual(corrections_fingerprint(path), CorrectionSet.load(path).fingerprint)
+            self.assertEqual(
+                terms_fingerprint(DEFAULT_TERMS_PATH),
+                TermTagger.load(DEFAULT_TERMS_PATH).fingerprint,
+            )
+            self.assertEqual(corrections_fingerprint(None), CorrectionSet.load(None).fingerprint)
+
+            pdf_path = os.path.join(directory, "law.pdf")
+            with open(pdf_path, "wb") as f:
+                f.write(b"%PDF-1.4")
+            with mock.patch("corpus.file_sha256", return_value="pdf"), mock.patch(
+                "term_tagger.AhoCorasick", side_effect=AssertionError("compiled")
+            ):
+                key = corpus_key(pdf_path, path, DEFAULT_TERMS_PATH)
+            self.assertTrue(key.endswith(f":{terms_fingerprint(DEFAULT_TERMS_PATH)}:all"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+
+import numpy as np
+
+from land_law_parser import LOW_CONFIDENCE, classify_font_sizes, has_note_numbering
+
+
+def _classify(spans, global_body_size=None, note_evidence=False):
+    """spans: [(font size, number of characters)]"""
+    sizes = np.array([s for s, _ in spans], dtype=np.float64)
+    weights = np.array([w for _, w in spans], dtype=np.float64)
+    return classify_font_sizes(sizes, weights, global_body_size, note_evidence)
+
+
+class ClassifyFontSizesTest(unittest.TestCase):
+    def test_headings_larger_than_body_stay_body(self):
+        # 11pt body with a heavy share of 13pt headings: no footnotes
+        result = _classify([(11, 1500), (13, 400)])
+
+        self.assertLess(result["threshold"], 11)
+        self.assertEqual(result["body_font_size"], 11.0)
+        self.assertEqual(result["method"], "single_cluster")
+
+    def test_splits_below_dominant_size(self):
+        result = _classify([(13, 2000), (10, 300), (7, 5)])
+
+        self.assertEqual(result["method"], "adaptive")
+        self.assertEqual(result["body_font_size"], 13.0)
+        self.assertTrue(10 < result["threshold"] < 13)
+        self.assertGreaterEqual(result["confidence"], LOW_CONFIDENCE)
+
+    def test_footnote_only_page_uses_document_body_size(self):
+        result = _classify([(10, 900), (7, 4)], global_body_size=13.0, note_evidence=True)
+
+        self.assertTrue(10 < result["threshold"] < 13)
+        self.assertEqual(result["body_font_size"], 13.0)
+        self.assertGreaterEqual(result["confidence"], LOW_CONFIDENCE)
+
+    def test_footnote_heavy_page_uses_document_body_size(self):
+        result = _classify(
+            [(10, 900), (13, 300)], global_body_size=13.0, note_evidence=True
+        )
+
+        self.assertTrue(10 < result["threshold"] < 13)
+        self.assertEqual(result["body_font_size"], 13.0)
+
+    def test_smaller_body_without_note_evidence_stays_body(self):
+        # Page set in 12pt in a 13pt document, no footnote numbering: body text,
+        # reported as low confidence
+        result = _classify([(12, 900)], global_body_size=13.0)
+
+        self.assertLess(result["threshold"], 12)
+        self.assertLess(result["confidence"], LOW_CONFIDENCE)
+
+    def test_heading_does_not_flip_smaller_body_into_footnotes(self):
+        result = _classify([(12, 900), (10, 200), (13, 40)], global_body_size=13.0)
+
+        self.assertEqual(result["body_font_size"], 12.0)
+        self.assertTrue(10 < result["threshold"] < 12)
+
+    def test_single_cluster_at_body_size_has_no_footnotes(self):
+        result = _classify([(13, 900)], global_body_size=13.0)
+
+        self.assertLess(result["threshold"], 13)
+        self.assertGreaterEqual(result["confidence"], LOW_CONFIDENCE)
+
+    def test_sparse_page_is_not_low_confidence(self):
+        for global_body_size in (None, 13.0):
+            result = _classify([(13, 40), (10, 20)], global_body_size)
+
+            self.assertEqual(result["method"], "fixed")
+            self.assertTrue(10 < result["threshold"] < 13)
+            self.assertGreaterEqual(result["confidence"], LOW_CONFIDENCE)
+
+    def test_returns_python_floats(self):
+        for result in (
+            _classify([(13, 2000), (10, 300)]),
+            _classify([(13, 900)]),
+            _classify([(13, 40)], global_body_size=13.0),
+        ):
+            for key in ("threshold", "body_font_size", "confidence"):
+                self.assertIs(type(result[key]), float, key)
+
+
+class NoteNumberingTest(unittest.TestCase):
+    def test_superscript_number_starting_a_line(self):
+        texts = ["1", "Điều này được sửa đổi."]
+        self.assertTrue(has_note_numbering(texts, [7, 10], [(0, 2)], {0}))
+
+    def test_inline_number_starting_a_block(self):
+        texts = ["3 Khoản này được bãi bỏ."]
+        self.assertTrue(has_note_numbering(texts, [10], [(0, 1)], {0}))
+
+    def test_body_lines_are_not_note_numbering(self):
+        texts = ["1. Nhà nước thu hồi đất.", "10 năm kể từ ngày", "12"]
+        self.assertFalse(
+            has_note_numbering(texts, [12, 12, 10], [(0, 1), (1, 2), (2, 3)], {0, 2})
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
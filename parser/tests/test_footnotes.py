@@ -0,0 +1,143 @@
+import os
+import tempfile
+import unittest
+
+from footnotes import FootnoteRegistry
+
+
+def _synthetic_pdf(directory, **kwargs):
+    """Synthetic law PDF, or None when no Vietnamese font is available."""
+    from benchmarks.synthetic_pdf import generate_law_pdf
+
+    path = os.path.join(directory, "synthetic-law.pdf")
+    try:
+        generate_law_pdf(path, **kwargs)
+    except RuntimeError:
+        return None
+    return path
+
+
+class FootnoteRegistryTest(unittest.TestCase):
+    def test_marker_on_last_character_of_span(self):
+        # "...thu hồi đất.¹" then the next clause: the marker is recorded on
+        # the last body character, which lies inside [start, end)
+        text = "1. Nhà nước thu hồi đất.\n2. Khoản tiếp theo.\n"
+        end = text.index("\n") + 1
+        registry = FootnoteRegistry()
+        registry.add_page(1, 0, [("1", "Khoản này được sửa đổi.")], [(end - 2, "1")])
+        registry.finalize()
+
+        self.assertEqual(registry.ids_in_span(0, end, [1]), ["fn_1"])
+        self.assertEqual(registry.ids_in_span(end, len(text), [1]), [])
+
+    def test_footnote_without_marker_is_page_anchored(self):
+        registry = FootnoteRegistry()
+        registry.add_page(3, 100, [("4", "Ghi chú."), (None, "Không đánh số.")], [])
+        registry.finalize()
+
+        self.assertEqual(registry.ids_in_span(100, 200, [3]), ["fn_p3", "fn_4"])
+        self.assertEqual(registry.ids_in_span(100, 200, [4]), [])
+
+
+class FootnoteMarkerTest(unittest.TestCase):
+    """Markers at the end of an article title or clause line (synthetic PDF)."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.pdf_path = _synthetic_pdf(cls.tmp.name, chapters=2, articles_per_section=5)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_every_footnote_is_referenced_by_a_chunk(self):
+        if self.pdf_path is None:
+            self.skipTest("no Vietnamese font (install pymupdf-fonts)")
+        from land_law_parser import LandLawChunkerFinal
+
+        result = LandLawChunkerFinal(self.pdf_path, corrections_path=None).process()
+        referenced = {
+            fid for chunk in result["chunks"] for fid in chunk["metadata"]["footnote_ids"]
+        }
+        self.assertTrue(result["footnotes"])
+        self.assertEqual(set(result["footnotes"]) - referenced, set())
+
+
+class RecursiveSplitFootnoteTest(unittest.TestCase):
+    """Footnotes of clause/point pieces when an article is split."""
+
+    TITLE = "Điều 9. Thu hồi đất"
+
+    def setUp(self):
+        from land_law_parser import LandLawChunkerFinal
+
+        self.tmp = tempfile.TemporaryDirectory()
+        pdf_path = os.path.join(self.tmp.name, "law.pdf")
+        with open(pdf_path, "wb") as f:
+            f.write(b"%PDF-1.4\n")
+        self.parser = LandLawChunkerFinal(pdf_path, corrections_path=None)
+        # Offsets only: no page lookups
+        self.parser.get_coordinates_by_offset = lambda phrase, start, end: ([1], [])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _split(self, body, markers):
+        """markers: [(offset of the last body character before the marker, number)]"""
+        text = f"{self.TITLE}\n{body}"
+        self.parser.footnotes.add_page(
+            1, 0, [(n, f"Ghi chú {n}.") for _, n in markers], markers
+        )
+        self.parser.footnotes.finalize()
+        base = len(self.TITLE) + 1
+        article = {
+            "id": "9",
+            "title": self.TITLE,
+            "content": body,
+            "start": 0,
+            "metadata": {},
+        }
+        chunks = self.parser.recursive_split(article, base)
+        return text, {c["metadata"]["chunk_id"].split("_art_9_")[1]: c for c in chunks}
+
+    @staticmethod
+    def _ids(chunk):
+        return chunk["metadata"]["footnote_ids"]
+
+    def test_marker_on_last_character_of_clause(self):
+        body = "\n".join(f"{i}. Nội dung khoản {i}." for i in range(1, 8))
+        text = f"{self.TITLE}\n{body}"
+        end_of_clause_2 = text.index("\n3. ") - 1
+        number_of_clause_4 = text.index("4. ") + 1  # "4.¹"
+        text, chunks = self._split(
+            body, [(end_of_clause_2, "1"), (number_of_clause_4, "2")]
+        )
+
+        self.assertEqual(self._ids(chunks["clause_2"]), ["fn_1"])
+        self.assertEqual(self._ids(chunks["clause_3"]), [])
+        self.assertEqual(self._ids(chunks["clause_4"]), ["fn_2"])
+
+    def test_title_marker_goes_to_every_piece(self):
+        body = "\n".join(f"{i}. Nội dung khoản {i}." for i in range(1, 8))
+        _, chunks = self._split(body, [(len(self.TITLE) - 1, "1")])
+
+        self.assertEqual(len(chunks), 7)
+        for chunk in chunks.values():
+            self.assertEqual(self._ids(chunk), ["fn_1"])
+
+    def test_marker_on_last_character_of_point(self):
+        points = "\n".join(f"{p}) điểm {p};" for p in "abcdefg")
+        body = "1. Các trường hợp sau:\n" + points + "\n" + "\n".join(
+            f"{i}. Khoản {i}." for i in range(2, 7)
+        )
+        text = f"{self.TITLE}\n{body}"
+        end_of_point_b = text.index("\nc) ") - 1
+        _, chunks = self._split(body, [(end_of_point_b, "1")])
+
+        self.assertEqual(self._ids(chunks["clause_1_point_b"]), ["fn_1"])
+        self.assertEqual(self._ids(chunks["clause_1_point_c"]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,30 @@
+import unittest
+
+from metrics import STAGE_SECONDS, observe_stages, recorded_stages, stage_timer
+
+
+def _count(stage):
+    for metric in STAGE_SECONDS.collect():
+        for sample in metric.samples:
+            if sample.name.endswith("_count") and sample.labels["stage"] == stage:
+                return sample.value
+    return 0.0
+
+
+class RecordedStagesTest(unittest.TestCase):
+    def test_observations_are_recorded_and_replayed(self):
+        with recorded_stages() as observations:
+            with stage_timer("article_split"):
+                pass
+        with stage_timer("article_split"):
+            pass  # outside the block: not recorded
+
+        self.assertEqual([stage for stage, _ in observations], ["article_split"])
+
+        before = _count("article_split")
+        observe_stages(observations)
+        self.assertEqual(_count("article_split"), before + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from tests.test_footnotes import _synthetic_pdf
+
+
+class PageCacheRerunTest(unittest.TestCase):
+    """A rerun served by the page cache does not open the PDF (synthetic PDF)."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.pdf_path = _synthetic_pdf(cls.tmp.name, chapters=2, articles_per_section=5)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_rerun_reuses_pages_and_coordinates(self):
+        if self.pdf_path is None:
+            self.skipTest("no Vietnamese font (install pymupdf-fonts)")
+        from land_law_parser import LandLawChunkerFinal
+
+        cache_dir = os.path.join(self.tmp.name, "pages")
+        first = LandLawChunkerFinal(
+            self.pdf_path, cache_dir=cache_dir, corrections_path=None
+        ).process()
+
+        rerun = LandLawChunkerFinal(self.pdf_path, cache_dir=cache_dir, corrections_path=None)
+        with mock.patch.object(rerun, "document", side_effect=AssertionError("PDF opened")):
+            second = rerun.process()
+
+        self.assertEqual(second["chunks"], first["chunks"])
+        self.assertTrue(any(c["metadata"]["coordinates"] for c in second["chunks"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,21 @@
+import tempfile
+import unittest
+
+from render import RenderCache
+
+
+class RenderCacheTest(unittest.TestCase):
+    def test_overwriting_a_key_does_not_grow_disk_bytes(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = RenderCache(cache_dir=cache_dir, max_disk_bytes=1000)
+            cache.put("a", b"x" * 100)  # first write scans the directory
+            cache.put("b", b"x" * 100)
+            for _ in range(20):
+                cache.put("a", b"y" * 150)
+
+            self.assertEqual(cache.stats()["disk_bytes"], 250)
+            self.assertEqual(cache._scan_disk_bytes(), 250)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+
+from sqlite_sink import SQLiteSink
+
+
+def _chunk(i, article_id, pages, footnote_ids=()):
+    return {
+        "page_content": f"Nội dung {i}",
+        "metadata": {
+            "chunk_id": f"chunk_{i}",
+            "article_id": article_id,
+            "page_number": pages,
+            "footnote_ids": list(footnote_ids),
+        },
+    }
+
+
+class SQLiteSinkTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.sink = SQLiteSink(os.path.join(self.directory.name, "corpus.db"), batch_size=2)
+
+    def tearDown(self):
+        self.sink.close()
+        self.directory.cleanup()
+
+    def _write(self, corpus_key, chunks):
+        self.sink.begin_document("133/VBHN-VPQH", "law.pdf", corpus_key)
+        self.sink.write_structure(
+            [
+                {
+                    "type": "chapter",
+                    "title": "Chương I",
+                    "children": [{"type": "article", "title": "Điều 1", "children": []}],
+                },
+                {"type": "chapter", "title": "Chương II", "children": []},
+            ]
+        )
+        self.sink.add_chunks(chunks)
+        self.sink.finish_document()
+
+    def test_batched_chunks_keep_order_pages_and_footnotes(self):
+        chunks = [
+            _chunk(0, "1", [1]),
+            _chunk(1, "1", [1, 2], ["fn_1"]),
+            _chunk(2, "2", [2]),
+        ]
+        self._write("key-1", chunks)
+
+        stored, total = self.sink.query_chunks()
+        self.assertEqual(total, 3)
+        self.assertEqual(stored, chunks)
+        self.assertEqual(
+            [c["metadata"]["chunk_id"] for c in self.sink.query_chunks(page=2)[0]],
+            ["chunk_1", "chunk_2"],
+        )
+        conn = self.sink._connection()
+        self.assertEqual(
+            conn.execute("SELECT chunk_row, footnote_id FROM chunk_footnotes").fetchall(),
+            [(conn.execute("SELECT id FROM chunks WHERE chunk_id = 'chunk_1'").fetchone()[0], "fn_1")],
+        )
+
+    def test_structure_nodes_link_to_their_parents(self):
+        self._write("key-1", [_chunk(0, "1", [1])])
+        self._write("key-2", [_chunk(0, "1", [1])])  # replaces the first parse
+
+        rows = self.sink._connection().execute(
+            "SELECT s.title, p.title, s.depth, s.ordinal FROM structure_nodes s "
+            "LEFT JOIN structure_nodes p ON p.id = s.parent_id ORDER BY s.ordinal"
+        ).fetchall()
+        self.assertEqual(
+            rows,
+            [("Chương I", None, 0, 0), ("Điều 1", "Chương I", 1, 1), ("Chương II", None, 0, 2)],
+        )
+
+    def test_parent_cascade_uses_an_index(self):
+        plan = self.sink._connection().execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM structure_nodes WHERE parent_id = ?", (1,)
+        ).fetchall()
+        self.assertIn("idx_structure_parent", " ".join(row[-1] for row in plan))
+
+
+if __name__ == "__main__":
+    unittest.main()
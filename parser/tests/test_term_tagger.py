@@ -0,0 +1,64 @@
+import unittest
+
+from term_tagger import DEFAULT_TOPIC, MAX_TOPICS, TermTagger
+
+TOPICS = {
+    "land_recovery": {"terms": ["thu hồi đất", "thu hồi"]},
+    "compensation": {"terms": ["bồi thường", "hỗ trợ tái định cư"]},
+    "resettlement": {"terms": ["tái định cư"]},
+    "complaints": {"terms": ["khiếu nại"]},
+}
+
+
+def _chunk(text):
+    return {"page_content": text, "metadata": {}}
+
+
+class TermTaggerTest(unittest.TestCase):
+    def setUp(self):
+        self.tagger = TermTagger(TOPICS)
+
+    def test_nested_terms_are_counted_once(self):
+        hits = self.tagger.term_hits("Nhà nước thu hồi đất và hỗ trợ tái định cư.")
+
+        self.assertEqual(hits, {"thu hồi đất": 1, "hỗ trợ tái định cư": 1})
+
+    def test_shorter_term_still_matches_alone(self):
+        hits = self.tagger.term_hits("Quyết định thu hồi giấy chứng nhận; tái định cư.")
+
+        self.assertEqual(hits, {"thu hồi": 1, "tái định cư": 1})
+
+    def test_folded_ascii_text(self):
+        hits = self.tagger.term_hits("Nha nuoc THU HOI DAT, boi thuong va ho tro tai dinh cu")
+
+        self.assertEqual(
+            hits, {"thu hồi đất": 1, "bồi thường": 1, "hỗ trợ tái định cư": 1}
+        )
+
+    def test_whole_words_only(self):
+        self.assertEqual(self.tagger.term_hits("thu hồi đấtx"), {"thu hồi": 1})
+
+    def test_minor_topics_are_dropped(self):
+        text = "thu hồi đất, thu hồi đất, thu hồi đất, bồi thường, bồi thường, khiếu nại"
+        metadata = self.tagger.tag(_chunk(text))["metadata"]
+
+        self.assertEqual(metadata["topic"], "land_recovery")
+        self.assertEqual(metadata["topics"], ["land_recovery", "compensation"])
+        self.assertEqual(metadata["term_hits"]["khiếu nại"], 1)
+
+    def test_topics_are_capped(self):
+        text = "thu hồi đất, bồi thường, tái định cư, khiếu nại"
+        metadata = self.tagger.tag(_chunk(text))["metadata"]
+
+        self.assertEqual(len(metadata["topics"]), MAX_TOPICS)
+        self.assertEqual(metadata["topics"][0], "land_recovery")
+
+    def test_no_terms_is_general(self):
+        metadata = self.tagger.tag(_chunk("Điều 1. Phạm vi điều chỉnh"))["metadata"]
+
+        self.assertEqual(metadata["topic"], DEFAULT_TOPIC)
+        self.assertEqual(metadata["topics"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()